@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Async Brand Monitoring Engine
+Fans out search, scraping and analysis for many brands concurrently
+"""
+
+import asyncio
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any
+
+from standalone_tools import scrape_urls_async
+
+
+class AsyncBrandMonitoringEngine:
+    """
+    Monitors many brands at once with a bounded number in flight
+
+    Wall-clock time for a sweep follows the slowest brand rather than the sum
+    of all brands, as long as ``max_concurrency`` covers the sweep size.
+    Blocking search and analysis calls run on the engine's own thread pool,
+    and every sweep on an event loop shares one concurrency limit.
+    """
+
+    def __init__(self, max_concurrency: int = 50, search_tool: Any = None,
+                 scrape_func: Any = None):
+        """
+        Args:
+            max_concurrency: Maximum number of brands processed at the same time
+            search_tool: Object exposing a blocking ``_run(title, total_results)`` (run on the
+                engine's thread pool) or ``async _arun(title, total_results)`` (defaults to
+                BrightDataWebSearchTool)
+            scrape_func: Coroutine function with the scrape_urls_async signature
+        """
+        self.max_concurrency = max_concurrency
+        if search_tool is None:
+            # The CrewAI tool class is only defined (and CrewAI imported) when needed
+            from standalone_tools import BrightDataWebSearchTool
+            search_tool = BrightDataWebSearchTool()
+        self.search_tool = search_tool
+        self.scrape_func = scrape_func or scrape_urls_async
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        # Sized so the thread pool is never the bottleneck below the concurrency limit
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="brand-monitor")
+
+    def _limit(self) -> asyncio.Semaphore:
+        """The concurrency limit for the running loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def _in_thread(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _search(self, brand_name: str, total_results: int) -> List[Dict[str, Any]]:
+        run = getattr(self.search_tool, "_run", None)
+        if run is not None:
+            return await self._in_thread(run, brand_name, total_results)
+        return await self.search_tool._arun(brand_name, total_results)
+
+    async def monitor_brand(self, brand_name: str, total_results: int = 15,
+                            scrape: bool = False, analyze: bool = False) -> Dict[str, Any]:
+        """
+        Search (and optionally scrape and analyze) a single brand
+
+        Returns:
+            Result dictionary; failures are reported under "error" instead of raised
+        """
+        async with self._limit():
+            start_time = time.perf_counter()
+            result = {
+                "brand_name": brand_name,
+                "timestamp": datetime.now().isoformat(),
+            }
+            try:
+                search_results = await self._search(brand_name, total_results)
+                result["total_results"] = len(search_results)
+                result["search_results"] = search_results
+
+                if scrape and search_results:
+                    urls = [item["link"] for item in search_results if item.get("link")]
+                    result["scraped_data"] = await self.scrape_func(
+                        urls, {"dataset_id": "gd_m6gjtfmeh43we6cqc"}, "web"
+                    )
+
+                if analyze:
+                    result["sentiment_analysis"] = await self._in_thread(
+                        _analyze_sentiment, brand_name, result
+                    )
+            except Exception as e:
+                result["error"] = f"Error monitoring brand: {str(e)}"
+
+            result["elapsed_seconds"] = round(time.perf_counter() - start_time, 3)
+            return result
+
+    async def monitor_brands(self, brand_names: List[str], total_results: int = 15,
+                             scrape: bool = False, analyze: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Monitor every brand concurrently, bounded by ``max_concurrency``
+
+        Returns:
+            Dictionary mapping brand name to its result
+        """
+        results = await asyncio.gather(*[
+            self.monitor_brand(brand_name, total_results, scrape=scrape, analyze=analyze)
+            for brand_name in brand_names
+        ])
+        return {result["brand_name"]: result for result in results}
+
+    def close(self):
+        """Shut down the engine's thread pool"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _analyze_sentiment(brand_name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the blocking Bedrock sentiment tool on the brand's search results"""
+    from brand_tools import analyze_brand_sentiment_data
+
+    content = {"scraped_data": result.get("scraped_data") or [
+        {"markdown": item.get("snippet", "")} for item in result.get("search_results", [])
+    ]}
+    return analyze_brand_sentiment_data(content, brand_name).get("sentiment_analysis", {})
+
+
+def run_brand_sweep(brand_names: List[str], max_concurrency: int = 50,
+                    **kwargs) -> Dict[str, Dict[str, Any]]:
+    """Synchronous entry point for scripts and Flask handlers"""
+    engine = AsyncBrandMonitoringEngine(max_concurrency=max_concurrency)
+    try:
+        return asyncio.run(engine.monitor_brands(brand_names, **kwargs))
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    brands = ["OpenAI", "Anthropic", "Hugging Face", "DeepSeek"]
+    start = time.perf_counter()
+    sweep = run_brand_sweep(brands, total_results=5)
+    elapsed = time.perf_counter() - start
+
+    for name, brand_result in sweep.items():
+        status = brand_result.get("error") or f"{brand_result.get('total_results', 0)} results"
+        print(f"  {name}: {status} ({brand_result['elapsed_seconds']}s)")
+    print(f"✅ Swept {len(brands)} brands in {elapsed:.2f}s")
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Bedrock Runtime Helpers
+Process-wide client registry, cached model invocation and response streaming
+shared by the sentiment and report tools
+"""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import boto3
+from botocore.config import Config
+
+from cache import get_llm_cache
+
+DEFAULT_REGION = os.getenv("BEDROCK_REGION", "us-west-2")
+
+_clients: Dict[Tuple[str, int, str, int], Any] = {}
+_client_creations: Dict[str, int] = {}
+_client_requests = 0
+_clients_lock = threading.Lock()
+
+# Tokens billed by Bedrock calls made through this module (cache hits cost none)
+_usage = {"calls": 0, "cache_hits": 0, "input_tokens": 0, "output_tokens": 0}
+_usage_lock = threading.Lock()
+
+
+def get_bedrock_client(region_name: Optional[str] = None, max_pool_connections: Optional[int] = None,
+                       retry_mode: Optional[str] = None, max_attempts: Optional[int] = None) -> Any:
+    """
+    Get the shared ``bedrock-runtime`` client for this configuration
+
+    boto3 clients are thread-safe, so one client per (region, pool size, retry
+    settings) is created for the whole process and reused by every Flask
+    request and tool call, instead of resolving credentials and opening new
+    connections each time.
+
+    Args:
+        region_name: AWS region (default: BEDROCK_REGION or us-west-2)
+        max_pool_connections: HTTP connection pool size (default: BEDROCK_MAX_POOL_CONNECTIONS or 25)
+        retry_mode: botocore retry mode, "standard" or "adaptive" (default: BEDROCK_RETRY_MODE or standard)
+        max_attempts: Total attempts per call including retries (default: BEDROCK_MAX_ATTEMPTS or 3)
+    """
+    global _client_requests
+    key = (
+        region_name or DEFAULT_REGION,
+        int(max_pool_connections or os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", "25")),
+        retry_mode or os.getenv("BEDROCK_RETRY_MODE", "standard"),
+        int(max_attempts or os.getenv("BEDROCK_MAX_ATTEMPTS", "3")),
+    )
+
+    with _clients_lock:
+        _client_requests += 1
+        client = _clients.get(key)
+        if client is None:
+            region, pool_size, mode, attempts = key
+            config = Config(
+                max_pool_connections=pool_size,
+                retries={"mode": mode, "max_attempts": attempts},
+            )
+            # A dedicated session per client: boto3 sessions are not thread-safe
+            client = boto3.session.Session().client("bedrock-runtime", region_name=region, config=config)
+            _clients[key] = client
+            _client_creations[region] = _client_creations.get(region, 0) + 1
+        return client
+
+
+def bedrock_client_stats() -> Dict[str, Any]:
+    """How many clients were created versus how many times one was requested"""
+    with _clients_lock:
+        created = sum(_client_creations.values())
+        return {
+            "clients_created": created,
+            "clients_created_by_region": dict(_client_creations),
+            "client_requests": _client_requests,
+            "reused": _client_requests - created,
+        }
+
+
+def _record_usage(usage: Optional[Dict[str, Any]] = None, cache_hit: bool = False):
+    with _usage_lock:
+        if cache_hit:
+            _usage["cache_hits"] += 1
+            return
+        _usage["calls"] += 1
+        for key in ("input_tokens", "output_tokens"):
+            _usage[key] += int((usage or {}).get(key) or 0)
+
+
+def bedrock_usage_stats() -> Dict[str, int]:
+    """Bedrock calls, cache hits and input/output tokens since start (or the last reset)"""
+    with _usage_lock:
+        return dict(_usage, total_tokens=_usage["input_tokens"] + _usage["output_tokens"])
+
+
+def reset_bedrock_usage():
+    with _usage_lock:
+        for key in _usage:
+            _usage[key] = 0
+
+
+def invoke_model_cached(bedrock: Any, modelId: str, body: Union[str, Dict[str, Any]],
+                        use_cache: bool = True, cache_if: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                        **kwargs) -> Dict[str, Any]:
+    """
+    Call ``bedrock.invoke_model`` and return the parsed response body
+
+    Responses are cached on a hash of (modelId, body), so a byte-identical
+    request is answered from the cache instead of a new Bedrock round-trip.
+    Only complete replies (stop_reason "end_turn") are cached, so a reply cut
+    off at max_tokens is retried rather than replayed.
+
+    Args:
+        bedrock: A ``bedrock-runtime`` client, usually from get_bedrock_client()
+        modelId: Bedrock model ID
+        body: Request body as a JSON string or dictionary
+        use_cache: Set to False to always call Bedrock (the fresh response is still stored)
+        cache_if: Called with the response body; only replies it accepts are cached
+            (e.g. ones the caller could parse)
+        **kwargs: Passed through to ``invoke_model`` (e.g. contentType)
+
+    Returns:
+        The decoded JSON response body
+    """
+    if not isinstance(body, str):
+        body = json.dumps(body)
+
+    cache = get_llm_cache()
+    cache_key = {"modelId": modelId, "body": body}
+
+    if cache and use_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            _record_usage(cache_hit=True)
+            return cached
+
+    response = bedrock.invoke_model(modelId=modelId, body=body, **kwargs)
+    response_body = json.loads(response['body'].read())
+    _record_usage(response_body.get('usage'))
+
+    if (cache and response_body.get('content') and response_body.get('stop_reason') == 'end_turn'
+            and (cache_if is None or cache_if(response_body))):
+        cache.set(cache_key, response_body)
+
+    return response_body
+
+
+def stream_model_text(bedrock: Any, modelId: str, body: Union[str, Dict[str, Any]],
+                      use_cache: bool = True, **kwargs) -> Iterator[str]:
+    """
+    Call ``bedrock.invoke_model_with_response_stream`` and yield text as it arrives
+
+    Shares the response cache with invoke_model_cached(): a cached response is
+    yielded as a single chunk, and a completed stream is stored in the same
+    format so later streaming or non-streaming calls can reuse it.
+
+    Args:
+        bedrock: A ``bedrock-runtime`` client, usually from get_bedrock_client()
+        modelId: Bedrock model ID
+        body: Anthropic messages request body as a JSON string or dictionary
+        use_cache: Set to False to always call Bedrock (the fresh response is still stored)
+        **kwargs: Passed through to ``invoke_model_with_response_stream``
+
+    Yields:
+        Text deltas of the model's reply
+    """
+    if not isinstance(body, str):
+        body = json.dumps(body)
+
+    cache = get_llm_cache()
+    cache_key = {"modelId": modelId, "body": body}
+
+    if cache and use_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            _record_usage(cache_hit=True)
+            text = "".join(block.get('text', '') for block in cached.get('content', []))
+            if text:
+                yield text
+            return
+
+    response = bedrock.invoke_model_with_response_stream(modelId=modelId, body=body, **kwargs)
+
+    parts = []
+    stop_reason = None
+    usage = {}
+    for event in response['body']:
+        chunk = event.get('chunk')
+        if chunk is None:
+            # Modeled stream errors (throttling, validation, ...) arrive as their own events
+            error_name = next(iter(event), "unknown")
+            raise RuntimeError(f"Bedrock stream error ({error_name}): {event.get(error_name)}")
+
+        payload = json.loads(chunk['bytes'])
+        if payload.get('type') == 'content_block_delta' and payload['delta'].get('type') == 'text_delta':
+            text = payload['delta']['text']
+            parts.append(text)
+            yield text
+        elif payload.get('type') == 'message_start':
+            usage.update(payload.get('message', {}).get('usage') or {})
+        elif payload.get('type') == 'message_delta':
+            stop_reason = payload.get('delta', {}).get('stop_reason')
+            usage.update(payload.get('usage') or {})
+    _record_usage(usage)
+
+    # Only complete streams are cached; a consumer that stops early never reaches here
+    if cache and parts and stop_reason == 'end_turn':
+        cache.set(cache_key, {
+            "type": "message",
+            "role": "assistant",
+            "content": [{"type": "text", "text": "".join(parts)}],
+            "stop_reason": stop_reason,
+        })
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+JSON Serialization Benchmark
+Per-request serialization cost of /api/full-analysis before and after the fast JSON path
+"""
+
+import argparse
+import json
+import time
+
+import fast_json
+from benchmark_result_storage import sample_agent_output
+
+
+def string_round_trip_request(search_data, sentiment_data):
+    """Old path: every stage returns a JSON string the next stage parses again"""
+    search_result = json.dumps(search_data, indent=2)        # search tool output
+    search_parsed = json.loads(search_result)                # app parses it
+    sentiment_result = json.dumps(sentiment_data, indent=2)  # sentiment tool output
+    sentiment_parsed = json.loads(sentiment_result)          # app parses it
+    json.loads(search_result)                                # report parses both inputs again
+    json.loads(sentiment_result)
+    full_result = {"search_results": search_parsed, "sentiment_analysis": sentiment_parsed}
+    stored = json.dumps(full_result, indent=2, ensure_ascii=False)    # json.dump to the result file
+    response = json.dumps({"success": True, "data": full_result})     # jsonify
+    return len(stored) + len(response)
+
+
+def native_request(search_data, sentiment_data):
+    """New path: stages pass dicts; serialize once for storage and once for the response"""
+    full_result = {"search_results": search_data, "sentiment_analysis": sentiment_data}
+    stored = fast_json.dumps_bytes(full_result, indent=True)
+    response = fast_json.dumps({"success": True, "data": full_result})
+    return len(stored) + len(response)
+
+
+def time_per_call(func, *args, repeat: int = 200) -> float:
+    func(*args)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200, help="Requests to time per path")
+    args = parser.parse_args()
+
+    document = json.loads(sample_agent_output(0))
+    search_data = {"brand_name": "OpenAI", "total_results": len(document["search_results"]),
+                   "search_results": document["search_results"], "scraped_data": document["scraped_data"]}
+    sentiment_data = {"brand_name": "OpenAI", "sentiment_analysis": document["sentiment_analysis"]}
+
+    print(f"⚡ JSON codec: {fast_json.backend_name()}\n")
+    codec_rows = [
+        ("json.dumps(indent=2)", lambda: json.dumps(document, indent=2, ensure_ascii=False)),
+        ("fast_json.dumps_bytes(indent)", lambda: fast_json.dumps_bytes(document, indent=True)),
+        ("json.loads", lambda: json.loads(sample)),
+        ("fast_json.loads", lambda: fast_json.loads(sample)),
+    ]
+    sample = json.dumps(document)
+    print(f"{'Operation':<34}{'µs/call':>10}")
+    print("-" * 44)
+    for name, func in codec_rows:
+        print(f"{name:<34}{time_per_call(func, repeat=args.repeat):>10.1f}")
+
+    before = time_per_call(string_round_trip_request, search_data, sentiment_data, repeat=args.repeat)
+    after = time_per_call(native_request, search_data, sentiment_data, repeat=args.repeat)
+    print(f"\n{'Full-analysis request':<34}{'µs/request':>10}")
+    print("-" * 44)
+    print(f"{'string round-trips + json':<34}{before:>10.1f}")
+    print(f"{'native objects + fast_json':<34}{after:>10.1f}")
+    print(f"\n✅ Serialization time per request reduced by {1 - after / before:.0%} ({before / after:.1f}x)")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Pipeline vs Agent Benchmark
+Compares latency and Bedrock tokens of the deterministic pipeline and the CrewAI agent
+for the same search → scrape → sentiment → report workflow (needs AWS and BrightData access)
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+
+def run_pipeline(brand: str) -> dict:
+    from monitoring_pipeline import run_monitoring_pipeline, storage_agent_toolset
+
+    result = run_monitoring_pipeline(brand, storage_agent_toolset(), use_cache=False)
+    return {"stages": {name: timing["seconds"] for name, timing in result["stage_latency"]["stages"].items()}}
+
+
+def run_agent(brand: str) -> dict:
+    from brand_monitoring_agent_with_storage import build_monitoring_crew
+
+    output = build_monitoring_crew(brand, verbose=False).kickoff()
+    usage = getattr(output, "token_usage", None)
+    return {"orchestrator_tokens": getattr(usage, "total_tokens", 0) or 0,
+            "orchestrator_requests": getattr(usage, "successful_requests", 0) or 0}
+
+
+def measure(name: str, func, brand: str, runs: int) -> dict:
+    from bedrock_runtime import bedrock_usage_stats, reset_bedrock_usage
+
+    samples = []
+    for _ in range(runs):
+        reset_bedrock_usage()
+        start = time.perf_counter()
+        extra = func(brand)
+        elapsed = time.perf_counter() - start
+        usage = bedrock_usage_stats()
+        samples.append(dict(extra, seconds=elapsed, tool_calls=usage["calls"],
+                            tool_tokens=usage["total_tokens"],
+                            total_tokens=usage["total_tokens"] + extra.get("orchestrator_tokens", 0)))
+
+    summary = {
+        "name": name,
+        "median_seconds": statistics.median(s["seconds"] for s in samples),
+        "median_tokens": statistics.median(s["total_tokens"] for s in samples),
+        "tool_bedrock_calls": statistics.median(s["tool_calls"] for s in samples),
+        "orchestrator_tokens": statistics.median(s.get("orchestrator_tokens", 0) for s in samples),
+    }
+    if "stages" in samples[-1]:
+        summary["stages"] = samples[-1]["stages"]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the deterministic pipeline against the CrewAI agent")
+    parser.add_argument("--brand", default="OpenAI")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--skip-agent", action="store_true", help="Only measure the pipeline")
+    args = parser.parse_args()
+
+    # Every run must do the real work: no cached searches, scrapes or model responses
+    for flag in ("SEARCH_CACHE_DISABLED", "LLM_CACHE_DISABLED", "PIPELINE_CACHE_DISABLED"):
+        os.environ[flag] = "1"
+
+    results = [measure("pipeline", run_pipeline, args.brand, args.runs)]
+    if not args.skip_agent:
+        results.append(measure("agent", run_agent, args.brand, args.runs))
+
+    print(f"\n{'Mode':<10} {'Median s':>10} {'Tokens':>10} {'Tool calls':>11} {'Orchestrator':>13}")
+    for result in results:
+        print(f"{result['name']:<10} {result['median_seconds']:>10.2f} {result['median_tokens']:>10.0f} "
+              f"{result['tool_bedrock_calls']:>11.0f} {result['orchestrator_tokens']:>13.0f}")
+    print(f"\nPipeline stage latency (last run): {results[0]['stages']}")
+    if len(results) == 2 and results[1]["median_seconds"]:
+        print(f"Pipeline speedup: {results[1]['median_seconds'] / results[0]['median_seconds']:.1f}x, "
+              f"tokens saved: {results[1]['median_tokens'] - results[0]['median_tokens']:.0f} per run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Result Storage Benchmark
+Compares disk usage and read latency of the result file layouts
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from data_storage import BrandMonitoringDataStorage
+from result_compression import zstandard
+
+
+def sample_agent_output(index: int) -> str:
+    """Agent output shaped like a real search + scrape + sentiment + report run"""
+    rng = random.Random(index)
+    words = ["OpenAI", "model", "launch", "developers", "pricing", "safety", "API", "partnership",
+             "release", "users", "enterprise", "research", "benchmark", "agents", "update"]
+
+    def text(count):
+        return " ".join(rng.choice(words) for _ in range(count))
+
+    return json.dumps({
+        "search_results": [
+            {"title": text(8), "link": f"https://news.example.com/{index}/{i}", "snippet": text(40)}
+            for i in range(15)
+        ],
+        "scraped_data": [
+            {"url": f"https://news.example.com/{index}/{i}", "markdown": text(400)} for i in range(5)
+        ],
+        "sentiment_analysis": {"sentiment_score": 0.6, "sentiment_label": "positive",
+                               "explanation": text(60), "confidence": 0.8},
+        "report_data": {"report_content": "# Brand Monitoring Report\n\n" + text(700)},
+    })
+
+
+def disk_bytes(results_dir: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(results_dir)
+               if entry.is_file() and not entry.name.startswith("."))
+
+
+def run_layout(name: str, outputs, compression=None, keep_raw_output=True, reads: int = 3):
+    results_dir = tempfile.mkdtemp(prefix="result-bench-")
+    try:
+        storage = BrandMonitoringDataStorage(results_dir, backend="files", compression=compression,
+                                             keep_raw_output=keep_raw_output)
+        filenames = []
+        for index, output in enumerate(outputs):
+            # Distinct names: save_result names files at one-second resolution
+            document = json.loads(output)
+            document.update(brand_name="OpenAI", metadata={"source": "agent_output"})
+            if keep_raw_output:
+                document["metadata"]["raw_output"] = output
+            filenames.append(storage.save_document(f"brand_monitoring_openai_20250101_{index:06d}.json", document))
+
+        started = time.perf_counter()
+        for _ in range(reads):
+            for filename in filenames:
+                storage.get_result_by_filename(filename)
+        read_ms = (time.perf_counter() - started) / (reads * len(filenames)) * 1000
+
+        return {"layout": name, "bytes": disk_bytes(results_dir), "read_ms": read_ms}
+    finally:
+        shutil.rmtree(results_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=int, default=200, help="Number of results to write per layout")
+    args = parser.parse_args()
+
+    outputs = [sample_agent_output(i) for i in range(args.results)]
+    layouts = [
+        ("indent=2 + raw_output (current)", None, True),
+        ("gzip + raw_output", "gzip", True),
+        ("gzip, raw_output dropped", "gzip", False),
+    ]
+    if zstandard is not None:
+        layouts.append(("zstd, raw_output dropped", "zstd", False))
+    else:
+        print("ℹ️  zstandard not installed, skipping the zstd layout")
+
+    print(f"📦 Writing {args.results} agent results per layout...\n")
+    rows = [run_layout(name, outputs, compression, keep_raw) for name, compression, keep_raw in layouts]
+    baseline = rows[0]["bytes"]
+
+    print(f"{'Layout':<34}{'Disk bytes':>14}{'vs current':>12}{'Read ms':>10}")
+    print("-" * 70)
+    for row in rows:
+        print(f"{row['layout']:<34}{row['bytes']:>14,}{row['bytes'] / baseline:>11.1%}{row['read_ms']:>10.3f}")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Cold import time of the Flask app and the tool modules, and the latency of the
+first request after startup, each measured in a fresh interpreter
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# module -> what it is used for
+MODULES = {
+    "brand_tools": "tool functions (Flask handlers, pipeline)",
+    "standalone_tools": "BrightData search and scraping",
+    "frontend.enhanced_app": "Flask app",
+    "brand_monitoring_agent": "CrewAI agent and tools",
+}
+
+IMPORT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+import {module}
+print(time.perf_counter() - started, "crewai" in sys.modules)
+"""
+
+FIRST_REQUEST_SNIPPET = """
+import os, sys, tempfile, time
+sys.path.insert(0, {root!r})
+os.chdir(tempfile.mkdtemp())
+started = time.perf_counter()
+from frontend import enhanced_app
+client = enhanced_app.app.test_client()
+imported = time.perf_counter()
+client.get("/api/system-status")
+print(imported - started, time.perf_counter() - imported)
+"""
+
+
+def run_snippet(snippet: str, **kwargs) -> list:
+    output = subprocess.run([sys.executable, "-c", snippet.format(root=ROOT, **kwargs)],
+                            capture_output=True, text=True, check=True).stdout
+    return output.strip().splitlines()[-1].split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import and first-request latency")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'Module':<24} {'Median s':>9} {'CrewAI':>7}  Used by")
+    for module, purpose in MODULES.items():
+        samples = [run_snippet(IMPORT_SNIPPET, module=module) for _ in range(args.runs)]
+        seconds = statistics.median(float(sample[0]) for sample in samples)
+        print(f"{module:<24} {seconds:>9.3f} {samples[-1][1]:>7}  {purpose}")
+
+    samples = [run_snippet(FIRST_REQUEST_SNIPPET) for _ in range(args.runs)]
+    print(f"\nFlask app import: {statistics.median(float(s[0]) for s in samples):.3f}s, "
+          f"first /api/system-status: {statistics.median(float(s[1]) for s in samples):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
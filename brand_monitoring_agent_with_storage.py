@@ -7,35 +7,24 @@ Enhanced version that saves results to files for the frontend to display
 import os
 import time
 import json
-import boto3
-from boto3.session import Session
 from typing import List, Dict, Any
 from datetime import datetime
 
 # Import the data storage utility
 from data_storage import BrandMonitoringDataStorage
 
-# CrewAI framework imports
-try:
-    from crewai.tools import tool
-    from crewai import Agent, Crew, Process, Task, LLM
-    from ddgs import DDGS
-    from ddgs.exceptions import DDGSException, RatelimitException
-except ImportError as e:
-    print(f"Warning: A required library is not installed. {e}")
-    print("Please ensure 'crewai', 'ddgs-search', and boto3 are installed.")
-    # Define a dummy decorator if 'crewai' is not available
-    def tool(func):
-        return func
-
 # Import standalone tools
-from standalone_tools import BrightDataWebSearchTool, scrape_urls
+from standalone_tools import scrape_urls
+from prompt_builder import PromptBuilder, add_content_snippets
+from brand_tools import cached_search, generate_brand_report_data
+import fast_json
 
 # ==============================================================================
 # SECTION 1: BRAND MONITORING TOOL DEFINITIONS
 # ==============================================================================
+# Plain functions; build_monitoring_crew() wraps them with CrewAI's tool(),
+# so importing this module does not load CrewAI or boto3.
 
-@tool
 def search_brand_mentions(brand_name: str, total_results: int = 15) -> str:
     """
     Search for brand mentions across the web using BrightData.
@@ -50,13 +39,14 @@ def search_brand_mentions(brand_name: str, total_results: int = 15) -> str:
     try:
         print(f"🔍 Searching for brand mentions: {brand_name}")
         
-        # Use the standalone BrightData tool
-        search_tool = BrightDataWebSearchTool()
-        results = search_tool._run(brand_name, total_results)
+        # BrightData search with DuckDuckGo fallback, reusing a recent identical BrightData search
+        results, cached = cached_search(brand_name, total_results)
+        if cached:
+            print(f"♻️  Using cached search results for {brand_name}")
         
         if results:
             print(f"✅ Found {len(results)} brand mentions")
-            return json.dumps({
+            return fast_json.dumps({
                 "brand_name": brand_name,
                 "total_results": len(results),
                 "search_results": results,
@@ -64,7 +54,7 @@ def search_brand_mentions(brand_name: str, total_results: int = 15) -> str:
             })
         else:
             print("⚠️  No brand mentions found")
-            return json.dumps({
+            return fast_json.dumps({
                 "brand_name": brand_name,
                 "total_results": 0,
                 "search_results": [],
@@ -75,13 +65,12 @@ def search_brand_mentions(brand_name: str, total_results: int = 15) -> str:
     except Exception as e:
         error_msg = f"Error searching for brand mentions: {str(e)}"
         print(f"❌ {error_msg}")
-        return json.dumps({
+        return fast_json.dumps({
             "brand_name": brand_name,
             "error": error_msg,
             "timestamp": datetime.now().isoformat()
         })
 
-@tool
 def scrape_brand_content(urls: str, platform: str = "web") -> str:
     """
     Scrape content from URLs for brand analysis.
@@ -98,7 +87,7 @@ def scrape_brand_content(urls: str, platform: str = "web") -> str:
         
         # Parse URLs
         if isinstance(urls, str):
-            url_list = json.loads(urls)
+            url_list = fast_json.loads(urls)
         else:
             url_list = urls
             
@@ -110,7 +99,7 @@ def scrape_brand_content(urls: str, platform: str = "web") -> str:
         
         if scraped_data:
             print(f"✅ Scraped {len(scraped_data)} items from {platform}")
-            return json.dumps({
+            return fast_json.dumps({
                 "platform": platform,
                 "urls": url_list,
                 "scraped_data": scraped_data,
@@ -118,7 +107,7 @@ def scrape_brand_content(urls: str, platform: str = "web") -> str:
             })
         else:
             print("⚠️  No content scraped")
-            return json.dumps({
+            return fast_json.dumps({
                 "platform": platform,
                 "urls": url_list,
                 "scraped_data": [],
@@ -129,51 +118,40 @@ def scrape_brand_content(urls: str, platform: str = "web") -> str:
     except Exception as e:
         error_msg = f"Error scraping content: {str(e)}"
         print(f"❌ {error_msg}")
-        return json.dumps({
+        return fast_json.dumps({
             "platform": platform,
             "error": error_msg,
             "timestamp": datetime.now().isoformat()
         })
 
-@tool
-def analyze_brand_sentiment(content: str, brand_name: str) -> str:
+def analyze_brand_sentiment(content: str, brand_name: str, use_cache: bool = True) -> str:
     """
     Analyze sentiment of brand mentions using AWS Bedrock.
 
     Args:
         content: JSON string containing content to analyze
         brand_name: The brand name to analyze sentiment for
+        use_cache: Reuse the response to an identical earlier request (default: True)
 
     Returns:
         JSON string containing sentiment analysis results
     """
     try:
         # Parse content
-        content_data = json.loads(content) if isinstance(content, str) else content
+        content_data = fast_json.loads(content) if isinstance(content, str) else content
         
         print(f"Analyzing sentiment for '{brand_name}'...")
         
-        # Initialize Bedrock client
-        bedrock = boto3.client('bedrock-runtime', region_name='us-west-2')
+        # Shared Bedrock client (created once per process)
+        from bedrock_runtime import get_bedrock_client, invoke_model_cached
+        bedrock = get_bedrock_client()
         
-        # Prepare content for analysis
-        analysis_text = f"Brand: {brand_name}\n\nContent to analyze:\n"
-        
-        if isinstance(content_data, dict) and 'scraped_data' in content_data:
-            # Handle scraped data format
-            for item in content_data['scraped_data']:
-                if 'post_text' in item:
-                    analysis_text += f"- {item['post_text']}\n"
-                elif 'description' in item:
-                    analysis_text += f"- {item['description']}\n"
-                elif 'markdown' in item:
-                    analysis_text += f"- {item['markdown']}\n"
-        elif isinstance(content_data, dict) and 'search_results' in content_data:
-            # Handle search results format
-            for result in content_data['search_results']:
-                analysis_text += f"- {result.get('snippet', '')}\n"
-        else:
-            analysis_text += str(content_data)
+        # Prepare content for analysis: deduplicate, rank and trim to the token budget
+        builder = PromptBuilder(brand_name)
+        add_content_snippets(builder, content_data)
+        snippets_text, prompt_stats = builder.build()
+        analysis_text = f"Brand: {brand_name}\n\nContent to analyze:\n{snippets_text}\n"
+        print(f"✂️  Prompt content: {prompt_stats['tokens_after']} tokens ({prompt_stats['tokens_saved']} saved)")
         
         # Create prompt for sentiment analysis
         prompt = f"""
@@ -204,125 +182,63 @@ def analyze_brand_sentiment(content: str, brand_name: str) -> str:
             ]
         }
         
-        # Call Bedrock
-        response = bedrock.invoke_model(
+        # Call Bedrock (identical requests are answered from the response cache)
+        response_body = invoke_model_cached(
+            bedrock,
             modelId="us.anthropic.claude-3-5-sonnet-20241022-v2:0",
             body=json.dumps(body),
+            use_cache=use_cache,
             contentType="application/json"
         )
-        
-        # Parse response
-        response_body = json.loads(response['body'].read())
         analysis_result = response_body['content'][0]['text']
         
         print(f"✅ Sentiment analysis completed for '{brand_name}'")
         
-        return json.dumps({
+        return fast_json.dumps({
             "brand_name": brand_name,
             "sentiment_analysis": analysis_result,
+            "prompt_stats": prompt_stats,
             "timestamp": datetime.now().isoformat()
         })
         
     except Exception as e:
         error_msg = f"Error analyzing sentiment: {str(e)}"
         print(f"❌ {error_msg}")
-        return json.dumps({
+        return fast_json.dumps({
             "brand_name": brand_name,
             "error": error_msg,
             "timestamp": datetime.now().isoformat()
         })
 
-@tool
-def generate_brand_report(analysis_data: str, brand_name: str) -> str:
+def generate_brand_report(analysis_data: str, brand_name: str, use_cache: bool = True) -> str:
     """
     Generate a comprehensive brand monitoring report.
 
     Args:
         analysis_data: JSON string containing all analysis data
         brand_name: The brand name for the report
+        use_cache: Reuse the response to an identical earlier request (default: True)
 
     Returns:
         JSON string containing the generated report
     """
     try:
-        print(f"📊 Generating brand report for '{brand_name}'...")
-        
-        # Parse analysis data
-        data = json.loads(analysis_data) if isinstance(analysis_data, str) else analysis_data
-        
-        # Initialize Bedrock client
-        bedrock = boto3.client('bedrock-runtime', region_name='us-west-2')
-        
-        # Create report prompt
-        prompt = f"""
-        Generate a comprehensive brand monitoring report for "{brand_name}" based on the following data:
-        
-        {json.dumps(data, indent=2)}
-        
-        The report should include:
-        1. Executive Summary
-        2. Brand Mention Overview
-        3. Sentiment Analysis Summary
-        4. Key Findings
-        5. Recommendations
-        6. Next Steps
-        
-        Format the report in markdown and make it professional and actionable.
-        """
-        
-        # Prepare Bedrock request
-        body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 2000,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        }
-        
-        # Call Bedrock
-        response = bedrock.invoke_model(
-            modelId="us.anthropic.claude-3-5-sonnet-20241022-v2:0",
-            body=json.dumps(body),
-            contentType="application/json"
-        )
-        
-        # Parse response
-        response_body = json.loads(response['body'].read())
-        report_content = response_body['content'][0]['text']
-        
-        print(f"✅ Brand report generated for '{brand_name}'")
-        
-        return json.dumps({
-            "brand_name": brand_name,
-            "report_content": report_content,
-            "timestamp": datetime.now().isoformat()
-        })
+        return fast_json.dumps(generate_brand_report_data(analysis_data, brand_name, use_cache))
         
     except Exception as e:
         error_msg = f"Error generating report: {str(e)}"
         print(f"❌ {error_msg}")
-        return json.dumps({
+        return fast_json.dumps({
             "brand_name": brand_name,
             "error": error_msg,
             "timestamp": datetime.now().isoformat()
         })
 
 # ==============================================================================
-# SECTION 2: MAIN EXECUTION
+# SECTION 2: AGENT SETUP
 # ==============================================================================
 
-if __name__ == "__main__":
-    # Initialize data storage
-    storage = BrandMonitoringDataStorage()
-    
-    # --- Step 1: Define Agent Configuration ---
-    boto_session = Session()
-    region = boto_session.region_name or "us-west-2"
-
-    SYSTEM_PROMPT = """
+SYSTEM_PROMPT = """
     You are a Brand Monitoring Specialist with expertise in:
     - Web search and content discovery
     - Sentiment analysis and brand perception
@@ -340,7 +256,24 @@ if __name__ == "__main__":
     Generate comprehensive reports that include actionable recommendations.
     """
 
-    # --- Step 2: Create the Brand Monitoring Agent ---
+def build_monitoring_crew(brand_name: str = "OpenAI", verbose: bool = True):
+    """
+    Build the CrewAI agent, task and crew that monitor one brand
+
+    Args:
+        brand_name: Brand the task searches and analyzes
+        verbose: Let CrewAI log each reasoning step
+
+    Returns:
+        A Crew ready for kickoff()
+    """
+    from boto3.session import Session
+    from crewai import Agent, Crew, Process, Task, LLM
+    from crewai.tools import tool
+    
+    boto_session = Session()
+    region = boto_session.region_name or "us-west-2"
+
     print("Initializing Bedrock model...")
     
     # Set AWS credentials for boto3
@@ -359,51 +292,76 @@ if __name__ == "__main__":
         role="Brand Monitoring Specialist",
         goal="Monitor brand mentions across platforms and analyze sentiment",
         backstory=SYSTEM_PROMPT,
-        tools=[
+        tools=[tool(func) for func in (
             search_brand_mentions,
             scrape_brand_content,
             analyze_brand_sentiment,
             generate_brand_report
-        ],
+        )],
         llm=llm,
-        verbose=True
+        verbose=verbose
     )
 
     print("✅ Brand Monitoring Agent created successfully!")
 
-    # --- Step 3: Create Tasks ---
-    print("Creating brand monitoring tasks...")
-    
-    # Task 1: Search for brand mentions
+    # Search, analyze and report on the brand
     search_task = Task(
-        description="Search for mentions of 'OpenAI' across the web and analyze the sentiment of the findings",
+        description=f"Search for mentions of '{brand_name}' across the web and analyze the sentiment of the findings",
         expected_output="A comprehensive analysis of brand mentions including sentiment scores and key insights",
         agent=agent
     )
 
-    # --- Step 4: Create Crew ---
     print("Creating brand monitoring crew...")
-    crew = Crew(
+    return Crew(
         agents=[agent],
         tasks=[search_task],
         process=Process.sequential,
-        verbose=True
+        verbose=verbose
     )
 
-    # --- Step 5: Execute ---
+# ==============================================================================
+# SECTION 3: MAIN EXECUTION
+# ==============================================================================
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Monitor a brand and save the results for the frontend")
+    parser.add_argument("brand", nargs="?", default="OpenAI")
+    parser.add_argument("--agent", action="store_true",
+                        help="Let the CrewAI agent pick the tools instead of running the fixed pipeline")
+    args = parser.parse_args()
+    
+    # Initialize data storage
+    storage = BrandMonitoringDataStorage()
+    
     print("\n--- Starting Brand Monitoring Analysis ---")
-    print("This will run all tasks sequentially...")
     
     try:
-        result = crew.kickoff()
-        print("\n" + "="*60)
-        print("🎉 BRAND MONITORING ANALYSIS COMPLETED!")
-        print("="*60)
-        print(result)
-        
-        # Save results to file using data storage
-        print("\n💾 Saving results to file...")
-        filename = storage.save_from_agent_output(str(result), "OpenAI")
+        if args.agent:
+            print("This will run all tasks sequentially...")
+            result = build_monitoring_crew(args.brand).kickoff()
+            print("\n" + "="*60)
+            print("🎉 BRAND MONITORING ANALYSIS COMPLETED!")
+            print("="*60)
+            print(result)
+            
+            # Save results to file using data storage
+            print("\n💾 Saving results to file...")
+            filename = storage.save_from_agent_output(str(result), args.brand)
+        else:
+            # Fixed workflow: call the tools directly in a stage graph, spending
+            # Bedrock tokens only on the sentiment analysis and the report
+            from monitoring_pipeline import run_monitoring_pipeline, save_pipeline_result, storage_agent_toolset
+            
+            result = run_monitoring_pipeline(args.brand, storage_agent_toolset())
+            print("\n" + "="*60)
+            print(f"🎉 BRAND MONITORING PIPELINE COMPLETED in {result['stage_latency']['elapsed']}s")
+            print("="*60)
+            print(result["report"].get("report_content", ""))
+            
+            print("\n💾 Saving results to file...")
+            filename = save_pipeline_result(storage, result)
         
         if filename:
             print(f"✅ Results saved to: {filename}")
@@ -421,9 +379,9 @@ if __name__ == "__main__":
         
         # Save error information
         error_data = {
-            "brand_name": "OpenAI",
+            "brand_name": args.brand,
             "error": str(e),
             "timestamp": datetime.now().isoformat(),
             "status": "failed"
         }
-        storage.save_result("OpenAI", [], metadata=error_data)
+        storage.save_result(args.brand, [], metadata=error_data)
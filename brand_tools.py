@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Brand Monitoring Tool Functions
+Search, scrape, sentiment and report functions without the CrewAI layer
+
+Importing this module is cheap: BrightData, Bedrock (boto3) and the sentiment
+batching helpers are imported on first use, and CrewAI is not imported at all.
+The agent modules wrap these functions as CrewAI tools; the Flask app and the
+deterministic pipeline call them directly.
+"""
+
+import importlib
+import importlib.util
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from cache import get_search_cache, search_cache_key
+import fast_json
+
+# Heavy frameworks reported by dependency_status()
+HEAVY_MODULES = ("crewai", "boto3", "ddgs")
+
+def cached_search(brand_name: str, total_results: int) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Web search that reuses a recent identical BrightData search
+
+    Only BrightData results are cached: a DuckDuckGo fallback answer would
+    otherwise keep being served for the whole TTL after BrightData recovers.
+
+    Returns:
+        (results, cached) tuple
+    """
+    from standalone_tools import search_web_with_backend
+    
+    cache = get_search_cache()
+    cache_key = search_cache_key(brand_name, total_results, "brightdata")
+    results = cache.get(cache_key) if cache else None
+    if results is not None:
+        return results, True
+    results, backend = search_web_with_backend(brand_name, total_results=total_results)
+    if cache and results and backend == "brightdata":
+        cache.set(cache_key, results)
+    return results, False
+
+def search_brand_mentions_data(brand_name: str, total_results: int = 15) -> Dict[str, Any]:
+    """
+    Search for brand mentions and return the results as a dictionary.
+
+    In-process callers use this directly; the search_brand_mentions tool wraps
+    it as a JSON string for the agent.
+
+    Args:
+        brand_name: The brand/company name to search for
+        total_results: Number of search results to return (default: 15)
+
+    Returns:
+        Dict with brand_name, total_results and search_results
+    """
+    print(f"Searching for mentions of '{brand_name}'...")
+    
+    # Reuse a recent identical search (the query already covers a weekly window)
+    results, cached = cached_search(brand_name, total_results)
+    if cached:
+        print(f"Using cached search results for '{brand_name}'")
+    
+    # Format results for better readability
+    formatted_results = []
+    for result in results:
+        formatted_results.append({
+            "title": result.get("title", ""),
+            "link": result.get("link", ""),
+            "snippet": result.get("snippet", "")
+        })
+    
+    return {
+        "brand_name": brand_name,
+        "total_results": len(formatted_results),
+        "search_results": formatted_results
+    }
+
+def scrape_platform_content_data(urls: Any, platform: str) -> Dict[str, Any]:
+    """
+    Scrape content from specific platform URLs and return it as a dictionary.
+
+    Args:
+        urls: List of URLs (or a JSON string containing one)
+        platform: Platform type (linkedin, instagram, youtube, x, web)
+
+    Returns:
+        Dict with platform, urls_scraped and scraped_data
+    """
+    from standalone_tools import PLATFORM_DATASET_IDS, scrape_urls
+    
+    url_list = fast_json.loads(urls) if isinstance(urls, str) else urls
+    
+    print(f"Scraping {len(url_list)} URLs from {platform}...")
+    
+    if platform not in PLATFORM_DATASET_IDS:
+        raise ValueError(f"Unsupported platform: {platform}")
+    
+    # Scrape URLs using existing function
+    params = {"dataset_id": PLATFORM_DATASET_IDS[platform]}
+    scraped_data = scrape_urls(url_list, params, platform)
+    
+    return {
+        "platform": platform,
+        "urls_scraped": len(url_list),
+        "scraped_data": scraped_data
+    }
+
+def scrape_mixed_platform_content_data(urls: Any) -> Dict[str, Any]:
+    """
+    Batch scrape a mixed list of URLs and return the result as a dictionary.
+
+    Args:
+        urls: List of URLs (or a JSON string containing one)
+
+    Returns:
+        Dict with urls_scraped, per-platform counts and scraped_data
+    """
+    from standalone_tools import scrape_urls_batch
+    
+    url_list = fast_json.loads(urls) if isinstance(urls, str) else urls
+    
+    print(f"Batch scraping {len(url_list)} URLs...")
+    scraped_data = scrape_urls_batch(url_list)
+    
+    platforms = {}
+    for item in scraped_data:
+        platforms[item["platform"]] = platforms.get(item["platform"], 0) + 1
+    
+    return {
+        "urls_scraped": len(url_list),
+        "platforms": platforms,
+        "scraped_data": scraped_data
+    }
+
+def _sentiment_json(response_body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The sentiment object in a Bedrock reply, or None if the reply is not a JSON object"""
+    try:
+        data = json.loads(response_body['content'][0]['text'].strip())
+    except (KeyError, IndexError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+def analyze_brand_sentiment_data(content: Any, brand_name: str, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Analyze sentiment of brand mentions using Bedrock and return a dictionary.
+
+    Args:
+        content: Scraped content or search results (dict, or a JSON string)
+        brand_name: The brand name to analyze sentiment for
+        use_cache: Reuse the response to an identical earlier request (default: True)
+
+    Returns:
+        Dict with brand_name, sentiment_analysis, prompt_stats and timestamp
+    """
+    from bedrock_runtime import get_bedrock_client, invoke_model_cached
+    from prompt_builder import PromptBuilder, add_content_snippets
+    
+    content_data = fast_json.loads(content) if isinstance(content, str) else content
+    
+    print(f"Analyzing sentiment for '{brand_name}'...")
+    
+    # Shared Bedrock client (created once per process)
+    bedrock = get_bedrock_client()
+    
+    # Prepare content for analysis: deduplicate, rank and trim to the token budget
+    builder = PromptBuilder(brand_name)
+    add_content_snippets(builder, content_data)
+    snippets_text, prompt_stats = builder.build()
+    analysis_text = f"Brand: {brand_name}\n\nContent to analyze:\n{snippets_text}\n"
+    print(f"Prompt content: {prompt_stats['tokens_after']} tokens ({prompt_stats['tokens_saved']} saved)")
+    
+    # Create sentiment analysis prompt
+    prompt = f"""
+    Analyze the sentiment of the following brand mentions for "{brand_name}".
+    Provide a sentiment score between -1 (very negative) and 1 (very positive).
+    Also provide a brief explanation of the sentiment.
+    
+    Content:
+    {analysis_text}
+    
+    Please respond in JSON format:
+    {{
+        "sentiment_score": <number between -1 and 1>,
+        "sentiment_label": "<positive/negative/neutral>",
+        "explanation": "<brief explanation>",
+        "confidence": <number between 0 and 1>
+    }}
+    """
+    
+    # Call Bedrock model (identical prompts are answered from the response cache;
+    # replies that are not JSON are not cached, so the next call asks again)
+    result = invoke_model_cached(
+        bedrock,
+        modelId="anthropic.claude-3-5-sonnet-20241022-v2:0",
+        body=json.dumps({
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 300,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }),
+        use_cache=use_cache,
+        cache_if=lambda reply: _sentiment_json(reply) is not None
+    )
+    
+    sentiment_data = _sentiment_json(result)
+    if sentiment_data is None:
+        # Fallback if JSON parsing fails
+        sentiment_data = {
+            "sentiment_score": 0.0,
+            "sentiment_label": "neutral",
+            "explanation": result['content'][0]['text'].strip(),
+            "confidence": 0.5
+        }
+    
+    return {
+        "brand_name": brand_name,
+        "sentiment_analysis": sentiment_data,
+        "prompt_stats": prompt_stats,
+        "timestamp": datetime.now().isoformat()
+    }
+
+def analyze_mention_sentiments_data(content: Any, brand_name: str, token_budget: int = 3000,
+                                    use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Score each brand mention with batched Bedrock requests and return a dictionary.
+
+    Args:
+        content: Scraped content or search results (dict, or a JSON string)
+        brand_name: The brand name to analyze sentiment for
+        token_budget: Maximum input tokens per Bedrock request (default: 3000)
+        use_cache: Reuse responses to identical earlier requests (default: True)
+
+    Returns:
+        Dict with a score per mention and an overall summary
+    """
+    from bedrock_runtime import get_bedrock_client
+    from sentiment_batching import extract_mentions, score_mentions
+    
+    content_data = fast_json.loads(content) if isinstance(content, str) else content
+    mentions = extract_mentions(content_data)
+    
+    print(f"Scoring {len(mentions)} mentions for '{brand_name}'...")
+    
+    bedrock = get_bedrock_client()
+    result = score_mentions(mentions, brand_name, token_budget=token_budget,
+                            use_cache=use_cache, bedrock=bedrock)
+    
+    return {
+        "brand_name": brand_name,
+        "sentiment_analysis": result["summary"],
+        "mention_sentiments": result["scores"],
+        "bedrock_requests": result["batches"],
+        "errors": result["errors"],
+        "timestamp": datetime.now().isoformat()
+    }
+
+def brand_report_markdown(brand_name: str, search_results: Any, sentiment_data: Any) -> str:
+    """
+    Build the markdown brand monitoring report from search and sentiment results.
+
+    Args:
+        brand_name: The brand name being monitored
+        search_results: Search results (dict, or a JSON string)
+        sentiment_data: Sentiment analysis (dict, or a JSON string)
+
+    Returns:
+        Formatted brand monitoring report
+    """
+    print(f"Generating brand report for '{brand_name}'...")
+    
+    # Parse input data
+    search_data = fast_json.loads(search_results) if isinstance(search_results, str) else search_results
+    sentiment_info = fast_json.loads(sentiment_data) if isinstance(sentiment_data, str) else sentiment_data
+    
+    # Extract key metrics
+    total_mentions = search_data.get('total_results', 0)
+    sentiment_score = sentiment_info.get('sentiment_analysis', {}).get('sentiment_score', 0)
+    sentiment_label = sentiment_info.get('sentiment_analysis', {}).get('sentiment_label', 'unknown')
+    
+    # Generate report
+    report = f"""
+# Brand Monitoring Report: {brand_name}
+
+## Executive Summary
+- **Total Mentions Found**: {total_mentions}
+- **Overall Sentiment**: {sentiment_label.title()} (Score: {sentiment_score:.2f})
+- **Analysis Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+## Key Findings
+"""
+    
+    if sentiment_score > 0.3:
+        report += "- Brand sentiment is **positive** with good online presence\n"
+    elif sentiment_score < -0.3:
+        report += "- Brand sentiment is **negative** - attention needed\n"
+    else:
+        report += "- Brand sentiment is **neutral** - monitoring recommended\n"
+    
+    report += f"- Found {total_mentions} mentions across web sources\n"
+    
+    # Add top mentions
+    if 'search_results' in search_data:
+        report += "\n## Top Mentions\n"
+        for i, result in enumerate(search_data['search_results'][:5], 1):
+            report += f"{i}. **{result.get('title', 'No title')}**\n"
+            report += f"   - URL: {result.get('link', 'No link')}\n"
+            report += f"   - Snippet: {result.get('snippet', 'No snippet')[:100]}...\n\n"
+    
+    # Add sentiment details
+    if 'sentiment_analysis' in sentiment_info:
+        sentiment_analysis = sentiment_info['sentiment_analysis']
+        report += f"## Sentiment Analysis Details\n"
+        report += f"- **Score**: {sentiment_analysis.get('sentiment_score', 'N/A')}\n"
+        report += f"- **Label**: {sentiment_analysis.get('sentiment_label', 'N/A')}\n"
+        report += f"- **Explanation**: {sentiment_analysis.get('explanation', 'N/A')}\n"
+        report += f"- **Confidence**: {sentiment_analysis.get('confidence', 'N/A')}\n"
+    
+    report += f"\n## Recommendations\n"
+    if sentiment_score > 0.3:
+        report += "- Continue current brand strategy - positive sentiment detected\n"
+        report += "- Consider amplifying positive mentions\n"
+    elif sentiment_score < -0.3:
+        report += "- Address negative sentiment immediately\n"
+        report += "- Consider reputation management strategies\n"
+    else:
+        report += "- Monitor brand mentions regularly\n"
+        report += "- Consider proactive engagement strategies\n"
+    
+    return report
+
+# Bedrock model for the generated (non-template) report
+REPORT_MODEL_ID = "us.anthropic.claude-3-5-sonnet-20241022-v2:0"
+
+def build_report_request(data: Any, brand_name: str) -> tuple:
+    """
+    Build the Bedrock request body for a brand report
+
+    Args:
+        data: Parsed analysis data
+        brand_name: The brand name for the report
+
+    Returns:
+        (body, prompt_stats) tuple
+    """
+    from prompt_builder import build_report_context
+
+    # Compact the payload into a budgeted prompt instead of inlining indented JSON
+    report_context, prompt_stats = build_report_context(brand_name, data)
+    print(f"✂️  Report context: {prompt_stats['tokens_after']} tokens ({prompt_stats['tokens_saved']} saved)")
+    
+    # Create report prompt
+    prompt = f"""
+    Generate a comprehensive brand monitoring report for "{brand_name}" based on the following data:
+    
+    {report_context}
+    
+    The report should include:
+    1. Executive Summary
+    2. Brand Mention Overview
+    3. Sentiment Analysis Summary
+    4. Key Findings
+    5. Recommendations
+    6. Next Steps
+    
+    Format the report in markdown and make it professional and actionable.
+    """
+    
+    body = {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": 2000,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    }
+    return body, prompt_stats
+
+def generate_brand_report_data(analysis_data: Any, brand_name: str, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Generate a Bedrock brand report and return it as a dictionary.
+
+    Args:
+        analysis_data: Analysis data (or a JSON string containing it)
+        brand_name: The brand name for the report
+        use_cache: Reuse the response to an identical earlier request (default: True)
+
+    Returns:
+        Dict with brand_name, report_content, prompt_stats and timestamp
+    """
+    from bedrock_runtime import get_bedrock_client, invoke_model_cached
+
+    print(f"📊 Generating brand report for '{brand_name}'...")
+    data = fast_json.loads(analysis_data) if isinstance(analysis_data, str) else analysis_data
+    body, prompt_stats = build_report_request(data, brand_name)
+    response_body = invoke_model_cached(
+        get_bedrock_client(),
+        modelId=REPORT_MODEL_ID,
+        body=json.dumps(body),
+        use_cache=use_cache,
+        contentType="application/json"
+    )
+    print(f"✅ Brand report generated for '{brand_name}'")
+    return {
+        "brand_name": brand_name,
+        "report_content": response_body['content'][0]['text'],
+        "prompt_stats": prompt_stats,
+        "timestamp": datetime.now().isoformat()
+    }
+
+def stream_brand_report(analysis_data: str, brand_name: str, use_cache: bool = True) -> Iterator[str]:
+    """
+    Generate a brand report, yielding markdown as Bedrock streams it back.
+
+    Same prompt and response cache as the storage agent's generate_brand_report tool, so the first text
+    arrives after roughly one model round-trip instead of the full completion.
+
+    Args:
+        analysis_data: JSON string containing all analysis data
+        brand_name: The brand name for the report
+        use_cache: Reuse the response to an identical earlier request (default: True)
+
+    Yields:
+        Chunks of report markdown
+    """
+    from bedrock_runtime import get_bedrock_client, stream_model_text
+
+    print(f"📊 Streaming brand report for '{brand_name}'...")
+    data = fast_json.loads(analysis_data) if isinstance(analysis_data, str) else analysis_data
+    body, _ = build_report_request(data, brand_name)
+    yield from stream_model_text(
+        get_bedrock_client(),
+        modelId=REPORT_MODEL_ID,
+        body=json.dumps(body),
+        use_cache=use_cache,
+        contentType="application/json"
+    )
+    print(f"✅ Brand report streamed for '{brand_name}'")
+
+def dependency_status() -> Dict[str, Dict[str, bool]]:
+    """Whether each heavy framework is installed and already imported, without importing it"""
+    return {name: {"available": importlib.util.find_spec(name) is not None, "loaded": name in sys.modules}
+            for name in HEAVY_MODULES}
+
+def prewarm(region: Optional[str] = None) -> Dict[str, float]:
+    """
+    Import the request-path dependencies and create the Bedrock client ahead of the first request
+
+    Args:
+        region: Bedrock region to create the shared client for (default: BEDROCK_REGION)
+
+    Returns:
+        Seconds spent per step (failed steps are logged and skipped)
+    """
+    steps = [
+        ("standalone_tools", lambda: importlib.import_module("standalone_tools")),
+        ("ddgs", lambda: importlib.import_module("ddgs")),
+        ("sentiment_batching", lambda: importlib.import_module("sentiment_batching")),
+        ("bedrock_client", lambda: importlib.import_module("bedrock_runtime").get_bedrock_client(region)),
+    ]
+    timings = {}
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            print(f"⚠️  Prewarm step {name} failed: {str(e)}")
+        timings[name] = round(time.perf_counter() - start, 3)
+    print(f"🔥 Prewarmed tool dependencies in {sum(timings.values()):.2f}s")
+    return timings
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Result Cache for Brand Monitoring
+In-process LRU and on-disk tiers with TTL expiry and hit/miss metrics
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def make_cache_key(key_parts: Any) -> str:
+    """Hash any JSON-serializable key into a stable content address"""
+    canonical = json.dumps(key_parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MemoryTier:
+    """Thread-safe in-process LRU tier"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, expires_at: float, value: Any):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskTier:
+    """
+    On-disk tier storing one JSON file per key
+
+    Recency is tracked through file mtimes (touched on every hit), so the least
+    recently used files are removed first once ``max_entries`` is exceeded.
+    """
+
+    name = "disk"
+
+    def __init__(self, cache_dir: str, max_entries: int = 2048):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.evictions = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+            return entry["expires_at"], entry["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, expires_at: float, value: Any):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"expires_at": expires_at, "value": value}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️  Could not write cache entry {key[:12]}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._enforce_limit()
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                self.delete(entry.name[:-5])
+
+    def _enforce_limit(self):
+        with self._lock:
+            entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith(".json")]
+            overflow = len(entries) - self.max_entries
+            if overflow <= 0:
+                return
+            entries.sort(key=lambda e: e.stat().st_mtime)
+            for entry in entries[:overflow]:
+                try:
+                    os.remove(entry.path)
+                    self.evictions += 1
+                except OSError:
+                    pass
+
+    def __len__(self):
+        return sum(1 for e in os.scandir(self.cache_dir) if e.name.endswith(".json"))
+
+
+class TieredCache:
+    """
+    Read-through cache over an ordered list of tiers
+
+    Lookups try each tier in order and promote hits into the faster tiers
+    above them. Writes go to every tier.
+    """
+
+    def __init__(self, tiers: List[Any], ttl_seconds: float = 3600, name: str = "cache"):
+        self.tiers = tiers
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self._lock = threading.Lock()
+        self._hits = {tier.name: 0 for tier in tiers}
+        self._misses = 0
+        self._expired = 0
+
+    def get(self, key_parts: Any) -> Optional[Any]:
+        """Return the cached value for ``key_parts`` or None on a miss"""
+        key = make_cache_key(key_parts)
+        now = time.time()
+        for index, tier in enumerate(self.tiers):
+            entry = tier.get(key)
+            if entry is None:
+                continue
+            expires_at, value = entry
+            if expires_at <= now:
+                tier.delete(key)
+                with self._lock:
+                    self._expired += 1
+                continue
+            for faster_tier in self.tiers[:index]:
+                faster_tier.set(key, expires_at, value)
+            with self._lock:
+                self._hits[tier.name] += 1
+            return value
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def set(self, key_parts: Any, value: Any, ttl_seconds: float = None):
+        key = make_cache_key(key_parts)
+        expires_at = time.time() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        for tier in self.tiers:
+            tier.set(key, expires_at, value)
+
+    def invalidate(self, key_parts: Any):
+        key = make_cache_key(key_parts)
+        for tier in self.tiers:
+            tier.delete(key)
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per tier plus current sizes"""
+        with self._lock:
+            hits = sum(self._hits.values())
+            lookups = hits + self._misses
+            return {
+                "name": self.name,
+                "hits": hits,
+                "hits_by_tier": dict(self._hits),
+                "misses": self._misses,
+                "expired": self._expired,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "ttl_seconds": self.ttl_seconds,
+                "tiers": {
+                    tier.name: {"entries": len(tier), "max_entries": tier.max_entries, "evictions": tier.evictions}
+                    for tier in self.tiers
+                },
+            }
+
+
+class _Flight:
+    """One in-flight computation and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one execution
+
+    While a call for a key is running, further calls with the same key wait
+    for it and receive its result (or its exception) instead of running the
+    work again. Nothing is kept once the call finishes; pair it with a
+    TieredCache when results should also be reused afterwards.
+    """
+
+    def __init__(self, name: str = "flights"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._calls = 0
+        self._executions = 0
+
+    def do(self, key_parts: Any, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run ``func`` unless an identical call is already in flight
+
+        Args:
+            key_parts: JSON-serializable key identifying identical calls
+            func: Zero-argument callable doing the work
+
+        Returns:
+            (result, shared) where shared is True if the result came from
+            another caller's execution
+        """
+        key = make_cache_key(key_parts)
+        with self._lock:
+            self._calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = func()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                self._executions += 1
+            flight.done.set()
+        return flight.result, False
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls, executions, calls served by another caller's execution, and flights running now"""
+        with self._lock:
+            return {
+                "name": self.name,
+                "calls": self._calls,
+                "executions": self._executions,
+                "coalesced": self._calls - self._executions - len(self._flights),
+                "in_flight": len(self._flights),
+            }
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+_search_cache: Optional[TieredCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[TieredCache]:
+    """
+    Shared cache for web search results, or None when SEARCH_CACHE_DISABLED is set
+
+    Configured from SEARCH_CACHE_TTL (seconds), SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_DISK_MAX_ENTRIES and SEARCH_CACHE_DIR (empty for memory only).
+    """
+    global _search_cache
+    if _env_flag("SEARCH_CACHE_DISABLED"):
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            tiers = [MemoryTier(int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "256")))]
+            cache_dir = os.getenv("SEARCH_CACHE_DIR", os.path.join(".cache", "search"))
+            if cache_dir:
+                tiers.append(DiskTier(cache_dir, int(os.getenv("SEARCH_CACHE_DISK_MAX_ENTRIES", "2048"))))
+            _search_cache = TieredCache(tiers, ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL", "3600")),
+                                        name="search")
+    return _search_cache
+
+
+_llm_cache: Optional[TieredCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[TieredCache]:
+    """
+    Shared persistent cache for Bedrock responses, or None when LLM_CACHE_DISABLED is set
+
+    Configured from LLM_CACHE_TTL (seconds), LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_DISK_MAX_ENTRIES and LLM_CACHE_DIR (empty for memory only).
+    """
+    global _llm_cache
+    if _env_flag("LLM_CACHE_DISABLED"):
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            tiers = [MemoryTier(int(os.getenv("LLM_CACHE_MAX_ENTRIES", "128")))]
+            cache_dir = os.getenv("LLM_CACHE_DIR", os.path.join(".cache", "bedrock"))
+            if cache_dir:
+                tiers.append(DiskTier(cache_dir, int(os.getenv("LLM_CACHE_DISK_MAX_ENTRIES", "1024"))))
+            _llm_cache = TieredCache(tiers, ttl_seconds=float(os.getenv("LLM_CACHE_TTL", "86400")),
+                                     name="bedrock")
+    return _llm_cache
+
+
+def search_cache_key(brand_name: str, total_results: int, backend: str) -> Dict[str, Any]:
+    """Cache key for a brand search; brand names are matched case-insensitively"""
+    return {
+        "brand": " ".join(brand_name.lower().split()),
+        "total_results": int(total_results),
+        "backend": backend,
+    }
+
+
+_pipeline_cache: Optional[TieredCache] = None
+_pipeline_cache_lock = threading.Lock()
+
+
+def get_pipeline_cache() -> Optional[TieredCache]:
+    """
+    Shared cache for pipeline stage results (e.g. scraped pages), or None when PIPELINE_CACHE_DISABLED is set
+
+    Configured from PIPELINE_CACHE_TTL (seconds), PIPELINE_CACHE_MAX_ENTRIES,
+    PIPELINE_CACHE_DISK_MAX_ENTRIES and PIPELINE_CACHE_DIR (empty for memory only).
+    """
+    global _pipeline_cache
+    if _env_flag("PIPELINE_CACHE_DISABLED"):
+        return None
+    with _pipeline_cache_lock:
+        if _pipeline_cache is None:
+            tiers = [MemoryTier(int(os.getenv("PIPELINE_CACHE_MAX_ENTRIES", "64")))]
+            cache_dir = os.getenv("PIPELINE_CACHE_DIR", os.path.join(".cache", "pipeline"))
+            if cache_dir:
+                tiers.append(DiskTier(cache_dir, int(os.getenv("PIPELINE_CACHE_DISK_MAX_ENTRIES", "512"))))
+            _pipeline_cache = TieredCache(tiers, ttl_seconds=float(os.getenv("PIPELINE_CACHE_TTL", "3600")),
+                                          name="pipeline")
+    return _pipeline_cache
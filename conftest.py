@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures
+Provides a local stand-in for the BrightData datasets API and the dashboard app
+"""
+
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+
+class FakeBrightData:
+    """In-memory BrightData datasets API: snapshots become ready after a per-dataset delay"""
+
+    def __init__(self):
+        self.ready_delays = {}
+        self.default_delay = 0.0
+        self.failing_datasets = set()
+        self.snapshots = {}
+        self.trigger_times = {}
+        self.progress_calls = 0
+        self.lock = threading.Lock()
+        self.server = None
+        self.base_url = None
+
+    def trigger(self, dataset_id, urls):
+        snapshot_id = f"s_{uuid.uuid4().hex[:12]}"
+        with self.lock:
+            self.snapshots[snapshot_id] = {
+                "dataset_id": dataset_id,
+                "urls": urls,
+                "ready_at": time.monotonic() + self.ready_delays.get(dataset_id, self.default_delay),
+            }
+            self.trigger_times[dataset_id] = time.monotonic()
+        return snapshot_id
+
+    def status(self, snapshot_id):
+        with self.lock:
+            self.progress_calls += 1
+            snapshot = self.snapshots.get(snapshot_id)
+        if snapshot is None:
+            return None
+        if snapshot["dataset_id"] in self.failing_datasets:
+            return "failed"
+        return "ready" if time.monotonic() >= snapshot["ready_at"] else "running"
+
+
+def _make_handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            parsed = urlparse(self.path)
+            length = int(self.headers.get("Content-Length", 0))
+            urls = [item["url"] for item in json.loads(self.rfile.read(length) or b"[]")]
+            dataset_id = parse_qs(parsed.query).get("dataset_id", [""])[0]
+            self._send(200, {"snapshot_id": fake.trigger(dataset_id, urls)})
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            snapshot_id = parsed.path.rsplit("/", 1)[-1]
+            if parsed.path.startswith("/datasets/v3/progress/"):
+                status = fake.status(snapshot_id)
+                if status is None:
+                    self._send(404, {"error": "unknown snapshot"})
+                else:
+                    self._send(200, {"status": status})
+            elif parsed.path.startswith("/datasets/v3/snapshot/"):
+                snapshot = fake.snapshots[snapshot_id]
+                self._send(200, [
+                    {"url": url, "dataset_id": snapshot["dataset_id"], "markdown": f"Content from {url}"}
+                    for url in snapshot["urls"]
+                ])
+            else:
+                self._send(404, {"error": "not found"})
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def fake_brightdata(monkeypatch):
+    """Run a FakeBrightData server and point standalone_tools at it"""
+    import standalone_tools
+    from snapshot_tracker import SnapshotTracker
+
+    fake = FakeBrightData()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(fake))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fake.server = server
+    fake.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    tracker = SnapshotTracker(standalone_tools._get_snapshot_status,
+                              initial_interval=0.05, max_interval=0.2, timeout=10)
+    monkeypatch.setenv("BRIGHT_DATA_API_KEY", "test-key")
+    monkeypatch.setattr(standalone_tools, "BRIGHTDATA_API_BASE", fake.base_url)
+    monkeypatch.setattr(standalone_tools, "_snapshot_tracker", tracker)
+
+    yield fake
+
+    tracker.stop()
+    server.shutdown()
+
+
+@pytest.fixture
+def enhanced_app(tmp_path, monkeypatch):
+    """The enhanced dashboard Flask app, writing its results under a temporary directory"""
+    frontend_dir = os.path.join(os.path.dirname(__file__), "frontend")
+    monkeypatch.syspath_prepend(frontend_dir)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LLM_CACHE_DIR", str(tmp_path / "llm-cache"))
+    monkeypatch.setenv("SEARCH_CACHE_DISABLED", "1")
+
+    import cache
+    monkeypatch.setattr(cache, "_llm_cache", None)
+
+    module = sys.modules.get("enhanced_app") or importlib.import_module("enhanced_app")
+    os.makedirs(module.RESULTS_DIR, exist_ok=True)
+    monkeypatch.setattr(module, "storage", module.BrandMonitoringDataStorage(module.RESULTS_DIR, backend="files"))
+    module.app.config["TESTING"] = True
+    return module
@@ -1,20 +1,91 @@
 #!/usr/bin/env python3
 """
 Data Storage Utility for Brand Monitoring Results
-Saves brand monitoring results to JSON files for the frontend to display
+Saves brand monitoring results to JSON files (or an indexed SQLite store) for the frontend to display
 """
 
-import json
 import os
+import uuid
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+import fast_json
+from result_compression import COMPRESSION_SUFFIXES, DECODE_ERRORS, compress, find_result_file, read_json, validate_compression
+from result_index import ResultIndex, index_entry
+from result_store import SQLiteResultStore, brand_key, decode_cursor, encode_cursor
+from segment_log import DEFAULT_MAX_SEGMENT_BYTES, SegmentLogStore
+from sentiment_rollup import SentimentRollupStore
+from result_retention import RetentionEngine, RetentionPolicy
+from durable_io import GroupCommitter, quarantine_file, scrub_results, validate_fsync_mode, write_atomic, write_temp
 
 class BrandMonitoringDataStorage:
     """Handles saving and loading brand monitoring results"""
     
-    def __init__(self, results_dir: str = "results"):
+    def __init__(self, results_dir: str = "results", backend: str = None, db_path: str = None,
+                 compression: str = None, keep_raw_output: bool = None, rollups: bool = None,
+                 retention: RetentionPolicy = None, retention_interval: float = None,
+                 fsync: str = None, scrub: bool = None):
+        """
+        Args:
+            results_dir: Directory for result files (and the default database location)
+            backend: "files" (one JSON file per result), "sqlite" (indexed database) or
+                "segments" (append-only JSONL log); defaults to the RESULTS_BACKEND
+                environment variable, then "files"
+            db_path: SQLite database path (default: <results_dir>/results.db)
+            compression: "gzip" or "zstd" to write compact, compressed result files
+                (files backend); defaults to the RESULTS_COMPRESSION environment variable
+            keep_raw_output: Also store the agent's raw output in the metadata of parsed
+                agent results; defaults to RESULTS_KEEP_RAW_OUTPUT, then True
+            rollups: Record per-brand minute/hour/day sentiment aggregates for every saved
+                result; defaults to RESULTS_ROLLUPS, then True
+            retention: Age / per-brand count / total size limits; defaults to the
+                RESULTS_RETENTION_* environment variables (see RetentionPolicy.from_env)
+            retention_interval: Seconds between background retention passes when a
+                policy is set; defaults to RESULTS_RETENTION_INTERVAL, then 3600 (0 disables)
+            fsync: Durability of result file writes (files backend), all of which are
+                atomic temp-file renames: "off" (no fsync), "always" (fsync every write)
+                or "group" (batch fsyncs across concurrent saves); defaults to RESULTS_FSYNC, then "off"
+            scrub: Quarantine corrupt result files and remove stale temp files on startup
+                (files backend); defaults to RESULTS_SCRUB, then True
+        """
         self.results_dir = results_dir
         os.makedirs(self.results_dir, exist_ok=True)
+        self.compression = validate_compression(
+            compression if compression is not None else os.getenv("RESULTS_COMPRESSION"))
+        if keep_raw_output is None:
+            keep_raw_output = os.getenv("RESULTS_KEEP_RAW_OUTPUT", "1").strip().lower() not in ("0", "false", "no", "off")
+        self.keep_raw_output = keep_raw_output
+        self.backend = (backend or os.getenv("RESULTS_BACKEND", "files")).lower()
+        self.store = None
+        self.index = None
+        self.fsync = validate_fsync_mode(fsync if fsync is not None else os.getenv("RESULTS_FSYNC"))
+        self.committer = GroupCommitter() if self.fsync == "group" else None
+        self.scrub_report = None
+        if self.backend == "files":
+            # Sidecar metadata index so listings never open result payloads
+            self.index = ResultIndex(self.results_dir)
+            if scrub is None:
+                scrub = os.getenv("RESULTS_SCRUB", "1").strip().lower() not in ("0", "false", "no", "off")
+            if scrub:
+                self.scrub_report = self.scrub()
+        elif self.backend == "sqlite":
+            self.store = SQLiteResultStore(db_path or os.path.join(self.results_dir, "results.db"))
+        elif self.backend == "segments":
+            # Segment size and compaction interval come from RESULTS_SEGMENT_MAX_BYTES / RESULTS_COMPACT_INTERVAL
+            self.store = SegmentLogStore(
+                os.path.join(self.results_dir, "segments"),
+                max_segment_bytes=int(os.getenv("RESULTS_SEGMENT_MAX_BYTES", str(DEFAULT_MAX_SEGMENT_BYTES))),
+                compact_interval=float(os.getenv("RESULTS_COMPACT_INTERVAL", "300")) or None
+            )
+        else:
+            raise ValueError(f"Unknown results backend: {self.backend}")
+        if rollups is None:
+            rollups = os.getenv("RESULTS_ROLLUPS", "1").strip().lower() not in ("0", "false", "no", "off")
+        self.rollups = SentimentRollupStore(os.path.join(self.results_dir, "rollups")) if rollups else None
+        policy = retention if retention is not None else RetentionPolicy.from_env()
+        if retention_interval is None:
+            retention_interval = float(os.getenv("RESULTS_RETENTION_INTERVAL", "3600"))
+        self.retention = RetentionEngine(self, policy, interval=retention_interval or None) if policy.active else None
     
     def save_result(self, brand_name: str, search_results: List[Dict], 
                    scraped_data: List[Dict] = None, sentiment_analysis: Dict = None,
@@ -35,10 +106,7 @@ class BrandMonitoringDataStorage:
         """
         try:
             # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_brand_name = brand_name.replace(' ', '_').replace('/', '_').lower()
-            filename = f"brand_monitoring_{safe_brand_name}_{timestamp}.json"
-            filepath = os.path.join(self.results_dir, filename)
+            filename = self._new_filename(brand_name, "json")
             
             # Prepare result data
             result_data = {
@@ -57,9 +125,7 @@ class BrandMonitoringDataStorage:
                 }
             }
             
-            # Save to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(result_data, f, indent=2, ensure_ascii=False)
+            self.save_document(filename, result_data)
             
             print(f"✅ Brand monitoring result saved: {filename}")
             return filename
@@ -68,6 +134,142 @@ class BrandMonitoringDataStorage:
             print(f"❌ Error saving result: {str(e)}")
             return None
     
+    @staticmethod
+    def new_filename(result_type: str, brand_name: str, extension: str = "json") -> str:
+        """
+        Unique result filename for a brand, e.g. "search_OpenAI_20250101_120000_a1b2c3.json"
+        
+        The random suffix keeps results saved for the same brand within the
+        same second from overwriting each other.
+        
+        Args:
+            result_type: Filename prefix (search, sentiment, full_analysis, demo, brand_monitoring)
+            brand_name: Brand the result is about
+            extension: "json" or "txt"
+        
+        Returns:
+            str: Filename to save the result under
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe_brand_name = brand_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
+        return f"{result_type}_{safe_brand_name}_{timestamp}_{uuid.uuid4().hex[:6]}.{extension}"
+    
+    @classmethod
+    def _new_filename(cls, brand_name: str, extension: str) -> str:
+        """Unique filename for save_result / save_raw_output results (lowercased brand)"""
+        return cls.new_filename("brand_monitoring", brand_name.lower(), extension)
+    
+    def save_document(self, filename: str, data: Dict) -> str:
+        """
+        Save an already-built result document under the given filename
+        
+        Args:
+            filename: Result filename (also its ID in the database backend)
+            data: JSON-serializable result dictionary
+            
+        Returns:
+            str: Filename of the saved result
+        """
+        self._write_document(filename, data)
+        self._record_rollup(filename, data)
+        return filename
+    
+    def _write_document(self, filename: str, data: Dict, modified: Optional[str] = None) -> int:
+        """Write a document to the active backend, optionally keeping an earlier ISO modification time
+        
+        Returns:
+            int: Stored size in bytes
+        """
+        if self.store is not None:
+            return self.store.put(filename, data, modified=modified)
+        filepath = os.path.join(self.results_dir, filename)
+        if self.compression:
+            target = filepath + COMPRESSION_SUFFIXES[self.compression]
+            self._write_file(target, compress(fast_json.dumps_bytes(data), self.compression))
+        else:
+            target = filepath
+            self._write_file(target, fast_json.dumps_bytes(data, indent=True))
+        if modified is not None:
+            mtime = datetime.fromisoformat(modified).timestamp()
+            os.utime(target, (mtime, mtime))
+        self._remove_other_encodings(filepath, keep=target)
+        stat = os.stat(target)
+        self.index.upsert(filename, index_entry(filename, data, stat.st_size, stat.st_mtime))
+        return stat.st_size
+    
+    def _record_rollup(self, filename: str, data: Dict):
+        """Add a saved result to the sentiment rollups (never fails the save)"""
+        if self.rollups is None or not isinstance(data, dict):
+            return
+        try:
+            self.rollups.record_document(data)
+        except Exception as e:
+            print(f"⚠️  Could not roll up {filename}: {str(e)}")
+    
+    def get_sentiment_trend(self, brand_name: str, resolution: str = "day",
+                            since: Optional[str] = None, until: Optional[str] = None) -> List[Dict]:
+        """
+        Sentiment history for a brand from the rollups, without opening any result
+        
+        Args:
+            brand_name: Brand to query
+            resolution: "minute", "hour" or "day"
+            since: ISO timestamp of the first bucket (default: a resolution-specific window)
+            until: ISO timestamp of the last bucket (default: now)
+            
+        Returns:
+            List of buckets, oldest first
+        """
+        if self.rollups is None:
+            raise ValueError("Sentiment rollups are disabled (RESULTS_ROLLUPS=0)")
+        return self.rollups.trend(
+            brand_name, resolution,
+            since=datetime.fromisoformat(since) if since else None,
+            until=datetime.fromisoformat(until) if until else None
+        )
+    
+    def rebuild_rollups(self) -> int:
+        """Roll up every stored JSON result (for results saved before rollups existed)"""
+        if self.rollups is None:
+            return 0
+        self.rollups.clear()
+        recorded = sum(1 for result in self.get_all_results() if self.rollups.record_document(result))
+        print(f"📈 Rolled up {recorded} stored results")
+        return recorded
+    
+    def _write_file(self, path: str, payload: bytes):
+        """Atomically replace a result file, with the configured fsync behaviour"""
+        if self.committer is not None:
+            self.committer.commit(write_temp(path, payload), path)
+        else:
+            write_atomic(path, payload, fsync=(self.fsync == "always"))
+    
+    def scrub(self) -> Dict[str, Any]:
+        """
+        Quarantine corrupt result files (files backend)
+        
+        Files the index already vouches for are only stat()ed; anything else is
+        parsed, and unreadable files move to <results_dir>/quarantine/ so
+        listings stop retrying them.
+        
+        Returns:
+            Dict with checked, quarantined, unreadable and temp_files_removed
+        """
+        report = scrub_results(self.results_dir, self.index.entries)
+        for filename in report["quarantined"]:
+            self.index.remove(filename)
+        if report["quarantined"] or report["temp_files_removed"]:
+            print(f"🧽 Scrubbed results: {len(report['quarantined'])} quarantined, "
+                  f"{report['temp_files_removed']} stale temp files removed")
+        return report
+    
+    def _remove_other_encodings(self, filepath: str, keep: str):
+        """Drop copies of a result saved earlier under a different compression setting"""
+        for suffix in [''] + list(COMPRESSION_SUFFIXES.values()):
+            candidate = filepath + suffix
+            if candidate != keep and os.path.exists(candidate):
+                os.remove(candidate)
+    
     def save_from_agent_output(self, agent_output: str, brand_name: str = "Unknown") -> str:
         """
         Save results from agent output string
@@ -82,16 +284,19 @@ class BrandMonitoringDataStorage:
         try:
             # Try to parse the agent output as JSON
             try:
-                parsed_output = json.loads(agent_output)
+                parsed_output = fast_json.loads(agent_output)
+                metadata = {'source': 'agent_output'}
+                if self.keep_raw_output:
+                    metadata['raw_output'] = agent_output
                 return self.save_result(
                     brand_name=brand_name,
                     search_results=parsed_output.get('search_results', []),
                     scraped_data=parsed_output.get('scraped_data', []),
                     sentiment_analysis=parsed_output.get('sentiment_analysis', {}),
                     report_data=parsed_output.get('report_data', {}),
-                    metadata={'source': 'agent_output', 'raw_output': agent_output}
+                    metadata=metadata
                 )
-            except json.JSONDecodeError:
+            except fast_json.JSONDecodeError:
                 # If not JSON, save as raw text
                 return self.save_raw_output(agent_output, brand_name)
                 
@@ -111,16 +316,20 @@ class BrandMonitoringDataStorage:
             str: Filename of the saved result
         """
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_brand_name = brand_name.replace(' ', '_').replace('/', '_').lower()
-            filename = f"brand_monitoring_{safe_brand_name}_{timestamp}.txt"
-            filepath = os.path.join(self.results_dir, filename)
+            filename = self._new_filename(brand_name, "txt")
+            text = (f"Brand Monitoring Result for: {brand_name}\n"
+                    f"Generated at: {datetime.now().isoformat()}\n"
+                    + "=" * 50 + "\n\n"
+                    + raw_output)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"Brand Monitoring Result for: {brand_name}\n")
-                f.write(f"Generated at: {datetime.now().isoformat()}\n")
-                f.write("=" * 50 + "\n\n")
-                f.write(raw_output)
+            if self.store is not None:
+                self.store.put(filename, text, brand_name=brand_name)
+            else:
+                filepath = os.path.join(self.results_dir, filename)
+                self._write_file(filepath, text.encode('utf-8'))
+                stat = os.stat(filepath)
+                self.index.upsert(filename, index_entry(filename, text, stat.st_size, stat.st_mtime,
+                                                        brand_name=brand_name))
             
             print(f"✅ Raw output saved: {filename}")
             return filename
@@ -129,36 +338,190 @@ class BrandMonitoringDataStorage:
             print(f"❌ Error saving raw output: {str(e)}")
             return None
     
-    def get_all_results(self) -> List[Dict]:
+    def get_all_results(self, brand_name: Optional[str] = None, result_type: Optional[str] = None,
+                        limit: Optional[int] = None) -> List[Dict]:
         """
         Get all saved results
         
+        Args:
+            brand_name: Only results for this brand (case-insensitive)
+            result_type: Only results of this type ("search", "full_analysis", ...)
+            limit: Maximum number of results (newest first)
+            
         Returns:
             List of result dictionaries
         """
+        if self.store is not None:
+            try:
+                results = []
+                for record in self.store.list(brand_name=brand_name, result_type=result_type,
+                                              limit=limit, include_payload=True):
+                    data = record['document']
+                    data['filename'] = record['filename']
+                    data['file_size'] = record['file_size']
+                    data['modified'] = record['modified']
+                    results.append(data)
+                return results
+            except Exception as e:
+                print(f"❌ Error getting results: {str(e)}")
+                return []
+        
         results = []
         try:
-            for filename in os.listdir(self.results_dir):
-                if filename.endswith('.json'):
-                    filepath = os.path.join(self.results_dir, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            data['filename'] = filename
-                            data['file_size'] = os.path.getsize(filepath)
-                            data['modified'] = datetime.fromtimestamp(os.path.getmtime(filepath)).isoformat()
-                            results.append(data)
-                    except Exception as e:
-                        print(f"Error reading {filename}: {e}")
-            
-            # Sort by modification time (newest first)
-            results.sort(key=lambda x: x.get('modified', ''), reverse=True)
+            matches = self._indexed_json_results(brand_name, result_type)
+            for modified, filename, entry in (matches[:limit] if limit is not None else matches):
+                try:
+                    data = self._read_result_file(filename)
+                    data['filename'] = filename
+                    data['file_size'] = entry['size']
+                    data['modified'] = modified
+                    results.append(data)
+                except Exception as e:
+                    print(f"Error reading {filename}: {e}")
+            
             return results
             
         except Exception as e:
             print(f"❌ Error getting results: {str(e)}")
             return []
     
+    def list_results(self, brand_name: Optional[str] = None, result_type: Optional[str] = None,
+                     since: Optional[str] = None, until: Optional[str] = None, limit: int = 50,
+                     cursor: Optional[str] = None, view: str = "summary") -> Dict[str, Any]:
+        """
+        List one page of results, newest first
+        
+        Args:
+            brand_name: Only results for this brand (case-insensitive)
+            result_type: Only results of this type ("search", "full_analysis", ...)
+            since: Only results saved at or after this ISO timestamp
+            until: Only results saved before this ISO timestamp
+            limit: Page size
+            cursor: The next_cursor of the previous page
+            view: "summary" for listing fields and the summary block only, "full" for whole documents
+            
+        Returns:
+            Dictionary with "results" and "next_cursor" (None on the last page)
+            
+        Raises:
+            ValueError: If the cursor or view is invalid
+        """
+        if view not in ("summary", "full"):
+            raise ValueError(f"Unknown view: {view}")
+        after = decode_cursor(cursor) if cursor else None
+        
+        if self.store is not None:
+            records = self.store.list(brand_name=brand_name, result_type=result_type, since=since, until=until,
+                                      after=after, limit=limit + 1, include_payload=(view == "full"))
+            page = []
+            for record in records[:limit]:
+                if view == "full":
+                    item = record['document']
+                    item.update(filename=record['filename'], file_size=record['file_size'],
+                                modified=record['modified'])
+                else:
+                    item = self._summary_item(record)
+                page.append(item)
+            next_cursor = encode_cursor(records[limit - 1]['modified'], records[limit - 1]['filename']) \
+                if len(records) > limit else None
+            return {"results": page, "next_cursor": next_cursor}
+        
+        # Files backend: filter and order on the sidecar index, then open files only for the full view
+        matches = self._indexed_json_results(brand_name, result_type, since, until, after)
+        page = []
+        for modified, filename, entry in matches[:limit]:
+            if view == "full":
+                try:
+                    data = self._read_result_file(filename)
+                except Exception as e:
+                    print(f"Error reading {filename}: {e}")
+                    continue
+                data.update(filename=filename, file_size=entry['size'], modified=modified)
+                page.append(data)
+            else:
+                page.append({
+                    'filename': filename,
+                    'brand_name': entry['brand_name'],
+                    'result_type': entry['result_type'],
+                    'timestamp': entry['timestamp'],
+                    'modified': modified,
+                    'file_size': entry['size'],
+                    'summary': entry['summary'],
+                })
+        
+        next_cursor = encode_cursor(*matches[limit - 1][:2]) if len(matches) > limit else None
+        return {"results": page, "next_cursor": next_cursor}
+    
+    def result_records(self) -> List[Dict]:
+        """Listing metadata for every stored result (JSON and text), newest first, without opening payloads"""
+        if self.store is not None:
+            return self.store.list(content_type=None)
+        records = [{
+            'filename': filename,
+            'brand_name': entry['brand_name'],
+            'result_type': entry['result_type'],
+            'content_type': entry['content_type'],
+            'timestamp': entry['timestamp'],
+            'modified': entry['modified'],
+            'file_size': entry['size'],
+            'summary': entry['summary'],
+        } for filename, entry in self.index.entries().items()]
+        records.sort(key=lambda record: (record['modified'], record['filename']), reverse=True)
+        return records
+    
+    def apply_retention(self, policy: RetentionPolicy = None, dry_run: bool = False,
+                        max_actions: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run one retention pass now
+        
+        Args:
+            policy: Limits to apply (default: the storage's configured policy)
+            dry_run: Only report what would be deleted or downsampled
+            max_actions: Cap on deletions + downsamples (default: the configured per-pass
+                cap, or no cap for an explicit policy without a configured engine)
+            
+        Returns:
+            Report with deleted, downsampled, reclaimed_bytes and remaining counts
+            
+        Raises:
+            ValueError: If no policy is given or configured
+        """
+        if policy is None:
+            if self.retention is None:
+                raise ValueError("No retention policy configured (set RESULTS_RETENTION_* or pass a policy)")
+            return self.retention.run(dry_run=dry_run, max_actions=max_actions)
+        if self.retention is not None:
+            # Serialize with the background passes
+            return self.retention.run(dry_run=dry_run, max_actions=max_actions, policy=policy)
+        return RetentionEngine(self, policy, max_actions=None).run(dry_run=dry_run, max_actions=max_actions)
+    
+    def _indexed_json_results(self, brand_name: Optional[str] = None, result_type: Optional[str] = None,
+                              since: Optional[str] = None, until: Optional[str] = None,
+                              after: Optional[tuple] = None) -> List[tuple]:
+        """(modified, filename, entry) for indexed JSON results matching the filters, newest first"""
+        wanted_brand = brand_key(brand_name) if brand_name else None
+        matches = []
+        for filename, entry in self.index.entries().items():
+            if entry['content_type'] != 'json':
+                continue
+            if result_type and entry['result_type'] != result_type:
+                continue
+            if wanted_brand and brand_key(entry['brand_name']) != wanted_brand:
+                continue
+            modified = entry['modified']
+            if (since and modified < since) or (until and modified >= until):
+                continue
+            if after and (modified, filename) >= after:
+                continue
+            matches.append((modified, filename, entry))
+        matches.sort(key=lambda match: (match[0], match[1]), reverse=True)
+        return matches
+    
+    @staticmethod
+    def _summary_item(record: Dict) -> Dict:
+        return {key: record[key] for key in
+                ('filename', 'brand_name', 'result_type', 'timestamp', 'modified', 'file_size', 'summary')}
+    
     def get_result_by_filename(self, filename: str) -> Dict:
         """
         Get a specific result by filename
@@ -170,17 +533,35 @@ class BrandMonitoringDataStorage:
             Result dictionary or None if not found
         """
         try:
-            filepath = os.path.join(self.results_dir, filename)
-            if not os.path.exists(filepath):
+            if self.store is not None:
+                record = self.store.get(filename)
+                if record is None or record['content_type'] != 'json':
+                    return None
+                return record['document']
+            
+            if find_result_file(os.path.join(self.results_dir, filename)) is None:
                 return None
             
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self._read_result_file(filename)
                 
         except Exception as e:
             print(f"❌ Error getting result {filename}: {str(e)}")
             return None
     
+    def _read_result_file(self, filename: str) -> Dict:
+        """Load a JSON result file, decompressing it if it was stored compressed"""
+        filepath = find_result_file(os.path.join(self.results_dir, filename))
+        if filepath is None:
+            raise FileNotFoundError(filename)
+        try:
+            return read_json(filepath)
+        except DECODE_ERRORS:
+            # Corrupt: move it aside once instead of failing on every listing
+            quarantine_file(self.results_dir, os.path.basename(filepath))
+            self.index.remove(filename)
+            print(f"🚧 Quarantined corrupt result {filename}")
+            raise
+    
     def delete_result(self, filename: str) -> bool:
         """
         Delete a result file
@@ -192,8 +573,16 @@ class BrandMonitoringDataStorage:
             bool: True if successful, False otherwise
         """
         try:
-            filepath = os.path.join(self.results_dir, filename)
-            if os.path.exists(filepath):
+            if self.store is not None:
+                if self.store.delete(filename):
+                    print(f"✅ Deleted result: {filename}")
+                    return True
+                print(f"⚠️  Result not found: {filename}")
+                return False
+            
+            filepath = find_result_file(os.path.join(self.results_dir, filename))
+            self.index.remove(filename)
+            if filepath is not None:
                 os.remove(filepath)
                 print(f"✅ Deleted result: {filename}")
                 return True
@@ -32,7 +32,7 @@ def demo_brand_monitoring():
     print("-" * 40)
     
     try:
-        search_result = search_brand_mentions.func(brand_name, 5)
+        search_result = search_brand_mentions(brand_name, 5)
         search_data = json.loads(search_result)
         
         if 'search_results' in search_data and search_data['search_results']:
@@ -72,7 +72,7 @@ def demo_brand_monitoring():
             ]
         })
         
-        sentiment_result = analyze_brand_sentiment.func(mock_content, brand_name)
+        sentiment_result = analyze_brand_sentiment(mock_content, brand_name)
         sentiment_data = json.loads(sentiment_result)
         
         if 'sentiment_analysis' in sentiment_data:
@@ -97,7 +97,7 @@ def demo_brand_monitoring():
     print("-" * 40)
     
     try:
-        report = generate_brand_report.func(brand_name, search_result, sentiment_result)
+        report = generate_brand_report(brand_name, search_result, sentiment_result)
         print("✅ Brand report generated successfully")
         print("\n" + "="*60)
         print("BRAND MONITORING REPORT")
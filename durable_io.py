@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Crash-Safe Result Writes
+Temp-file-then-rename writes, batched (group commit) fsyncs and a scrubber for corrupt result files
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from result_compression import DECODE_ERRORS, CodecUnavailable, logical_name, read_json
+
+# Durability modes for result writes
+FSYNC_MODES = ("off", "always", "group")
+
+QUARANTINE_DIRNAME = "quarantine"
+
+# Temp files older than this are leftovers of a crashed write, not one in progress
+STALE_TEMP_SECONDS = 300
+
+
+def validate_fsync_mode(mode: Optional[str]) -> str:
+    mode = (mode or "off").strip().lower()
+    if mode not in FSYNC_MODES:
+        raise ValueError(f"Unknown fsync mode: {mode} (expected one of {', '.join(FSYNC_MODES)})")
+    return mode
+
+
+def temp_path_for(path: str) -> str:
+    """Hidden temp file next to ``path`` (ignored by listings and the index)"""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def fsync_directory(directory: str):
+    """Persist renames in a directory (no-op where directories cannot be opened, e.g. Windows)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_temp(path: str, data: bytes, fsync: bool = False) -> str:
+    """Write ``data`` to a temp file beside ``path`` and return the temp path"""
+    tmp_path = temp_path_for(path)
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    return tmp_path
+
+
+def write_atomic(path: str, data: bytes, fsync: bool = False):
+    """
+    Replace ``path`` with ``data`` so readers see the old or the new file, never a partial one
+
+    Args:
+        path: Final file path
+        data: File contents
+        fsync: Also flush the file and the rename to disk before returning
+    """
+    tmp_path = write_temp(path, data, fsync=fsync)
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    if fsync:
+        fsync_directory(os.path.dirname(path) or ".")
+
+
+class GroupCommitter:
+    """
+    Batches the fsyncs of concurrent writes
+
+    Each writer hands over a written temp file and blocks. The first waiting
+    writer becomes the leader: it waits ``window`` seconds for more writers
+    to join, then fsyncs every file in the batch, renames them into place
+    and fsyncs each directory once. Every writer returns only after its file
+    is durable, so N concurrent saves cost N file fsyncs plus one directory
+    fsync in a single flush round instead of N sequential rounds.
+    """
+
+    def __init__(self, window: float = 0.002, max_batch: int = 256):
+        self.window = window
+        self.max_batch = max_batch
+        self._cond = threading.Condition()
+        self._pending: List[Dict[str, Any]] = []
+        self._leader_active = False
+        self.stats = {"commits": 0, "batches": 0, "directory_fsyncs": 0}
+
+    def commit(self, tmp_path: str, final_path: str):
+        """Durably rename ``tmp_path`` to ``final_path`` as part of the next batch"""
+        entry = {"tmp": tmp_path, "final": final_path, "done": False, "error": None}
+        with self._cond:
+            self._pending.append(entry)
+            while not entry["done"] and self._leader_active:
+                self._cond.wait()
+            if entry["done"]:
+                if entry["error"] is not None:
+                    raise entry["error"]
+                return
+            self._leader_active = True
+
+        # Leader: let concurrent writers join, then flush one batch
+        time.sleep(self.window)
+        with self._cond:
+            batch = self._pending[:self.max_batch]
+            if not any(item is entry for item in batch):
+                batch.append(entry)
+            taken = {id(item) for item in batch}
+            self._pending = [item for item in self._pending if id(item) not in taken]
+        try:
+            self._flush(batch)
+        finally:
+            with self._cond:
+                self._leader_active = False
+                self._cond.notify_all()
+        if entry["error"] is not None:
+            raise entry["error"]
+
+    def _flush(self, batch: List[Dict[str, Any]]):
+        directories = set()
+        for item in batch:
+            try:
+                fd = os.open(item["tmp"], os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                os.replace(item["tmp"], item["final"])
+                directories.add(os.path.dirname(item["final"]) or ".")
+            except Exception as e:
+                item["error"] = e
+        for directory in directories:
+            fsync_directory(directory)
+        with self._cond:
+            for item in batch:
+                item["done"] = True
+            self.stats["commits"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["directory_fsyncs"] += len(directories)
+
+
+def scrub_results(results_dir: str, index_entries: Callable[[], Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Quarantine unreadable result files and remove temp files left by crashed writes
+
+    Only files the index cannot vouch for (missing from it, or with a
+    different size) are parsed, so a clean directory costs one stat per file.
+
+    Args:
+        results_dir: Results directory
+        index_entries: Returns filename -> index entry (with "size") from the sidecar
+            index; only called when the directory holds result files
+
+    Returns:
+        Dict with checked, quarantined (filenames), unreadable (filenames left in
+        place, e.g. a missing codec) and temp_files_removed counts
+    """
+    report = {"checked": 0, "quarantined": [], "unreadable": [], "temp_files_removed": 0}
+    indexed = None
+    for entry in os.scandir(results_dir):
+        if not entry.is_file():
+            continue
+        if entry.name.startswith(".") and entry.name.endswith(".tmp"):
+            if time.time() - entry.stat().st_mtime > STALE_TEMP_SECONDS:
+                os.remove(entry.path)
+                report["temp_files_removed"] += 1
+            continue
+        name = logical_name(entry.name)
+        if name.startswith(".") or not name.endswith(".json"):
+            continue
+        if indexed is None:
+            indexed = index_entries()
+        known = indexed.get(name)
+        if known is not None and known.get("size") == entry.stat().st_size:
+            continue
+        report["checked"] += 1
+        try:
+            read_json(entry.path)
+        except CodecUnavailable as e:
+            # Readable once the codec is installed: leave it in place
+            report["unreadable"].append(name)
+            print(f"⚠️  Skipped {entry.name}: {e}")
+        except DECODE_ERRORS as e:
+            quarantine_file(results_dir, entry.name)
+            report["quarantined"].append(name)
+            print(f"🚧 Quarantined corrupt result {entry.name}: {e}")
+        except OSError as e:
+            report["unreadable"].append(name)
+            print(f"⚠️  Could not check {entry.name}: {e}")
+    return report
+
+
+def quarantine_file(results_dir: str, physical_name: str) -> str:
+    """Move a result file into <results_dir>/quarantine/ and return its new path"""
+    quarantine_dir = os.path.join(results_dir, QUARANTINE_DIRNAME)
+    os.makedirs(quarantine_dir, exist_ok=True)
+    target = os.path.join(quarantine_dir, physical_name)
+    if os.path.exists(target):
+        target = f"{target}.{int(time.time())}"
+    os.replace(os.path.join(results_dir, physical_name), target)
+    return target
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Fast JSON Serialization
+One JSON codec for tools, storage and the Flask apps, backed by the optional
+``orjson`` package when installed and the standard library otherwise
+"""
+
+import json
+import os
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Set FAST_JSON_DISABLED=1 to force the standard library codec
+if os.getenv("FAST_JSON_DISABLED", "").lower() in ("1", "true", "yes"):
+    orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def backend_name() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
+def dumps_bytes(obj: Any, indent: bool = False, sort_keys: bool = False,
+                default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes
+
+    Args:
+        obj: JSON-serializable object
+        indent: Pretty-print with two-space indentation (the stored-file layout)
+        sort_keys: Emit object keys in sorted order
+        default: Called for objects the codec cannot serialize natively
+
+    Returns:
+        bytes: UTF-8 encoded JSON (non-ASCII characters are not escaped)
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if default is not None:
+            # Let the caller's default decide, as the standard library would
+            option |= orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            # Values orjson rejects but json accepts (e.g. integers wider than 64 bits)
+            pass
+    return json.dumps(obj, indent=2 if indent else None, separators=None if indent else (",", ":"),
+                      ensure_ascii=False, sort_keys=sort_keys, default=default).encode("utf-8")
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False,
+          default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Serialize to a JSON string (see ``dumps_bytes``)"""
+    return dumps_bytes(obj, indent=indent, sort_keys=sort_keys, default=default).decode("utf-8")
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Parse JSON text or UTF-8 bytes; raises ``json.JSONDecodeError`` on bad input"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def configure_flask(app):
+    """Serve ``jsonify`` responses and parse request bodies with the fast codec"""
+    from flask.json.provider import DefaultJSONProvider
+
+    class FastJSONProvider(DefaultJSONProvider):
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            return dumps(obj, sort_keys=kwargs.get("sort_keys", self.sort_keys),
+                         default=kwargs.get("default", self.default))
+
+        def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+            return loads(s)
+
+    app.json = FastJSONProvider(app)
+    return app
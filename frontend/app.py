@@ -7,43 +7,70 @@ Displays JSON results from brand monitoring tools in a clean web interface
 from flask import Flask, render_template, jsonify, request
 import json
 import os
+import sys
 from datetime import datetime
-import glob
 
 app = Flask(__name__)
 
+# Add the parent directory to the path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_storage import BrandMonitoringDataStorage
+import fast_json
+
 # Ensure results directory exists
 RESULTS_DIR = "results"
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
+# Result storage (files by default, RESULTS_BACKEND=sqlite for the indexed store)
+storage = BrandMonitoringDataStorage(RESULTS_DIR)
+
+# jsonify responses and request bodies use the fast JSON codec (orjson when installed)
+fast_json.configure_flask(app)
+
 @app.route('/')
 def index():
     """Main dashboard page"""
     return render_template('index.html')
 
+PAGINATION_PARAMS = ('view', 'limit', 'cursor', 'brand', 'type', 'since', 'until')
+
 @app.route('/api/results')
 def get_results():
-    """API endpoint to get all brand monitoring results"""
+    """API endpoint to get brand monitoring results
+
+    Without query parameters every full result is returned. With any of
+    view (summary/full), limit, cursor, brand, type, since or until, one page
+    is returned newest first along with a next_cursor for the following page.
+    """
     try:
-        # Get all JSON result files
-        result_files = glob.glob(f"{RESULTS_DIR}/*.json")
-        results = []
+        if not any(param in request.args for param in PAGINATION_PARAMS):
+            results = storage.get_all_results()
+            return jsonify({
+                'success': True,
+                'results': results,
+                'total_files': len(results)
+            })
         
-        for file_path in sorted(result_files, key=os.path.getmtime, reverse=True):
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    data['filename'] = os.path.basename(file_path)
-                    data['file_size'] = os.path.getsize(file_path)
-                    data['modified'] = datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat()
-                    results.append(data)
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
+        try:
+            limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+            page = storage.list_results(
+                brand_name=request.args.get('brand'),
+                result_type=request.args.get('type'),
+                since=request.args.get('since'),
+                until=request.args.get('until'),
+                limit=limit,
+                cursor=request.args.get('cursor'),
+                view=request.args.get('view', 'summary')
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
         return jsonify({
             'success': True,
-            'results': results,
-            'total_files': len(results)
+            'results': page['results'],
+            'total_files': len(page['results']),
+            'next_cursor': page['next_cursor']
         })
     except Exception as e:
         return jsonify({
@@ -55,13 +82,10 @@ def get_results():
 def get_specific_result(filename):
     """API endpoint to get a specific result file"""
     try:
-        file_path = os.path.join(RESULTS_DIR, filename)
-        if not os.path.exists(file_path):
+        data = storage.get_result_by_filename(filename)
+        if data is None:
             return jsonify({'success': False, 'error': 'File not found'}), 404
         
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-        
         return jsonify({
             'success': True,
             'data': data
@@ -80,19 +104,15 @@ def save_result():
         if not data:
             return jsonify({'success': False, 'error': 'No data provided'}), 400
         
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        brand_name = data.get('brand_name', 'unknown').replace(' ', '_').lower()
-        filename = f"brand_monitoring_{brand_name}_{timestamp}.json"
-        file_path = os.path.join(RESULTS_DIR, filename)
+        # Generate a unique filename (same-second saves must not overwrite each other)
+        filename = storage.new_filename("brand_monitoring", data.get('brand_name', 'unknown').lower())
         
         # Add metadata
         data['saved_at'] = datetime.now().isoformat()
         data['filename'] = filename
         
-        # Save to file
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Save to storage
+        storage.save_document(filename, data)
         
         return jsonify({
             'success': True,
@@ -109,11 +129,9 @@ def save_result():
 def delete_result(filename):
     """API endpoint to delete a result file"""
     try:
-        file_path = os.path.join(RESULTS_DIR, filename)
-        if not os.path.exists(file_path):
+        if not storage.delete_result(filename):
             return jsonify({'success': False, 'error': 'File not found'}), 404
         
-        os.remove(file_path)
         return jsonify({
             'success': True,
             'message': 'File deleted successfully'
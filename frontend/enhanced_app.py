@@ -4,27 +4,49 @@ Enhanced Flask Frontend for Brand Monitoring System
 Includes interactive features to run brand monitoring components
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response, stream_with_context
 import json
 import os
 import sys
 import subprocess
-import threading
 import time
+import uuid
 from datetime import datetime
-import glob
 
 app = Flask(__name__)
 
 # Add the parent directory to the path for imports
 sys.path.append('/Users/anushka.mac/Desktop/aws_sns_agent')
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_storage import BrandMonitoringDataStorage
+from result_retention import RetentionPolicy
+from job_queue import JobQueue, QueueFull
+from cache import SingleFlight
+from pipeline import Stage, run_stages
+import fast_json
 
 # Ensure results directory exists
 RESULTS_DIR = "results"
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
-# Global variable to track running processes
-running_processes = {}
+# Result storage (files by default, RESULTS_BACKEND=sqlite for the indexed store)
+storage = BrandMonitoringDataStorage(RESULTS_DIR)
+
+# jsonify responses and request bodies use the fast JSON codec (orjson when installed)
+fast_json.configure_flask(app)
+
+# Background demo runs: fixed worker pool, bounded queue, statuses kept for DEMO_STATUS_TTL seconds
+demo_jobs = JobQueue(workers=int(os.getenv("DEMO_WORKERS", "2")),
+                     max_queue=int(os.getenv("DEMO_QUEUE_SIZE", "8")),
+                     status_ttl=float(os.getenv("DEMO_STATUS_TTL", "3600")),
+                     name="demo")
+
+# Identical analyses requested while one is already running share its result
+analysis_flights = SingleFlight(name="analysis")
+
+# Pause between demo steps (API rate limiting)
+DEMO_STEP_DELAY = float(os.getenv("DEMO_STEP_DELAY", "2"))
 
 @app.route('/')
 def index():
@@ -39,29 +61,30 @@ def search_brand():
         brand_name = data.get('brand_name', 'OpenAI')
         max_results = data.get('max_results', 10)
         
-        # Import and run the search function
-        from brand_monitoring_agent import search_brand_mentions
-        
-        result = search_brand_mentions.func(brand_name, max_results)
-        result_data = json.loads(result)
-        
-        # Save result
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"search_{brand_name}_{timestamp}.json"
-        file_path = os.path.join(RESULTS_DIR, filename)
-        
-        with open(file_path, 'w') as f:
-            json.dump({
+        def run_search():
+            # Import and run the search function
+            from brand_tools import search_brand_mentions_data
+            
+            result_data = search_brand_mentions_data(brand_name, max_results)
+            
+            # Save result
+            filename = storage.new_filename("search", brand_name)
+            storage.save_document(filename, {
                 'brand_name': brand_name,
                 'search_results': result_data,
                 'timestamp': datetime.now().isoformat(),
                 'filename': filename
-            }, f, indent=2)
+            })
+            return result_data, filename
+        
+        (result_data, filename), coalesced = analysis_flights.do(
+            ('search-brand', brand_name, max_results), run_search)
         
         return jsonify({
             'success': True,
             'data': result_data,
-            'filename': filename
+            'filename': filename,
+            'coalesced': coalesced
         })
         
     except Exception as e:
@@ -77,44 +100,46 @@ def analyze_sentiment():
         data = request.get_json()
         brand_name = data.get('brand_name', 'OpenAI')
         
-        # Import and run the sentiment analysis function
-        from brand_monitoring_agent import analyze_brand_sentiment
-        
-        # Create mock content for sentiment analysis
-        mock_content = json.dumps({
-            "scraped_data": [
-                {
-                    "markdown": f"Recent news about {brand_name}: The company continues to innovate in AI technology with positive reception from the community."
-                },
-                {
-                    "markdown": f"{brand_name} has been making significant progress in AI safety and development, receiving praise from industry experts."
-                }
-            ]
-        })
-        
-        result = analyze_brand_sentiment.func(mock_content, brand_name)
-        result_data = json.loads(result)
-        
-        # Save result
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"sentiment_{brand_name}_{timestamp}.json"
-        file_path = os.path.join(RESULTS_DIR, filename)
-        
-        # Ensure the data structure is correct for the frontend
-        formatted_data = {
-            'brand_name': brand_name,
-            'sentiment_analysis': result_data.get('sentiment_analysis', {}),
-            'timestamp': datetime.now().isoformat(),
-            'filename': filename
-        }
+        def run_sentiment_analysis():
+            # Import and run the sentiment analysis function
+            from brand_tools import analyze_brand_sentiment_data
+            
+            # Create mock content for sentiment analysis
+            mock_content = {
+                "scraped_data": [
+                    {
+                        "markdown": f"Recent news about {brand_name}: The company continues to innovate in AI technology with positive reception from the community."
+                    },
+                    {
+                        "markdown": f"{brand_name} has been making significant progress in AI safety and development, receiving praise from industry experts."
+                    }
+                ]
+            }
+            
+            result_data = analyze_brand_sentiment_data(mock_content, brand_name)
+            
+            # Save result
+            filename = storage.new_filename("sentiment", brand_name)
+            
+            # Ensure the data structure is correct for the frontend
+            formatted_data = {
+                'brand_name': brand_name,
+                'sentiment_analysis': result_data.get('sentiment_analysis', {}),
+                'timestamp': datetime.now().isoformat(),
+                'filename': filename
+            }
+            
+            storage.save_document(filename, formatted_data)
+            return formatted_data, filename
         
-        with open(file_path, 'w') as f:
-            json.dump(formatted_data, f, indent=2)
+        (formatted_data, filename), coalesced = analysis_flights.do(
+            ('analyze-sentiment', brand_name), run_sentiment_analysis)
         
         return jsonify({
             'success': True,
             'data': formatted_data,
-            'filename': filename
+            'filename': filename,
+            'coalesced': coalesced
         })
         
     except Exception as e:
@@ -131,52 +156,54 @@ def full_analysis():
         brand_name = data.get('brand_name', 'OpenAI')
         max_results = data.get('max_results', 10)
         
-        # Import functions
-        from brand_monitoring_agent import search_brand_mentions, analyze_brand_sentiment, generate_brand_report
-        
-        # Step 1: Search for brand mentions
-        search_result = search_brand_mentions.func(brand_name, max_results)
-        search_data = json.loads(search_result)
-        
-        # Step 2: Analyze sentiment
-        mock_content = json.dumps({
-            "scraped_data": [
-                {
-                    "markdown": f"Recent news about {brand_name}: The company continues to innovate in AI technology with positive reception from the community."
-                },
-                {
-                    "markdown": f"{brand_name} has been making significant progress in AI safety and development, receiving praise from industry experts."
-                }
-            ]
-        })
-        
-        sentiment_result = analyze_brand_sentiment.func(mock_content, brand_name)
-        sentiment_data = json.loads(sentiment_result)
-        
-        # Step 3: Generate report
-        report = generate_brand_report.func(brand_name, search_result, sentiment_result)
-        
-        # Combine all results
-        full_result = {
-            'brand_name': brand_name,
-            'search_results': search_data,
-            'sentiment_analysis': sentiment_data,
-            'report': report,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        # Save result
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"full_analysis_{brand_name}_{timestamp}.json"
-        file_path = os.path.join(RESULTS_DIR, filename)
+        def run_full_analysis():
+            # Import functions
+            from brand_tools import search_brand_mentions_data, analyze_brand_sentiment_data, brand_report_markdown
+            
+            # Sentiment analyzes fixed content, so it runs alongside the search;
+            # the report waits for both (native objects, no JSON round-trips between stages)
+            mock_content = {
+                "scraped_data": [
+                    {
+                        "markdown": f"Recent news about {brand_name}: The company continues to innovate in AI technology with positive reception from the community."
+                    },
+                    {
+                        "markdown": f"{brand_name} has been making significant progress in AI safety and development, receiving praise from industry experts."
+                    }
+                ]
+            }
+            
+            run = run_stages([
+                Stage('search', lambda: search_brand_mentions_data(brand_name, max_results)),
+                Stage('sentiment', lambda: analyze_brand_sentiment_data(mock_content, brand_name)),
+                Stage('report', lambda search, sentiment: brand_report_markdown(brand_name, search, sentiment),
+                      after=('search', 'sentiment')),
+            ])
+            
+            # Combine all results
+            full_result = {
+                'brand_name': brand_name,
+                'search_results': run['results']['search'],
+                'sentiment_analysis': run['results']['sentiment'],
+                'report': run['results']['report'],
+                'stage_latency': {'stages': run['timings'], 'elapsed': run['elapsed']},
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            # Save result
+            filename = storage.new_filename("full_analysis", brand_name)
+            storage.save_document(filename, full_result)
+            return full_result, filename
         
-        with open(file_path, 'w') as f:
-            json.dump(full_result, f, indent=2)
+        # Concurrent requests for the same brand and parameters attach to one pipeline run
+        (full_result, filename), coalesced = analysis_flights.do(
+            ('full-analysis', brand_name, max_results), run_full_analysis)
         
         return jsonify({
             'success': True,
             'data': full_result,
-            'filename': filename
+            'filename': filename,
+            'coalesced': coalesced
         })
         
     except Exception as e:
@@ -185,6 +212,55 @@ def full_analysis():
             'error': str(e)
         }), 500
 
+@app.route('/api/stream-report', methods=['GET', 'POST'])
+def stream_report():
+    """API endpoint to stream a Bedrock brand report as server-sent events
+
+    Accepts brand_name and max_results as query parameters (for EventSource)
+    or as a JSON body. Emits "search", "chunk", "done" and "error" events.
+    """
+    data = request.get_json(silent=True) or request.args
+    brand_name = data.get('brand_name', 'OpenAI')
+    max_results = int(data.get('max_results', 10))
+
+    def sse(event, payload):
+        return f"event: {event}\ndata: {fast_json.dumps(payload)}\n\n"
+
+    def generate():
+        started = time.time()
+        try:
+            from brand_tools import search_brand_mentions_data, stream_brand_report
+            
+            search_data = search_brand_mentions_data(brand_name, max_results)
+            yield sse('search', {
+                'brand_name': brand_name,
+                'total_results': search_data.get('total_results', 0)
+            })
+            
+            first_chunk_at = None
+            report_length = 0
+            for text in stream_brand_report(search_data, brand_name):
+                if first_chunk_at is None:
+                    first_chunk_at = time.time()
+                report_length += len(text)
+                yield sse('chunk', {'text': text})
+            
+            yield sse('done', {
+                'report_length': report_length,
+                'time_to_first_chunk': round(first_chunk_at - started, 3) if first_chunk_at else None,
+                'elapsed': round(time.time() - started, 3),
+                'timestamp': datetime.now().isoformat()
+            })
+            
+        except Exception as e:
+            yield sse('error', {'error': str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/test-results')
 def get_test_results():
     """API endpoint to get system test results"""
@@ -224,23 +300,18 @@ def run_search():
         total_results = data.get('total_results', 5)
         
         # Import and run the search function
-        from brand_monitoring_agent import search_brand_mentions
+        from brand_tools import search_brand_mentions_data
         
-        result = search_brand_mentions.func(brand_name, total_results)
-        result_data = json.loads(result)
+        result_data = search_brand_mentions_data(brand_name, total_results)
         
         # Save result
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"search_{brand_name}_{timestamp}.json"
-        file_path = os.path.join(RESULTS_DIR, filename)
-        
-        with open(file_path, 'w') as f:
-            json.dump({
-                'type': 'search',
-                'brand_name': brand_name,
-                'timestamp': datetime.now().isoformat(),
-                'data': result_data
-            }, f, indent=2)
+        filename = storage.new_filename("search", brand_name)
+        storage.save_document(filename, {
+            'type': 'search',
+            'brand_name': brand_name,
+            'timestamp': datetime.now().isoformat(),
+            'data': result_data
+        })
         
         return jsonify({
             'success': True,
@@ -264,32 +335,31 @@ def run_sentiment():
         
         # Create mock content if none provided
         if not content:
-            content = json.dumps({
+            content = {
                 "scraped_data": [
                     {
                         "markdown": f"Recent news about {brand_name}: The company continues to innovate and receive positive feedback from users and industry experts."
                     }
                 ]
-            })
+            }
         
         # Import and run the sentiment analysis function
-        from brand_monitoring_agent import analyze_brand_sentiment
+        from brand_tools import analyze_brand_sentiment_data, analyze_mention_sentiments_data
         
-        result = analyze_brand_sentiment.func(content, brand_name)
-        result_data = json.loads(result)
+        if data.get('per_mention'):
+            # Structured score per mention, several mentions per Bedrock request
+            result_data = analyze_mention_sentiments_data(content, brand_name)
+        else:
+            result_data = analyze_brand_sentiment_data(content, brand_name)
         
         # Save result
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"sentiment_{brand_name}_{timestamp}.json"
-        file_path = os.path.join(RESULTS_DIR, filename)
-        
-        with open(file_path, 'w') as f:
-            json.dump({
-                'type': 'sentiment',
-                'brand_name': brand_name,
-                'timestamp': datetime.now().isoformat(),
-                'data': result_data
-            }, f, indent=2)
+        filename = storage.new_filename("sentiment", brand_name)
+        storage.save_document(filename, {
+            'type': 'sentiment',
+            'brand_name': brand_name,
+            'timestamp': datetime.now().isoformat(),
+            'data': result_data
+        })
         
         return jsonify({
             'success': True,
@@ -305,83 +375,69 @@ def run_sentiment():
 
 @app.route('/api/run-demo', methods=['POST'])
 def run_demo():
-    """API endpoint to run the complete demo"""
+    """API endpoint to queue a run of the complete demo
+
+    Returns 429 with a Retry-After header when the demo queue is full.
+    """
     try:
         data = request.get_json()
         brand_name = data.get('brand_name', 'OpenAI')
         
-        # Start the demo in a separate thread
-        process_id = f"demo_{int(time.time())}"
-        running_processes[process_id] = {
-            'status': 'running',
-            'start_time': datetime.now().isoformat(),
-            'brand_name': brand_name
-        }
+        def run_demo_job(job):
+            # Import and run the demo components
+            from brand_tools import search_brand_mentions_data, analyze_brand_sentiment_data, brand_report_markdown
+            
+            # Step 1: Search
+            search_data = search_brand_mentions_data(brand_name, 5)
+            
+            job.wait(DEMO_STEP_DELAY)  # Rate limiting
+            
+            # Step 2: Sentiment Analysis
+            mock_content = {
+                "scraped_data": [
+                    {
+                        "markdown": f"Recent news about {brand_name}: The company continues to innovate in AI technology with positive reception from the community."
+                    }
+                ]
+            }
+            
+            sentiment_data = analyze_brand_sentiment_data(mock_content, brand_name)
+            
+            job.wait(DEMO_STEP_DELAY)  # Rate limiting
+            
+            # Step 3: Generate Report
+            report = brand_report_markdown(brand_name, search_data, sentiment_data)
+            job.check()
+            
+            # Save complete result
+            filename = storage.new_filename("demo", brand_name)
+            storage.save_document(filename, {
+                'type': 'demo',
+                'brand_name': brand_name,
+                'timestamp': datetime.now().isoformat(),
+                'search_data': search_data,
+                'sentiment_data': sentiment_data,
+                'report': report
+            })
+            return {'filename': filename}
         
-        def run_demo_thread():
-            try:
-                # Import and run the demo components
-                from brand_monitoring_agent import search_brand_mentions, analyze_brand_sentiment, generate_brand_report
-                
-                # Step 1: Search
-                search_result = search_brand_mentions.func(brand_name, 5)
-                search_data = json.loads(search_result)
-                
-                time.sleep(2)  # Rate limiting
-                
-                # Step 2: Sentiment Analysis
-                mock_content = json.dumps({
-                    "scraped_data": [
-                        {
-                            "markdown": f"Recent news about {brand_name}: The company continues to innovate in AI technology with positive reception from the community."
-                        }
-                    ]
-                })
-                
-                sentiment_result = analyze_brand_sentiment.func(mock_content, brand_name)
-                sentiment_data = json.loads(sentiment_result)
-                
-                time.sleep(2)  # Rate limiting
-                
-                # Step 3: Generate Report
-                report = generate_brand_report.func(brand_name, search_result, sentiment_result)
-                
-                # Save complete result
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"demo_{brand_name}_{timestamp}.json"
-                file_path = os.path.join(RESULTS_DIR, filename)
-                
-                with open(file_path, 'w') as f:
-                    json.dump({
-                        'type': 'demo',
-                        'brand_name': brand_name,
-                        'timestamp': datetime.now().isoformat(),
-                        'search_data': search_data,
-                        'sentiment_data': sentiment_data,
-                        'report': report
-                    }, f, indent=2)
-                
-                running_processes[process_id].update({
-                    'status': 'completed',
-                    'end_time': datetime.now().isoformat(),
-                    'filename': filename
-                })
-                
-            except Exception as e:
-                running_processes[process_id].update({
-                    'status': 'failed',
-                    'end_time': datetime.now().isoformat(),
-                    'error': str(e)
-                })
-        
-        # Start the thread
-        thread = threading.Thread(target=run_demo_thread)
-        thread.start()
+        try:
+            process_id = demo_jobs.submit(run_demo_job, job_id=f"demo_{uuid.uuid4().hex[:12]}",
+                                          brand_name=brand_name)
+        except QueueFull as e:
+            response = jsonify({
+                'success': False,
+                'error': str(e),
+                'queue': demo_jobs.metrics()
+            })
+            response.headers['Retry-After'] = str(max(int(DEMO_STEP_DELAY * 2), 1))
+            return response, 429
         
         return jsonify({
             'success': True,
             'process_id': process_id,
-            'message': 'Demo started successfully'
+            'status': demo_jobs.status(process_id),
+            'message': 'Demo queued successfully'
         })
         
     except Exception as e:
@@ -390,13 +446,23 @@ def run_demo():
             'error': str(e)
         }), 500
 
+@app.route('/api/process-status')
+def get_process_metrics():
+    """API endpoint for demo queue metrics (depth, workers, outcomes, wait and run latency)"""
+    return jsonify({
+        'success': True,
+        'metrics': demo_jobs.metrics()
+    })
+
 @app.route('/api/process-status/<process_id>')
 def get_process_status(process_id):
     """API endpoint to get process status"""
-    if process_id in running_processes:
+    status = demo_jobs.status(process_id)
+    if status is not None:
         return jsonify({
             'success': True,
-            'status': running_processes[process_id]
+            'status': status,
+            'metrics': demo_jobs.metrics()
         })
     else:
         return jsonify({
@@ -404,29 +470,147 @@ def get_process_status(process_id):
             'error': 'Process not found'
         }), 404
 
+@app.route('/api/process-status/<process_id>/cancel', methods=['POST'])
+def cancel_process(process_id):
+    """API endpoint to cancel a queued or running demo"""
+    status = demo_jobs.cancel(process_id)
+    if status is None:
+        return jsonify({
+            'success': False,
+            'error': 'Process not found'
+        }), 404
+    return jsonify({
+        'success': True,
+        'status': status
+    })
+
+PAGINATION_PARAMS = ('view', 'limit', 'cursor', 'brand', 'type', 'since', 'until')
+
 @app.route('/api/results')
 def get_results():
-    """API endpoint to get all brand monitoring results"""
+    """API endpoint to get brand monitoring results
+
+    Without query parameters every full result is returned. With any of
+    view (summary/full), limit, cursor, brand, type, since or until, one page
+    is returned newest first along with a next_cursor for the following page.
+    """
     try:
-        # Get all JSON result files
-        result_files = glob.glob(f"{RESULTS_DIR}/*.json")
-        results = []
-        
-        for file_path in sorted(result_files, key=os.path.getmtime, reverse=True):
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    data['filename'] = os.path.basename(file_path)
-                    data['file_size'] = os.path.getsize(file_path)
-                    data['modified'] = datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat()
-                    results.append(data)
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
+        if not any(param in request.args for param in PAGINATION_PARAMS):
+            results = storage.get_all_results()
+            return jsonify({
+                'success': True,
+                'results': results,
+                'total_files': len(results)
+            })
+        
+        try:
+            limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+            page = storage.list_results(
+                brand_name=request.args.get('brand'),
+                result_type=request.args.get('type'),
+                since=request.args.get('since'),
+                until=request.args.get('until'),
+                limit=limit,
+                cursor=request.args.get('cursor'),
+                view=request.args.get('view', 'summary')
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
         return jsonify({
             'success': True,
-            'results': results,
-            'total_files': len(results)
+            'results': page['results'],
+            'total_files': len(page['results']),
+            'next_cursor': page['next_cursor']
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/sentiment-trend')
+def get_sentiment_trend():
+    """API endpoint to chart a brand's sentiment over time from the rollups
+
+    Query parameters: brand (default OpenAI), resolution (minute/hour/day,
+    default day), and optional since/until ISO timestamps.
+    """
+    try:
+        brand_name = request.args.get('brand', 'OpenAI')
+        resolution = request.args.get('resolution', 'day')
+        try:
+            buckets = storage.get_sentiment_trend(
+                brand_name, resolution,
+                since=request.args.get('since'),
+                until=request.args.get('until')
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'brand_name': brand_name,
+            'resolution': resolution,
+            'buckets': buckets
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/retention', methods=['GET', 'POST'])
+def retention():
+    """API endpoint for the result retention engine
+
+    GET returns the configured policy, lifetime totals and the last pass.
+    POST runs a pass of the configured policy now. With dry_run set, the
+    JSON body may preview other limits (max_age_days, max_per_brand,
+    max_total_bytes, downsample_after_days); overrides never delete.
+    """
+    try:
+        if request.method == 'GET':
+            return jsonify({
+                'success': True,
+                'data': storage.retention.status() if storage.retention else None
+            })
+        
+        data = request.get_json(silent=True) or {}
+        dry_run = data.get('dry_run') is True
+        limits = ('max_age_days', 'max_per_brand', 'max_total_bytes', 'downsample_after_days')
+        try:
+            policy = None
+            if any(key in data for key in limits):
+                if not dry_run:
+                    raise ValueError("Policy overrides are only accepted with dry_run; "
+                                     "passes that delete use the configured policy")
+                policy = RetentionPolicy.from_dict(data)
+            report = storage.apply_retention(policy, dry_run=dry_run)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'data': report
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/results/<filename>')
+def get_specific_result(filename):
+    """API endpoint to get a specific result file"""
+    try:
+        data = storage.get_result_by_filename(filename)
+        if data is None:
+            return jsonify({'success': False, 'error': 'File not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'data': data
         })
     except Exception as e:
         return jsonify({
@@ -438,42 +622,57 @@ def get_results():
 def get_system_status():
     """API endpoint to get system status"""
     try:
-        # Test basic imports
+        from brand_tools import dependency_status
+        
+        # Check the heavy frameworks without importing them (CrewAI alone takes seconds)
+        dependencies = dependency_status()
         status = {
             'bedrock': False,
-            'crewai': False,
-            'search': False,
-            'sentiment': False
+            'crewai': dependencies['crewai']['available'],
+            'search': dependencies['ddgs']['available'] or bool(os.getenv("BRIGHT_DATA_USERNAME")),
+            'sentiment': dependencies['boto3']['available']
         }
         
         try:
-            import boto3
-            bedrock = boto3.client('bedrock-runtime', region_name='us-west-2')
+            from bedrock_runtime import get_bedrock_client
+            get_bedrock_client()
             status['bedrock'] = True
         except:
             pass
         
         try:
-            from crewai import Agent, Crew, Task, LLM
-            status['crewai'] = True
+            from bedrock_runtime import bedrock_client_stats
+            client_stats = bedrock_client_stats()
         except:
-            pass
+            client_stats = {}
         
-        try:
-            from brand_monitoring_agent import search_brand_mentions
-            status['search'] = True
-        except:
-            pass
+        return jsonify({
+            'success': True,
+            'status': status,
+            'dependencies': dependencies,
+            'bedrock_clients': client_stats,
+            'timestamp': datetime.now().isoformat()
+        })
         
-        try:
-            from brand_monitoring_agent import analyze_brand_sentiment
-            status['sentiment'] = True
-        except:
-            pass
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/cache-stats')
+def get_cache_stats():
+    """API endpoint to get search and Bedrock cache hit/miss metrics"""
+    try:
+        from cache import get_search_cache, get_llm_cache
         
+        search_cache = get_search_cache()
+        llm_cache = get_llm_cache()
         return jsonify({
             'success': True,
-            'status': status,
+            'search': search_cache.stats() if search_cache else {'enabled': False},
+            'bedrock': llm_cache.stats() if llm_cache else {'enabled': False},
+            'coalescing': analysis_flights.stats(),
             'timestamp': datetime.now().isoformat()
         })
         
@@ -487,10 +686,9 @@ def get_system_status():
 def test_bedrock():
     """API endpoint to test Bedrock connection"""
     try:
-        import boto3
-        import json
+        from bedrock_runtime import get_bedrock_client
         
-        bedrock = boto3.client('bedrock-runtime', region_name='us-west-2')
+        bedrock = get_bedrock_client()
         
         body = {
             "anthropic_version": "bedrock-2023-05-31",
@@ -529,4 +727,9 @@ if __name__ == '__main__':
     print("📊 Dashboard will be available at: http://localhost:5001")
     print("📁 Results will be saved to: ./results/")
     print("🔧 Interactive features enabled!")
+    if os.getenv("PREWARM_IMPORTS", "").lower() in ("1", "true", "yes"):
+        # Pay the tool import and Bedrock client cost in the background instead of on the first request
+        import threading
+        from brand_tools import prewarm
+        threading.Thread(target=prewarm, name="prewarm", daemon=True).start()
     app.run(debug=True, host='0.0.0.0', port=5001)
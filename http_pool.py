@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Connection Pool for Brand Monitoring Tools
+Keeps warm, reusable connections to the BrightData proxy and API across calls
+"""
+
+import os
+import socket
+import threading
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class _PoolStats:
+    """Thread-safe counters for requests and newly opened connections"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            reused = max(self.requests - self.new_connections, 0)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": reused,
+                "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+            }
+
+
+def _counting_pool_classes(stats: _PoolStats) -> Dict[str, type]:
+    """Build urllib3 pool classes that report every socket they open to ``stats``"""
+
+    class CountingHTTPConnection(HTTPConnection):
+        def _new_conn(self):
+            stats.record_new_connection()
+            return super()._new_conn()
+
+    class CountingHTTPSConnection(HTTPSConnection):
+        def _new_conn(self):
+            stats.record_new_connection()
+            return super()._new_conn()
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CountingHTTPConnection
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CountingHTTPSConnection
+
+    return {"http": CountingHTTPConnectionPool, "https": CountingHTTPSConnectionPool}
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pool managers (direct and proxied) track connection reuse"""
+
+    def __init__(self, stats: _PoolStats, socket_options=None, **kwargs):
+        self._stats = stats
+        self._socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self._socket_options:
+            pool_kwargs["socket_options"] = self._socket_options
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = _counting_pool_classes(self._stats)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        if self._socket_options:
+            proxy_kwargs.setdefault("socket_options", self._socket_options)
+        is_new = proxy not in self.proxy_manager
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if is_new:
+            manager.pool_classes_by_scheme = _counting_pool_classes(self._stats)
+        return manager
+
+    def send(self, request, **kwargs):
+        self._stats.record_request()
+        return super().send(request, **kwargs)
+
+
+class HTTPConnectionPoolManager:
+    """
+    Process-wide pool of keep-alive HTTP connections
+
+    A single adapter (and therefore a single set of urllib3 pools) is shared by
+    every thread, while each thread gets its own lightweight ``requests.Session``
+    so cookies and headers never leak between concurrent callers.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 20,
+                 pool_block: bool = False, keep_alive: bool = True,
+                 tcp_keepalive: bool = True, max_retries: int = 0):
+        """
+        Args:
+            pool_connections: Number of distinct hosts to keep pools for
+            pool_maxsize: Maximum open connections kept per host
+            pool_block: Block when a host's pool is exhausted instead of opening extra connections
+            keep_alive: Send ``Connection: keep-alive`` (False forces a new connection per request)
+            tcp_keepalive: Enable TCP keepalive probes on pooled sockets
+            max_retries: Connection-level retries handled by urllib3
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self._stats = _PoolStats()
+        self._local = threading.local()
+
+        socket_options = None
+        if tcp_keepalive:
+            socket_options = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+
+        self._adapter = _CountingHTTPAdapter(
+            self._stats,
+            socket_options=socket_options,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=max_retries,
+        )
+
+    def session(self) -> requests.Session:
+        """Return the calling thread's session, bound to the shared adapter"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            session.headers["Connection"] = "keep-alive" if self.keep_alive else "close"
+            self._local.session = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.session().request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection reuse counters plus the active pool configuration"""
+        stats = self._stats.snapshot()
+        stats.update({
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "pool_block": self.pool_block,
+            "keep_alive": self.keep_alive,
+        })
+        return stats
+
+    def close(self):
+        self._adapter.close()
+
+
+_default_pool: Optional[HTTPConnectionPoolManager] = None
+_default_pool_lock = threading.Lock()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_http_pool() -> HTTPConnectionPoolManager:
+    """
+    Get the shared connection pool, creating it on first use
+
+    Configured from HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_POOL_BLOCK
+    and HTTP_POOL_KEEP_ALIVE environment variables.
+    """
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = HTTPConnectionPoolManager(
+                    pool_connections=int(os.getenv("HTTP_POOL_CONNECTIONS", "10")),
+                    pool_maxsize=int(os.getenv("HTTP_POOL_MAXSIZE", "20")),
+                    pool_block=_env_bool("HTTP_POOL_BLOCK", False),
+                    keep_alive=_env_bool("HTTP_POOL_KEEP_ALIVE", True),
+                )
+    return _default_pool
+
+
+def configure_http_pool(**kwargs) -> HTTPConnectionPoolManager:
+    """Replace the shared pool with one built from explicit settings"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is not None:
+            _default_pool.close()
+        _default_pool = HTTPConnectionPoolManager(**kwargs)
+    return _default_pool
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Background Job Queue
+Fixed worker pool with a bounded queue, expiring status records, cancellation and latency metrics
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+# Status values that will not change again
+FINISHED_STATES = ("completed", "failed", "cancelled")
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit when the queue is at capacity"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been cancelled"""
+
+
+class JobContext:
+    """Handle passed to a running job so it can honour cancellation"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self):
+        """Raise JobCancelled if the job has been cancelled"""
+        if self._cancelled.is_set():
+            raise JobCancelled(self.job_id)
+
+    def wait(self, seconds: float):
+        """Sleep for ``seconds``, waking up (and raising JobCancelled) as soon as the job is cancelled"""
+        if self._cancelled.wait(seconds):
+            raise JobCancelled(self.job_id)
+
+
+class _LatencyWindow:
+    """Recent latencies, for average and p95"""
+
+    def __init__(self, size: int = 256):
+        self.samples = deque(maxlen=size)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        if not self.samples:
+            return {"avg": None, "p95": None}
+        ordered = sorted(self.samples)
+        return {"avg": round(sum(ordered) / len(ordered), 4),
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4)}
+
+
+class JobQueue:
+    """
+    Runs submitted jobs on a fixed pool of worker threads
+
+    At most ``max_queue`` jobs wait for a worker; further submissions raise
+    QueueFull so callers can push back (HTTP 429) instead of piling up
+    threads. Status records of finished jobs are dropped ``status_ttl``
+    seconds after they finish.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 8, status_ttl: float = 3600, name: str = "jobs"):
+        """
+        Args:
+            workers: Number of worker threads
+            max_queue: Maximum number of jobs waiting for a worker
+            status_ttl: Seconds to keep the status of a finished job
+            name: Prefix for worker thread names and log lines
+        """
+        if workers < 1:
+            raise ValueError("JobQueue needs at least one worker")
+        self.workers = workers
+        self.max_queue = max_queue
+        self.status_ttl = status_ttl
+        self.name = name
+        self._cond = threading.Condition()
+        self._pending = deque()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._contexts: Dict[str, JobContext] = {}
+        self._running = 0
+        self._closed = False
+        self.counters = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0, "cancelled": 0}
+        self._queue_wait = _LatencyWindow()
+        self._run_time = _LatencyWindow()
+        self._threads = [threading.Thread(target=self._worker, name=f"{name}-worker-{i}", daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, func: Callable[[JobContext], Optional[Dict[str, Any]]], job_id: Optional[str] = None,
+               **info) -> str:
+        """
+        Queue a job
+
+        Args:
+            func: Called with a JobContext on a worker thread; a returned dict is
+                merged into the job's status record
+            job_id: Identifier for the job (generated if omitted)
+            **info: Extra fields for the status record (e.g. brand_name)
+
+        Returns:
+            The job id
+
+        Raises:
+            QueueFull: If ``max_queue`` jobs are already waiting
+        """
+        job_id = job_id or uuid.uuid4().hex
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"{self.name} queue is closed")
+            self._expire()
+            if len(self._pending) >= self.max_queue:
+                self.counters["rejected"] += 1
+                raise QueueFull(f"{self.name} queue is full ({self.max_queue} jobs waiting)")
+            self._jobs[job_id] = dict(info, job_id=job_id, status="queued",
+                                      submitted_at=datetime.now().isoformat(), _queued=time.monotonic())
+            self._contexts[job_id] = JobContext(job_id)
+            self._pending.append((job_id, func))
+            self.counters["submitted"] += 1
+            self._cond.notify()
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Public status record of a job (None if unknown or expired)"""
+        with self._cond:
+            self._expire()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            record = {key: value for key, value in job.items() if not key.startswith("_")}
+            if job["status"] == "queued":
+                record["queue_position"] = next(i for i, (pending_id, _) in enumerate(self._pending)
+                                                if pending_id == job_id) + 1
+            return record
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a job
+
+        A queued job is dropped from the queue at once. A running job is asked
+        to stop; it finishes as cancelled at its next JobContext.check() or wait().
+
+        Returns:
+            The job's status record, or None if unknown
+        """
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] == "queued":
+                self._pending = deque(item for item in self._pending if item[0] != job_id)
+                self._finish(job, "cancelled")
+            elif job["status"] == "running":
+                job["cancel_requested"] = True
+                self._contexts[job_id]._cancelled.set()
+        return self.status(job_id)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, worker utilisation, outcome counters and recent latencies"""
+        with self._cond:
+            self._expire()
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queue_depth": len(self._pending),
+                "max_queue": self.max_queue,
+                "tracked_jobs": len(self._jobs),
+                **self.counters,
+                "queue_wait_seconds": self._queue_wait.summary(),
+                "run_seconds": self._run_time.summary(),
+            }
+
+    def close(self, timeout: float = 5):
+        """Stop accepting jobs, cancel queued ones and let the workers exit"""
+        with self._cond:
+            self._closed = True
+            for job_id, _ in self._pending:
+                self._finish(self._jobs[job_id], "cancelled")
+            self._pending.clear()
+            for context in self._contexts.values():
+                context._cancelled.set()
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                job_id, func = self._pending.popleft()
+                job = self._jobs[job_id]
+                context = self._contexts[job_id]
+                started = time.monotonic()
+                self._queue_wait.add(started - job["_queued"])
+                job.update(status="running", start_time=datetime.now().isoformat())
+                self._running += 1
+
+            outcome, updates = "completed", None
+            try:
+                updates = func(context)
+            except JobCancelled:
+                outcome = "cancelled"
+            except Exception as e:
+                outcome, updates = "failed", {"error": str(e)}
+                print(f"❌ {self.name} job {job_id} failed: {str(e)}")
+
+            with self._cond:
+                self._running -= 1
+                self._run_time.add(time.monotonic() - started)
+                if isinstance(updates, dict):
+                    job.update(updates)
+                self._finish(job, outcome)
+
+    def _finish(self, job: Dict[str, Any], outcome: str):
+        job.update(status=outcome, end_time=datetime.now().isoformat(), _finished=time.monotonic())
+        self.counters[outcome] += 1
+        self._contexts.pop(job["job_id"], None)
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.status_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job["status"] in FINISHED_STATES and job["_finished"] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
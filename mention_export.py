@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Mention History Export
+Streams stored results into a Parquet dataset, one row per mention, partitioned by brand and date
+"""
+
+import argparse
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import fast_json
+from result_store import brand_key
+from sentiment_rollup import find_field, source_of
+
+try:
+    import pyarrow
+    import pyarrow.dataset
+except ImportError:
+    pyarrow = None
+
+STATE_FILENAME = "_export_state.json"
+DEFAULT_BATCH_ROWS = 50000
+
+
+def mention_schema():
+    return pyarrow.schema([
+        ("brand", pyarrow.string()),            # Partition key: normalized brand
+        ("date", pyarrow.string()),             # Partition key: YYYY-MM-DD of the result timestamp
+        ("brand_name", pyarrow.string()),
+        ("timestamp", pyarrow.timestamp("us")),
+        ("result_file", pyarrow.string()),
+        ("result_type", pyarrow.string()),
+        ("kind", pyarrow.string()),             # "search" or "scraped"
+        ("title", pyarrow.string()),
+        ("link", pyarrow.string()),
+        ("domain", pyarrow.string()),
+        ("source", pyarrow.string()),
+        ("snippet", pyarrow.string()),
+        ("sentiment_score", pyarrow.float64()),
+        ("sentiment_label", pyarrow.string()),
+    ])
+
+
+def _partition_value(brand_name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", brand_key(brand_name)).strip("_") or "unknown"
+
+
+def mention_rows(document: Dict[str, Any], filename: str, result_type: str = "") -> List[Dict[str, Any]]:
+    """
+    One row per search result or scraped item in a stored result
+
+    A mention's sentiment is its per-mention score when the result was
+    scored mention by mention, otherwise the result's overall sentiment.
+    """
+    brand_name = document.get("brand_name") or find_field(document, "brand_name", str) or ""
+    try:
+        timestamp = datetime.fromisoformat(document["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        return []
+
+    overall = find_field(document, "sentiment_analysis", dict, accept=lambda s: "sentiment_score" in s) or {}
+    per_url = {}
+    for score in find_field(document, "mention_sentiments", list) or []:
+        if isinstance(score, dict) and score.get("url"):
+            per_url[score["url"]] = score
+
+    rows = []
+    for kind, key in (("search", "search_results"), ("scraped", "scraped_data")):
+        for item in find_field(document, key, list) or []:
+            if not isinstance(item, dict):
+                continue
+            link = item.get("link") or item.get("url") or ""
+            sentiment = per_url.get(link, overall)
+            score = sentiment.get("sentiment_score")
+            if isinstance(score, bool) or not isinstance(score, (int, float)):
+                score = None
+            rows.append({
+                "brand": _partition_value(brand_name),
+                "date": timestamp.strftime("%Y-%m-%d"),
+                "brand_name": brand_name,
+                "timestamp": timestamp,
+                "result_file": filename,
+                "result_type": result_type,
+                "kind": kind,
+                "title": item.get("title", ""),
+                "link": link,
+                "domain": (urlparse(link).hostname or "").lower(),
+                "source": source_of(item),
+                "snippet": item.get("snippet") or item.get("content") or item.get("markdown") or "",
+                "sentiment_score": float(score) if score is not None else None,
+                "sentiment_label": sentiment.get("sentiment_label"),
+            })
+    return rows
+
+
+class MentionExporter:
+    """
+    Incremental exporter from a BrandMonitoringDataStorage to a Parquet dataset
+
+    The dataset is hive-partitioned (brand=<brand>/date=<YYYY-MM-DD>/) so
+    scans filtered by brand or date only open the matching files. A state
+    file records the (modified, filename) position of the last exported
+    result; each run appends new part files for results saved after it.
+    A run's ID is saved in the state before its parts are written, so parts
+    left by a run that failed before moving the watermark are deleted by the
+    next run instead of being exported twice.
+    """
+
+    def __init__(self, storage, output_dir: str, batch_rows: int = DEFAULT_BATCH_ROWS):
+        if pyarrow is None:
+            raise ValueError("Parquet export requires the 'pyarrow' package (pip install pyarrow)")
+        self.storage = storage
+        self.output_dir = output_dir
+        self.batch_rows = batch_rows
+        self.state_path = os.path.join(output_dir, STATE_FILENAME)
+        os.makedirs(output_dir, exist_ok=True)
+
+    def load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path, "rb") as f:
+                return fast_json.loads(f.read())
+        except (OSError, ValueError):
+            return {"watermark": None, "exports": 0, "results": 0, "rows": 0}
+
+    def _save_state(self, state: Dict[str, Any]):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(fast_json.dumps_bytes(state, indent=True))
+        os.replace(tmp_path, self.state_path)
+
+    def _remove_parts(self, export_id: str) -> int:
+        """Delete the part files one export run wrote"""
+        prefix = f"part-{export_id}-"
+        removed = 0
+        for root, _, files in os.walk(self.output_dir):
+            for name in files:
+                if name.startswith(prefix):
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+        return removed
+
+    def _new_records(self, watermark: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """JSON results saved after the watermark, oldest first"""
+        records = [record for record in self.storage.result_records() if record["content_type"] == "json"
+                   and (watermark is None or (record["modified"], record["filename"]) > tuple(watermark))]
+        records.sort(key=lambda record: (record["modified"], record["filename"]))
+        return records
+
+    def _batches(self, records: List[Dict[str, Any]], report: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+        rows = []
+        for record in records:
+            document = self.storage.get_result_by_filename(record["filename"])
+            report["results"] += 1
+            if document is None:
+                continue
+            rows.extend(mention_rows(document, record["filename"], record.get("result_type", "")))
+            if len(rows) >= self.batch_rows:
+                yield rows
+                rows = []
+        if rows:
+            yield rows
+
+    def export(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Export results saved since the last run
+
+        Args:
+            full: Replace the dataset with a fresh export of every stored result
+
+        Returns:
+            Report with results read, rows and files written, and elapsed seconds
+        """
+        started = time.time()
+        if full:
+            for name in os.listdir(self.output_dir):
+                if name.startswith("brand="):
+                    shutil.rmtree(os.path.join(self.output_dir, name))
+            state = {"watermark": None, "exports": 0, "results": 0, "rows": 0}
+        else:
+            state = self.load_state()
+        cleaned = bool(state.get("pending_export")) and not full
+        if cleaned:
+            removed = self._remove_parts(state["pending_export"])
+            print(f"🧹 Removed {removed} Parquet files left by unfinished export {state['pending_export']}")
+        state["pending_export"] = None
+        records = self._new_records(state["watermark"])
+        report = {"results": 0, "rows": 0, "files": 0}
+        if not records:
+            if cleaned or full:
+                self._save_state(state)
+        else:
+            export_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+            self._save_state(dict(state, pending_export=export_id))
+            try:
+                self._write_parts(records, export_id, report)
+            except Exception:
+                self._remove_parts(export_id)
+                raise
+            state.update(watermark=[records[-1]["modified"], records[-1]["filename"]],
+                         exports=state["exports"] + 1, results=state["results"] + report["results"],
+                         rows=state["rows"] + report["rows"], last_export=datetime.now().isoformat())
+            self._save_state(state)
+        report["elapsed"] = round(time.time() - started, 3)
+        print(f"📦 Exported {report['rows']} mentions from {report['results']} results "
+              f"into {report['files']} Parquet files")
+        return report
+
+    def _write_parts(self, records: List[Dict[str, Any]], export_id: str, report: Dict[str, Any]):
+        schema = mention_schema()
+        for number, rows in enumerate(self._batches(records, report)):
+            written = []
+            pyarrow.dataset.write_dataset(
+                pyarrow.Table.from_pylist(rows, schema=schema),
+                self.output_dir,
+                format="parquet",
+                partitioning=["brand", "date"],
+                partitioning_flavor="hive",
+                basename_template=f"part-{export_id}-{number}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+                file_visitor=lambda written_file: written.append(written_file.path),
+            )
+            report["rows"] += len(rows)
+            report["files"] += len(written)
+
+
+def open_mentions(output_dir: str):
+    """The exported mention history as a pyarrow dataset (filter on brand/date to prune partitions)"""
+    if pyarrow is None:
+        raise ValueError("Reading the export requires the 'pyarrow' package (pip install pyarrow)")
+    return pyarrow.dataset.dataset(output_dir, format="parquet", partitioning="hive",
+                                   exclude_invalid_files=True, ignore_prefixes=[".", "_"])
+
+
+if __name__ == "__main__":
+    from data_storage import BrandMonitoringDataStorage
+
+    parser = argparse.ArgumentParser(description="Export stored results to a Parquet mention dataset")
+    parser.add_argument("--results-dir", default="results")
+    parser.add_argument("--backend", default=None, help="files, sqlite or segments (default: RESULTS_BACKEND)")
+    parser.add_argument("--output", default="exports/mentions", help="Dataset directory")
+    parser.add_argument("--full", action="store_true", help="Re-export every result, not just new ones")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS)
+    args = parser.parse_args()
+
+    storage = BrandMonitoringDataStorage(args.results_dir, backend=args.backend)
+    report = MentionExporter(storage, args.output, batch_rows=args.batch_rows).export(full=args.full)
+    print(f"✅ Export finished in {report['elapsed']}s")
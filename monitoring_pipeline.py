@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Deterministic Brand Monitoring Pipeline
+Runs the fixed search → scrape → sentiment → report workflow by calling the agent
+tools directly as a stage graph, without an LLM deciding which tool to call next
+"""
+
+import argparse
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import fast_json
+from cache import get_pipeline_cache
+from pipeline import Stage, run_stages
+
+# Per-stage limits: (timeout seconds, retries)
+STAGE_LIMITS = {
+    "search": (60, 2),
+    "scrape": (300, 1),
+    "sentiment": (120, 1),
+    "report": (180, 1),
+}
+
+
+def _tool_id(func: Callable[..., Any]) -> str:
+    """Stable name of a tool function, so cached results of different toolsets stay apart"""
+    return f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', type(func).__name__)}"
+
+
+def agent_toolset() -> Dict[str, Callable[..., Any]]:
+    """Stage functions backed by brand_tools (native *_data functions, template report; no CrewAI import)"""
+    import brand_tools
+
+    return {
+        "search": brand_tools.search_brand_mentions_data,
+        "scrape": brand_tools.scrape_mixed_platform_content_data,
+        "sentiment": brand_tools.analyze_brand_sentiment_data,
+        "report": lambda brand_name, search, scrape, sentiment: brand_tools.brand_report_markdown(
+            brand_name, search, sentiment),
+    }
+
+
+def storage_agent_toolset() -> Dict[str, Callable[..., Any]]:
+    """
+    Stage functions matching the brand_monitoring_agent_with_storage tools (Bedrock report)
+
+    Calls the brand_tools functions behind those tools directly, so neither
+    CrewAI nor the agent script is imported.
+    """
+    import brand_tools
+
+    def report(brand_name, search, scrape, sentiment):
+        analysis = {"search_results": search.get("search_results", []),
+                    "scraped_data": scrape.get("scraped_data", []),
+                    "sentiment_analysis": sentiment.get("sentiment_analysis")}
+        return brand_tools.generate_brand_report_data(analysis, brand_name)
+
+    return {
+        "search": brand_tools.search_brand_mentions_data,
+        "scrape": lambda urls: brand_tools.scrape_platform_content_data(urls, "web"),
+        "sentiment": brand_tools.analyze_brand_sentiment_data,
+        "report": report,
+    }
+
+
+def monitoring_stages(brand_name: str, tools: Dict[str, Callable[..., Any]], total_results: int = 15,
+                      max_scrape_urls: int = 5,
+                      limits: Optional[Dict[str, tuple]] = None) -> List[Stage]:
+    """
+    The monitoring workflow as a stage graph
+
+    search → scrape (top links) → sentiment (scraped pages, or the search
+    snippets when nothing was scraped) → report (search, scrape and sentiment).
+    Scrapes are cached on the scrape tool and their URL list, unless nothing
+    was scraped (usually a transient BrightData failure); Bedrock responses
+    and searches are already cached by the tools themselves.
+    """
+    limits = dict(STAGE_LIMITS, **(limits or {}))
+
+    def top_links(search):
+        return [item["link"] for item in search.get("search_results", []) if item.get("link")][:max_scrape_urls]
+
+    def scrape(search):
+        urls = top_links(search)
+        return tools["scrape"](urls) if urls else {"scraped_data": []}
+
+    def sentiment(search, scrape):
+        content = scrape if scrape.get("scraped_data") else search
+        return tools["sentiment"](content, brand_name)
+
+    return [
+        Stage("search", lambda: tools["search"](brand_name, total_results),
+              timeout=limits["search"][0], retries=limits["search"][1]),
+        Stage("scrape", scrape, after=("search",), timeout=limits["scrape"][0], retries=limits["scrape"][1],
+              cache_key=lambda search: ["scrape", _tool_id(tools["scrape"]), top_links(search)],
+              cache_if=lambda scraped: bool(scraped.get("scraped_data"))),
+        Stage("sentiment", sentiment, after=("search", "scrape"),
+              timeout=limits["sentiment"][0], retries=limits["sentiment"][1]),
+        Stage("report", lambda search, scrape, sentiment: tools["report"](brand_name, search, scrape, sentiment),
+              after=("search", "scrape", "sentiment"), timeout=limits["report"][0], retries=limits["report"][1]),
+    ]
+
+
+def run_monitoring_pipeline(brand_name: str, tools: Optional[Dict[str, Callable[..., Any]]] = None,
+                            total_results: int = 15, max_scrape_urls: int = 5, use_cache: bool = True,
+                            limits: Optional[Dict[str, tuple]] = None) -> Dict[str, Any]:
+    """
+    Monitor one brand with the deterministic pipeline
+
+    Args:
+        brand_name: Brand to monitor
+        tools: Stage functions (default: agent_toolset())
+        total_results: Search results to fetch
+        max_scrape_urls: How many of the top links to scrape
+        use_cache: Reuse cached stage results (PIPELINE_CACHE_*)
+        limits: Overrides for STAGE_LIMITS, stage name -> (timeout, retries)
+
+    Returns:
+        Result dict with search_results, scraped_data, sentiment_analysis, report and stage_latency
+
+    Raises:
+        PipelineError: If a stage fails after its retries or times out
+    """
+    run = run_stages(monitoring_stages(brand_name, tools or agent_toolset(), total_results, max_scrape_urls, limits),
+                     cache=get_pipeline_cache() if use_cache else None)
+    results = run["results"]
+    return {
+        "brand_name": brand_name,
+        "search_results": results["search"],
+        "scraped_data": results["scrape"],
+        "sentiment_analysis": results["sentiment"],
+        "report": results["report"],
+        "stage_latency": {"stages": run["timings"], "elapsed": run["elapsed"]},
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+def save_pipeline_result(storage, result: Dict[str, Any]) -> str:
+    """Store a pipeline result in the same layout as agent runs"""
+    report = result["report"]
+    sentiment = result["sentiment_analysis"].get("sentiment_analysis", {})
+    if isinstance(sentiment, str):
+        # The storage agent's sentiment tool returns the model's reply as text
+        try:
+            sentiment = fast_json.loads(sentiment)
+        except fast_json.JSONDecodeError:
+            sentiment = {"analysis": sentiment}
+    return storage.save_result(
+        brand_name=result["brand_name"],
+        search_results=result["search_results"].get("search_results", []),
+        scraped_data=result["scraped_data"].get("scraped_data", []),
+        sentiment_analysis=sentiment,
+        report_data=report if isinstance(report, dict) else {"report_content": report},
+        metadata={"source": "pipeline", "stage_latency": result["stage_latency"]},
+    )
+
+
+if __name__ == "__main__":
+    from data_storage import BrandMonitoringDataStorage
+
+    parser = argparse.ArgumentParser(description="Run the deterministic brand monitoring pipeline")
+    parser.add_argument("brands", nargs="*", default=["OpenAI"])
+    parser.add_argument("--toolset", choices=["agent", "storage"], default="storage",
+                        help="agent: template report; storage: Bedrock report (default)")
+    parser.add_argument("--total-results", type=int, default=15)
+    parser.add_argument("--max-scrape-urls", type=int, default=5)
+    parser.add_argument("--no-cache", action="store_true", help="Do not reuse cached stage results")
+    parser.add_argument("--no-save", action="store_true", help="Print results without storing them")
+    args = parser.parse_args()
+
+    tools = storage_agent_toolset() if args.toolset == "storage" else agent_toolset()
+    storage = None if args.no_save else BrandMonitoringDataStorage()
+    for brand in args.brands:
+        result = run_monitoring_pipeline(brand, tools, args.total_results, args.max_scrape_urls,
+                                         use_cache=not args.no_cache)
+        print(f"✅ {brand}: pipeline finished in {result['stage_latency']['elapsed']}s")
+        if storage is not None:
+            print(f"💾 Saved {save_pipeline_result(storage, result)}")
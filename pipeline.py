@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Stage Graph Runner
+Runs pipeline stages as a dependency graph, independent stages concurrently, with
+per-stage latency, timeouts, retries and result caching
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class PipelineError(Exception):
+    """A stage failed; carries the stage name and the timings gathered so far"""
+
+    def __init__(self, stage: str, error: BaseException, timings: Dict[str, Dict[str, float]]):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+        self.timings = timings
+
+
+class Stage:
+    """
+    One step of a pipeline
+
+    Args:
+        name: Unique stage name; its result is passed to dependants under this name
+        func: Called with the results of ``after`` as keyword arguments
+        after: Names of the stages this one depends on
+        timeout: Seconds the stage may take, retries included, before the run fails
+        retries: Extra attempts after the stage raises
+        retry_delay: Seconds before the first retry, doubled for each further one
+        cache_key: Called with the same keyword arguments as ``func``; when the run
+            has a cache, the stage's result is stored under the returned key and
+            reused by later runs instead of calling ``func``
+        cache_ttl: Seconds to keep a cached result (default: the cache's TTL)
+        cache_if: Called with the result; only results it accepts are cached
+            (default: every result except None)
+    """
+
+    def __init__(self, name: str, func: Callable[..., Any], after: Sequence[str] = (),
+                 timeout: Optional[float] = None, retries: int = 0, retry_delay: float = 1.0,
+                 cache_key: Optional[Callable[..., Any]] = None, cache_ttl: Optional[float] = None,
+                 cache_if: Optional[Callable[[Any], bool]] = None):
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.cache_key = cache_key
+        self.cache_ttl = cache_ttl
+        self.cache_if = cache_if
+
+
+def _check_graph(stages: List[Stage]):
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate stage names in {names}")
+    known = set(names)
+    for stage in stages:
+        missing = [dep for dep in stage.after if dep not in known]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages {missing}")
+    # Kahn's algorithm: every stage must become ready at some point
+    remaining = {stage.name: set(stage.after) for stage in stages}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between stages {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def _run_stage(stage: Stage, inputs: Dict[str, Any], cache: Any, timing: Dict[str, Any]) -> Any:
+    key = None
+    if cache is not None and stage.cache_key is not None:
+        key = ("pipeline-stage", stage.name, stage.cache_key(**inputs))
+        cached = cache.get(key)
+        if cached is not None:
+            timing["cached"] = True
+            return cached
+
+    for attempt in range(stage.retries + 1):
+        timing["attempts"] = attempt + 1
+        try:
+            result = stage.func(**inputs)
+            break
+        except Exception as e:
+            if attempt == stage.retries:
+                raise
+            delay = stage.retry_delay * (2 ** attempt)
+            print(f"🔁 Stage '{stage.name}' failed ({str(e)}), retrying in {delay:g}s")
+            time.sleep(delay)
+
+    if key is not None and result is not None and (stage.cache_if is None or stage.cache_if(result)):
+        cache.set(key, result, ttl_seconds=stage.cache_ttl)
+    return result
+
+
+def run_stages(stages: List[Stage], max_workers: Optional[int] = None, cache: Any = None) -> Dict[str, Any]:
+    """
+    Run stages as soon as their dependencies finish
+
+    Stages without a path between them run concurrently on a thread pool,
+    so wall-clock time follows the critical path rather than the sum of
+    stage latencies.
+
+    Args:
+        stages: Stages to run
+        max_workers: Thread pool size (default: one per stage)
+        cache: TieredCache for stages that declare a cache_key (default: no caching)
+
+    Returns:
+        Dict with "results" (stage name -> result), "timings" (stage name ->
+        start offset, end offset, seconds, attempts and cached) and total
+        "elapsed" seconds
+
+    Raises:
+        ValueError: If the graph has duplicate names, unknown dependencies or a cycle
+        PipelineError: If a stage raises after its retries or exceeds its timeout;
+            stages not yet started are skipped
+    """
+    _check_graph(stages)
+    started = time.perf_counter()
+    results: Dict[str, Any] = {}
+    timings: Dict[str, Dict[str, Any]] = {}
+    pending = {stage.name: stage for stage in stages}
+    running = {}
+    deadlines = {}
+
+    def call(stage: Stage):
+        begin = time.perf_counter()
+        timing = timings[stage.name] = {"start": round(begin - started, 4), "attempts": 0, "cached": False}
+        try:
+            return _run_stage(stage, {dep: results[dep] for dep in stage.after}, cache, timing)
+        finally:
+            end = time.perf_counter()
+            timing.update(end=round(end - started, 4), seconds=round(end - begin, 4))
+
+    # Not a with-block: a timed-out stage's thread cannot be interrupted, so
+    # a failed run returns without waiting for it
+    executor = ThreadPoolExecutor(max_workers=max_workers or max(len(stages), 1),
+                                  thread_name_prefix="pipeline-stage")
+    try:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(dep in results for dep in stage.after):
+                    future = executor.submit(call, stage)
+                    running[future] = stage
+                    if stage.timeout is not None:
+                        deadlines[future] = time.perf_counter() + stage.timeout
+                    del pending[name]
+            timeout = max(min(deadlines.values()) - time.perf_counter(), 0) if deadlines else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                deadlines.pop(future, None)
+                try:
+                    results[stage.name] = future.result()
+                except Exception as e:
+                    raise PipelineError(stage.name, e, timings) from e
+            now = time.perf_counter()
+            for future, deadline in deadlines.items():
+                if deadline <= now and not future.done():
+                    stage = running[future]
+                    timings.setdefault(stage.name, {})["timed_out"] = True
+                    raise PipelineError(stage.name, TimeoutError(f"timed out after {stage.timeout:g}s"), timings)
+    finally:
+        executor.shutdown(wait=not running, cancel_futures=True)
+
+    return {"results": results, "timings": timings, "elapsed": round(time.perf_counter() - started, 4)}
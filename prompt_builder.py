@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Token-Budgeted Prompt Builder
+Deduplicates, ranks and trims brand mention snippets to cap Bedrock input size
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Tuple
+
+# Default input token budgets for the content part of each prompt
+SENTIMENT_TOKEN_BUDGET = int(os.getenv("SENTIMENT_PROMPT_TOKEN_BUDGET", "2000"))
+REPORT_TOKEN_BUDGET = int(os.getenv("REPORT_PROMPT_TOKEN_BUDGET", "4000"))
+
+# Snippets shorter than this (in tokens) are dropped rather than truncated
+MIN_TRUNCATED_TOKENS = 25
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)"""
+    return max(1, (len(text) + 3) // 4)
+
+
+def _shingles(text: str, size: int = 3) -> frozenset:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return frozenset([" ".join(words)])
+    return frozenset(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class PromptBuilder:
+    """
+    Collects snippets for one prompt and fits them into a token budget
+
+    Near-identical snippets (word 3-gram Jaccard similarity above the
+    threshold) are kept once, the rest are ranked by how much they talk about
+    the brand, and the lowest-ranked ones are trimmed first.
+    """
+
+    def __init__(self, brand_name: str, token_budget: int = SENTIMENT_TOKEN_BUDGET,
+                 similarity_threshold: float = 0.8, max_snippet_tokens: int = 250):
+        self.brand_name = brand_name
+        self.token_budget = token_budget
+        self.similarity_threshold = similarity_threshold
+        self.max_snippet_tokens = max_snippet_tokens
+        self._brand_terms = _WORD_RE.findall(brand_name.lower())
+        self._snippets: List[Dict[str, Any]] = []
+        self._original_tokens = 0
+
+    def add(self, text: str, label: str = ""):
+        """Add one snippet; ``label`` is prefixed to its line (e.g. "Post")"""
+        if not text:
+            return
+        text = " ".join(str(text).split())
+        self._original_tokens += estimate_tokens(text)
+        max_chars = self.max_snippet_tokens * 4
+        if len(text) > max_chars:
+            text = text[:max_chars - 3] + "..."
+        self._snippets.append({"text": text, "label": label, "index": len(self._snippets)})
+
+    def relevance(self, text: str) -> float:
+        """Brand-term density, with a small bonus for substantive length"""
+        words = _WORD_RE.findall(text.lower())
+        if not words:
+            return 0.0
+        hits = sum(1 for word in words if word in self._brand_terms)
+        return hits / len(words) * 10 + min(len(words), 200) / 200
+
+    def build(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        Assemble the snippets into prompt text
+
+        Returns:
+            (text, stats) where stats reports estimated tokens before and after
+            and how many snippets were deduplicated, dropped or truncated
+        """
+        tokens_before = self._original_tokens
+
+        unique: List[Tuple[Dict[str, Any], frozenset]] = []
+        duplicates = 0
+        for snippet in self._snippets:
+            shingles = _shingles(snippet["text"])
+            if any(_jaccard(shingles, seen) >= self.similarity_threshold for _, seen in unique):
+                duplicates += 1
+                continue
+            unique.append((snippet, shingles))
+
+        ranked = sorted((s for s, _ in unique), key=lambda s: (-self.relevance(s["text"]), s["index"]))
+
+        selected = []
+        used = 0
+        dropped = 0
+        truncated = 0
+        for snippet in ranked:
+            line = self._format(snippet["label"], snippet["text"])
+            cost = estimate_tokens(line) + 1
+            if used + cost <= self.token_budget:
+                selected.append(line)
+                used += cost
+                continue
+            remaining = self.token_budget - used - 1
+            if remaining >= MIN_TRUNCATED_TOKENS:
+                line = line[:remaining * 4 - 3] + "..."
+                selected.append(line)
+                used += estimate_tokens(line) + 1
+                truncated += 1
+            else:
+                dropped += 1
+
+        text = "\n".join(selected)
+        tokens_after = sum(estimate_tokens(line) + 1 for line in selected)
+        return text, {
+            "snippets_in": len(self._snippets),
+            "snippets_used": len(selected),
+            "duplicates_removed": duplicates,
+            "snippets_dropped": dropped,
+            "snippets_truncated": truncated,
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "tokens_saved": max(tokens_before - tokens_after, 0),
+            "token_budget": self.token_budget,
+        }
+
+    @staticmethod
+    def _format(label: str, text: str) -> str:
+        return f"- {label}: {text}" if label else f"- {text}"
+
+
+def add_content_snippets(builder: PromptBuilder, content_data: Any):
+    """Feed scraped items or search results (the sentiment tool's input formats) into a builder"""
+    if isinstance(content_data, dict) and 'scraped_data' in content_data:
+        for item in content_data['scraped_data']:
+            if not isinstance(item, dict):
+                continue
+            if 'post_text' in item:
+                builder.add(item['post_text'], "Post")
+            elif 'description' in item:
+                builder.add(item['description'], "Description")
+            elif 'transcript' in item:
+                builder.add(item['transcript'], "Transcript")
+            elif 'markdown' in item:
+                builder.add(item['markdown'], "Content")
+    elif isinstance(content_data, dict) and 'search_results' in content_data:
+        for result in content_data['search_results']:
+            builder.add(f"{result.get('title', '')} {result.get('snippet', '')}".strip())
+    elif content_data:
+        builder.add(str(content_data))
+
+
+MENTION_KEYS = ("search_results", "scraped_data")
+
+# "Analysis data: " and "\n\nMentions:\n" around the two parts of a report context
+_REPORT_OVERHEAD_TOKENS = estimate_tokens("Analysis data: " + "\n\nMentions:\n")
+
+
+def split_mentions(data: Dict[str, Any], depth: int = 3) -> Tuple[Dict[str, Any], List[Tuple[str, list]]]:
+    """
+    Pull mention lists out of a (possibly nested) analysis payload
+
+    Returns:
+        (rest, mentions) where rest is a copy of ``data`` without the mention
+        lists and mentions is a list of (key, list) pairs in document order
+    """
+    rest = {}
+    mentions = []
+    for key, value in data.items():
+        if key in MENTION_KEYS and isinstance(value, list):
+            mentions.append((key, value))
+        elif isinstance(value, dict) and depth > 0:
+            rest[key], nested = split_mentions(value, depth - 1)
+            mentions.extend(nested)
+        else:
+            rest[key] = value
+    return rest, mentions
+
+
+def build_report_context(brand_name: str, data: Any,
+                         token_budget: int = REPORT_TOKEN_BUDGET) -> Tuple[str, Dict[str, Any]]:
+    """
+    Compact the report tool's analysis payload into budgeted prompt text
+
+    Mention lists (search results, scraped items, at any nesting depth) go
+    through a PromptBuilder; everything else is serialized as compact JSON
+    and cut off once it would take more than half the budget, so the whole
+    context always fits in ``token_budget``.
+    """
+    raw = json.dumps(data, indent=2, default=str)
+    if not isinstance(data, dict):
+        builder = PromptBuilder(brand_name, token_budget)
+        builder.add(raw)
+        return _with_raw_stats(builder.build(), raw)
+
+    rest, mentions = split_mentions(data)
+    rest_json = json.dumps(rest, separators=(",", ":"), ensure_ascii=False, default=str)
+
+    available = max(token_budget - _REPORT_OVERHEAD_TOKENS, 1)
+    rest_limit = max(available // 2 if mentions else available, 1)
+    rest_truncated = estimate_tokens(rest_json) > rest_limit
+    if rest_truncated:
+        rest_json = rest_json[:max(rest_limit * 4 - 3, 0)] + "..."
+
+    builder = PromptBuilder(brand_name, max(available - estimate_tokens(rest_json), 0))
+    for key, items in mentions:
+        add_content_snippets(builder, {key: items})
+    mentions_text, stats = builder.build()
+    stats["analysis_data_truncated"] = rest_truncated
+
+    parts = [f"Analysis data: {rest_json}"]
+    if mentions_text:
+        parts.append(f"Mentions:\n{mentions_text}")
+    return _with_raw_stats(("\n\n".join(parts), stats), raw)
+
+
+def _with_raw_stats(built: Tuple[str, Dict[str, Any]], raw: str) -> Tuple[str, Dict[str, Any]]:
+    """Report savings against the original indented-JSON prompt"""
+    text, stats = built
+    stats["tokens_before"] = estimate_tokens(raw)
+    stats["tokens_after"] = estimate_tokens(text)
+    stats["tokens_saved"] = max(stats["tokens_before"] - stats["tokens_after"], 0)
+    return text, stats
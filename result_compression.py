@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Compressed Result Files
+Per-file gzip (stdlib) or zstd (optional ``zstandard`` package) encoding for stored results
+"""
+
+import gzip
+import os
+import zlib
+from typing import Any, Optional
+
+import fast_json
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Compression name -> suffix appended to the result filename on disk
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+# Errors that mean a result file's bytes are damaged (bad compression stream or bad JSON)
+DECODE_ERRORS = (ValueError, EOFError, zlib.error, gzip.BadGzipFile)
+if zstandard is not None:
+    DECODE_ERRORS += (zstandard.ZstdError,)
+
+
+class CodecUnavailable(RuntimeError):
+    """A result file uses a compression whose package is not installed (the file is fine)"""
+
+
+def validate_compression(compression: Optional[str]) -> Optional[str]:
+    """Normalize a compression setting ("", "none", "gzip", "zstd")"""
+    compression = (compression or "").strip().lower()
+    if compression in ("", "none"):
+        return None
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown results compression: {compression}")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+    return compression
+
+
+def logical_name(name: str) -> str:
+    """Result filename without any compression suffix ("x.json.gz" -> "x.json")"""
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def physical_candidates(path: str):
+    """Paths a logical result path may be stored under, uncompressed first"""
+    yield path
+    for suffix in COMPRESSION_SUFFIXES.values():
+        yield path + suffix
+
+
+def find_result_file(path: str) -> Optional[str]:
+    """The existing on-disk file for a logical result path, or None"""
+    for candidate in physical_candidates(path):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def read_bytes(path: str) -> bytes:
+    """
+    Read an on-disk result file, decompressing according to its suffix
+
+    Raises:
+        CodecUnavailable: The file is zstd-compressed and ``zstandard`` is missing
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(COMPRESSION_SUFFIXES["gzip"]):
+        return gzip.decompress(data)
+    if path.endswith(COMPRESSION_SUFFIXES["zstd"]):
+        if zstandard is None:
+            raise CodecUnavailable(f"Cannot read {os.path.basename(path)}: the 'zstandard' package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def read_json(path: str) -> Any:
+    return fast_json.loads(read_bytes(path))
+
+
+def compress(data: bytes, compression: str, level: Optional[int] = None) -> bytes:
+    if compression == "gzip":
+        # mtime=0 keeps identical documents byte-identical on disk
+        return gzip.compress(data, compresslevel=level if level is not None else 6, mtime=0)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=level if level is not None else 3).compress(data)
+    raise ValueError(f"Unknown results compression: {compression}")
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Metadata Sidecar Index for File-Based Results
+One small JSON file describing every result so listings never parse payloads
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import fast_json
+from result_compression import logical_name, read_json
+from result_store import brand_from_filename, build_summary, result_type_for
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process locking is skipped
+    fcntl = None
+
+INDEX_FILENAME = ".index.json"
+INDEX_VERSION = 1
+# Upserts and removes are appended here (".index.json.journal") between snapshots
+JOURNAL_SUFFIX = ".journal"
+# The journal is folded into the snapshot once it outgrows both this and the snapshot
+COMPACT_MIN_BYTES = 1024 * 1024
+
+
+def index_entry(filename: str, document: Any, size: int, mtime: float,
+                brand_name: Optional[str] = None) -> Dict[str, Any]:
+    """Listing metadata for one result file"""
+    modified = datetime.fromtimestamp(mtime).isoformat()
+    if isinstance(document, dict):
+        return {
+            "brand_name": document.get("brand_name", brand_name or ""),
+            "result_type": result_type_for(filename),
+            "content_type": "json",
+            "timestamp": document.get("timestamp") or modified,
+            "modified": modified,
+            "size": size,
+            "summary": build_summary(document),
+        }
+    return {
+        "brand_name": brand_name or brand_from_filename(filename) or "",
+        "result_type": result_type_for(filename),
+        "content_type": "text",
+        "timestamp": modified,
+        "modified": modified,
+        "size": size,
+        "summary": None,
+    }
+
+
+class ResultIndex:
+    """
+    Incrementally maintained index of a results directory
+
+    The index is a snapshot file plus an append-only journal next to it: a
+    save or delete appends one line to the journal under a lock, and the
+    journal is folded into a new snapshot (temp file + rename) once it grows
+    past the snapshot's size, so a save costs O(1) bytes written amortized.
+    The parsed index is kept in memory; when another process appends, only
+    the new journal lines are read. A missing or unreadable snapshot is
+    rebuilt by scanning the directory once.
+    """
+
+    def __init__(self, results_dir: str, filename: str = INDEX_FILENAME,
+                 compact_bytes: int = COMPACT_MIN_BYTES):
+        """
+        Args:
+            results_dir: Results directory the index describes
+            filename: Snapshot filename inside results_dir
+            compact_bytes: Journal size that always triggers a compaction, even
+                when the snapshot is larger
+        """
+        self.results_dir = results_dir
+        self.path = os.path.join(results_dir, filename)
+        self.journal_path = self.path + JOURNAL_SUFFIX
+        self.compact_bytes = compact_bytes
+        self._lock = threading.RLock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._shared = False
+        self._loaded_stat = None
+        self._journal_stat = None
+        self._journal_offset = 0
+        self._lock_depth = 0
+        self._lock_file = None
+        self.rebuilds = 0
+        self.compactions = 0
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Current filename -> metadata mapping (do not mutate)
+
+        Writes replace the mapping instead of changing it in place once it has
+        been handed out, so the returned dict can be iterated without the lock
+        while others save.
+        """
+        with self._lock:
+            self._refresh()
+            self._shared = True
+            return self._entries
+
+    def upsert(self, filename: str, entry: Dict[str, Any]):
+        with self._locked_file():
+            self._refresh()
+            self._append({"op": "put", "filename": filename, "entry": entry})
+
+    def remove(self, filename: str):
+        with self._locked_file():
+            self._refresh()
+            if filename in self._entries:
+                self._append({"op": "del", "filename": filename})
+
+    def rebuild(self) -> Dict[str, Dict[str, Any]]:
+        """Scan the directory and rewrite the index from scratch"""
+        with self._locked_file():
+            entries = {}
+            for entry in os.scandir(self.results_dir):
+                name = logical_name(entry.name)
+                if not entry.is_file() or name.startswith(".") or not name.endswith((".json", ".txt")):
+                    continue
+                try:
+                    stat = entry.stat()
+                    document = read_json(entry.path) if name.endswith(".json") else None
+                    entries[name] = index_entry(name, document, stat.st_size, stat.st_mtime)
+                except Exception as e:
+                    print(f"⚠️  Not indexing {entry.name}: {e}")
+            self._entries = entries
+            self._shared = False
+            self._write_snapshot()
+            self.rebuilds += 1
+            print(f"🗂️  Rebuilt result index: {len(entries)} entries")
+            return entries
+
+    def compact(self):
+        """Fold the journal into a new snapshot"""
+        with self._locked_file():
+            self._refresh()
+            self._write_snapshot()
+            self.compactions += 1
+
+    def _refresh(self):
+        """Pick up writes from other processes; rebuild the index if it is missing"""
+        if self._entries is not None and self._signatures() == (self._loaded_stat, self._journal_stat):
+            return
+        with self._locked_file():
+            try:
+                snapshot = _signature(os.stat(self.path))
+            except FileNotFoundError:
+                self.rebuild()
+                return
+            try:
+                if self._entries is None or snapshot != self._loaded_stat:
+                    with open(self.path, "rb") as f:
+                        data = fast_json.loads(f.read())
+                    if data.get("version") != INDEX_VERSION:
+                        raise ValueError(f"unsupported index version {data.get('version')}")
+                    self._entries = data["entries"]
+                    self._shared = False
+                    self._loaded_stat = snapshot
+                    self._journal_stat = None
+                    self._journal_offset = 0
+                self._replay_journal()
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"⚠️  Result index unreadable ({e}), rebuilding")
+                self.rebuild()
+
+    def _signatures(self):
+        try:
+            snapshot = _signature(os.stat(self.path))
+        except FileNotFoundError:
+            snapshot = None
+        try:
+            journal = _signature(os.stat(self.journal_path))
+        except FileNotFoundError:
+            journal = None
+        return snapshot, journal
+
+    def _replay_journal(self):
+        """Apply journal lines past the last offset read (from the start if the journal was replaced)"""
+        try:
+            f = open(self.journal_path, "rb")
+        except FileNotFoundError:
+            self._journal_stat = None
+            self._journal_offset = 0
+            return
+        with f:
+            stat = os.fstat(f.fileno())
+            if self._journal_stat is None or stat.st_ino != self._journal_stat[2] or stat.st_size < self._journal_offset:
+                if self._journal_offset:
+                    # Journal replaced under us: start again from the snapshot
+                    self._loaded_stat = None
+                    self._refresh()
+                    return
+            f.seek(self._journal_offset)
+            tail = f.read()
+        complete = tail.rfind(b"\n") + 1
+        if complete < len(tail):
+            # Torn line from a writer that crashed mid-append; we hold the file lock
+            os.truncate(self.journal_path, self._journal_offset + complete)
+            print("⚠️  Dropped a torn line from the result index journal")
+        if complete:
+            self._own_entries()
+            for line in tail[:complete].splitlines():
+                self._apply(fast_json.loads(line))
+        self._journal_offset += complete
+        self._journal_stat = _signature(os.stat(self.journal_path))
+
+    def _apply(self, record: Dict[str, Any]):
+        if record["op"] == "put":
+            self._entries[record["filename"]] = record["entry"]
+        else:
+            self._entries.pop(record["filename"], None)
+
+    def _own_entries(self):
+        """Copy the mapping before changing it if entries() handed it out"""
+        if self._shared:
+            self._entries = dict(self._entries)
+            self._shared = False
+
+    def _append(self, record: Dict[str, Any]):
+        self._own_entries()
+        self._apply(record)
+        with open(self.journal_path, "ab") as f:
+            f.write(fast_json.dumps_bytes(record) + b"\n")
+        self._journal_offset = os.path.getsize(self.journal_path)
+        self._journal_stat = _signature(os.stat(self.journal_path))
+        if self._journal_offset > max(self.compact_bytes, self._loaded_stat[1]):
+            self._write_snapshot()
+            self.compactions += 1
+
+    def _write_snapshot(self):
+        """Write the in-memory index as the new snapshot and empty the journal"""
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(fast_json.dumps_bytes({"version": INDEX_VERSION, "entries": self._entries}))
+        os.replace(tmp_path, self.path)
+        # A crash between these two steps only leaves journal lines the snapshot already holds
+        open(self.journal_path, "wb").close()
+        self._loaded_stat = _signature(os.stat(self.path))
+        self._journal_stat = _signature(os.stat(self.journal_path))
+        self._journal_offset = 0
+
+    @contextmanager
+    def _locked_file(self):
+        """Thread lock plus an advisory file lock shared with other processes (reentrant)"""
+        with self._lock:
+            self._lock_depth += 1
+            try:
+                if self._lock_depth == 1 and fcntl is not None:
+                    self._lock_file = open(self.path + ".lock", "a")
+                    fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+                yield
+            finally:
+                if self._lock_depth == 1 and self._lock_file is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+                self._lock_depth -= 1
+
+
+def _signature(stat: os.stat_result):
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
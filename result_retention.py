@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Result Retention Engine
+Bounds the results store by age, per-brand count and total size, downsampling old results to summaries
+"""
+
+import argparse
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import fast_json
+from result_store import brand_key, build_summary
+
+
+class RetentionPolicy:
+    """
+    Limits applied to stored results
+
+    Args:
+        max_age_days: Delete results last modified more than this many days ago
+        max_per_brand: Keep only this many newest results per brand
+        max_total_bytes: Delete the oldest results until the store fits this size
+        downsample_after_days: Replace full results older than this with their
+            summary and headline sentiment (dropping search, scraped and report data)
+    """
+
+    def __init__(self, max_age_days: Optional[float] = None, max_per_brand: Optional[int] = None,
+                 max_total_bytes: Optional[int] = None, downsample_after_days: Optional[float] = None):
+        self.max_age_days = max_age_days
+        self.max_per_brand = max_per_brand
+        self.max_total_bytes = max_total_bytes
+        self.downsample_after_days = downsample_after_days
+
+    @classmethod
+    def from_env(cls) -> "RetentionPolicy":
+        """Policy from RESULTS_RETENTION_DAYS, RESULTS_RETENTION_PER_BRAND,
+        RESULTS_RETENTION_MAX_BYTES and RESULTS_DOWNSAMPLE_DAYS (unset = no limit)"""
+        def number(name, kind):
+            value = os.getenv(name, "").strip()
+            return kind(value) if value else None
+        return cls(max_age_days=number("RESULTS_RETENTION_DAYS", float),
+                   max_per_brand=number("RESULTS_RETENTION_PER_BRAND", int),
+                   max_total_bytes=number("RESULTS_RETENTION_MAX_BYTES", int),
+                   downsample_after_days=number("RESULTS_DOWNSAMPLE_DAYS", float))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RetentionPolicy":
+        """
+        Policy from untrusted input such as a JSON request body
+
+        Raises:
+            ValueError: If a limit is not a non-negative number (integer for
+                max_per_brand and max_total_bytes)
+        """
+        limits = {}
+        for name, kind in (("max_age_days", (int, float)), ("max_per_brand", int),
+                           ("max_total_bytes", int), ("downsample_after_days", (int, float))):
+            value = data.get(name)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, kind) or value < 0 or value != value:
+                raise ValueError(f"{name} must be a non-negative {'integer' if kind is int else 'number'}")
+            limits[name] = value
+        return cls(**limits)
+
+    @property
+    def active(self) -> bool:
+        return any(limit is not None for limit in self.to_dict().values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"max_age_days": self.max_age_days, "max_per_brand": self.max_per_brand,
+                "max_total_bytes": self.max_total_bytes, "downsample_after_days": self.downsample_after_days}
+
+
+def downsample_document(document: Dict[str, Any], original_size: int) -> Dict[str, Any]:
+    """Summary-only copy of a result: brand, timestamp, summary block and headline sentiment"""
+    sentiment = document.get("sentiment_analysis") or document.get("sentiment_data") or {}
+    if isinstance(sentiment, dict) and isinstance(sentiment.get("sentiment_analysis"), dict):
+        sentiment = sentiment["sentiment_analysis"]
+    headline = {key: sentiment[key] for key in ("sentiment_score", "sentiment_label", "confidence")
+                if isinstance(sentiment, dict) and key in sentiment}
+    summary = dict(build_summary(document), downsampled=True)
+    return {
+        "brand_name": document.get("brand_name", ""),
+        "timestamp": document.get("timestamp"),
+        "sentiment_analysis": headline,
+        "summary": summary,
+        "metadata": {"downsampled_at": datetime.now().isoformat(), "original_size": original_size},
+    }
+
+
+def plan_retention(records: List[Dict[str, Any]], policy: RetentionPolicy,
+                   now: Optional[datetime] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Decide which results to delete and which to downsample
+
+    Args:
+        records: Listing records (filename, brand_name, content_type, modified,
+            file_size, summary) for every stored result
+        policy: Limits to enforce
+        now: Reference time for age limits (default: now)
+
+    Returns:
+        Dict with "delete" and "downsample" lists of records, oldest first
+    """
+    now = now or datetime.now()
+    records = sorted(records, key=lambda record: (record["modified"], record["filename"]), reverse=True)
+    age_cutoff = (now - timedelta(days=policy.max_age_days)).isoformat() if policy.max_age_days is not None else None
+
+    delete, keep = [], []
+    per_brand: Dict[str, int] = {}
+    kept_bytes = 0
+    for record in records:
+        brand_count = per_brand.get(brand_key(record["brand_name"]), 0)
+        if age_cutoff and record["modified"] < age_cutoff:
+            delete.append(record)
+        elif policy.max_per_brand is not None and brand_count >= policy.max_per_brand:
+            delete.append(record)
+        elif policy.max_total_bytes is not None and kept_bytes + record["file_size"] > policy.max_total_bytes:
+            delete.append(record)
+        else:
+            per_brand[brand_key(record["brand_name"])] = brand_count + 1
+            kept_bytes += record["file_size"]
+            keep.append(record)
+
+    downsample = []
+    if policy.downsample_after_days is not None:
+        cutoff = (now - timedelta(days=policy.downsample_after_days)).isoformat()
+        downsample = [record for record in keep
+                      if record["content_type"] == "json" and record["modified"] < cutoff
+                      and not (record.get("summary") or {}).get("downsampled")]
+    return {"delete": delete[::-1], "downsample": downsample[::-1]}
+
+
+class RetentionEngine:
+    """
+    Applies a RetentionPolicy to a BrandMonitoringDataStorage
+
+    Planning reads only listing metadata (the sidecar index or the store's
+    index), never payloads. Each pass applies at most ``max_actions``
+    deletions/downsamples, oldest first, so a large backlog is worked off
+    over several background passes instead of one long burst of I/O.
+    """
+
+    def __init__(self, storage, policy: RetentionPolicy, interval: Optional[float] = None,
+                 max_actions: Optional[int] = 500):
+        self.storage = storage
+        self.policy = policy
+        self.interval = interval
+        self.max_actions = max_actions
+        self.last_report: Optional[Dict[str, Any]] = None
+        self.totals = {"passes": 0, "deleted": 0, "downsampled": 0, "reclaimed_bytes": 0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if interval:
+            self._thread = threading.Thread(target=self._loop, name="result-retention", daemon=True)
+            self._thread.start()
+
+    def run(self, dry_run: bool = False, max_actions: Optional[int] = None,
+            policy: Optional[RetentionPolicy] = None) -> Dict[str, Any]:
+        """
+        Run one retention pass
+
+        Args:
+            dry_run: Only report what would be deleted or downsampled
+            max_actions: Cap on deletions + downsamples this pass (default: the engine's max_actions)
+            policy: Apply these limits instead of the engine's policy (same lock as the
+                background passes, but not recorded as the engine's last report)
+
+        Returns:
+            Report with counts, reclaimed_bytes, remaining (actions left for later passes) and elapsed seconds
+        """
+        with self._lock:
+            started = time.time()
+            max_actions = max_actions if max_actions is not None else self.max_actions
+            plan = plan_retention(self.storage.result_records(), policy or self.policy)
+            actions = [("delete", record) for record in plan["delete"]] + \
+                      [("downsample", record) for record in plan["downsample"]]
+            pending = actions[:max_actions] if max_actions is not None else actions
+
+            report = {"dry_run": dry_run, "deleted": 0, "downsampled": 0, "reclaimed_bytes": 0,
+                      "remaining": len(actions) - len(pending), "errors": 0}
+            for action, record in pending:
+                try:
+                    if action == "delete":
+                        reclaimed = record["file_size"]
+                        if not dry_run and not self.storage.delete_result(record["filename"]):
+                            continue
+                        report["deleted"] += 1
+                    else:
+                        reclaimed = self._downsample(record, dry_run)
+                        report["downsampled"] += 1
+                    report["reclaimed_bytes"] += reclaimed
+                except Exception as e:
+                    report["errors"] += 1
+                    print(f"⚠️  Retention could not {action} {record['filename']}: {str(e)}")
+
+            report["elapsed"] = round(time.time() - started, 3)
+            report["timestamp"] = datetime.now().isoformat()
+            if not dry_run:
+                self.totals["passes"] += 1
+                for key in ("deleted", "downsampled", "reclaimed_bytes"):
+                    self.totals[key] += report[key]
+                compact = getattr(self.storage.store, "compact", None)
+                if report["deleted"] + report["downsampled"] and compact is not None:
+                    compact()
+            if policy is None:
+                self.last_report = report
+            if report["deleted"] or report["downsampled"]:
+                print(f"🧹 Retention: deleted {report['deleted']}, downsampled {report['downsampled']}, "
+                      f"reclaimed {report['reclaimed_bytes']:,} bytes")
+            return report
+
+    def _downsample(self, record: Dict[str, Any], dry_run: bool) -> int:
+        document = self.storage.get_result_by_filename(record["filename"])
+        if document is None:
+            raise FileNotFoundError(record["filename"])
+        summary = downsample_document(document, record["file_size"])
+        if dry_run:
+            new_size = len(fast_json.dumps_bytes(summary, indent=True))
+        else:
+            new_size = self.storage._write_document(record["filename"], summary, modified=record["modified"])
+        return max(record["file_size"] - new_size, 0)
+
+    def status(self) -> Dict[str, Any]:
+        return {"policy": self.policy.to_dict(), "interval": self.interval, "max_actions": self.max_actions,
+                "totals": dict(self.totals), "last_report": self.last_report}
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run()
+            except Exception as e:
+                print(f"⚠️  Retention pass failed: {str(e)}")
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    from data_storage import BrandMonitoringDataStorage
+
+    parser = argparse.ArgumentParser(description="Apply a retention policy to a results directory")
+    parser.add_argument("--results-dir", default="results")
+    parser.add_argument("--backend", default=None, help="files, sqlite or segments (default: RESULTS_BACKEND)")
+    parser.add_argument("--max-age-days", type=float)
+    parser.add_argument("--max-per-brand", type=int)
+    parser.add_argument("--max-total-bytes", type=int)
+    parser.add_argument("--downsample-after-days", type=float)
+    parser.add_argument("--dry-run", action="store_true", help="Report without changing anything")
+    args = parser.parse_args()
+
+    policy = RetentionPolicy(args.max_age_days, args.max_per_brand, args.max_total_bytes,
+                             args.downsample_after_days)
+    storage = BrandMonitoringDataStorage(args.results_dir, backend=args.backend)
+    report = RetentionEngine(storage, policy, max_actions=None).run(dry_run=args.dry_run)
+    verb = "Would reclaim" if args.dry_run else "Reclaimed"
+    print(f"✅ {verb} {report['reclaimed_bytes']:,} bytes "
+          f"({report['deleted']} deleted, {report['downsampled']} downsampled)")
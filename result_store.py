@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Indexed SQLite Result Store
+Keeps brand monitoring results in one embedded database with brand, type and time indexes
+"""
+
+import base64
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import fast_json
+from result_compression import logical_name, read_bytes
+
+# Filename prefixes written by the agents and the dashboards, longest first
+RESULT_TYPES = ("brand_monitoring", "full_analysis", "sentiment", "search", "demo")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    filename TEXT PRIMARY KEY,
+    brand_name TEXT NOT NULL,
+    brand_key TEXT NOT NULL,
+    result_type TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    modified TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    summary TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_modified ON results (modified DESC, filename DESC);
+CREATE INDEX IF NOT EXISTS idx_results_brand ON results (brand_key, modified DESC);
+CREATE INDEX IF NOT EXISTS idx_results_type ON results (result_type, modified DESC);
+"""
+
+_LISTING_COLUMNS = "filename, brand_name, result_type, content_type, timestamp, modified, size, summary"
+
+_FILENAME_RE = re.compile(r"^(?:%s)_(?P<brand>.+)_\d{8}_\d{6}(?:_[0-9a-z]+)?\.(?:json|txt)$" % "|".join(RESULT_TYPES))
+
+
+def result_type_for(filename: str) -> str:
+    """Result type encoded in a result filename prefix (e.g. "search_OpenAI_..." -> "search")"""
+    for result_type in RESULT_TYPES:
+        if filename.startswith(result_type + "_"):
+            return result_type
+    return "other"
+
+
+def brand_key(brand_name: str) -> str:
+    """Brand lookup key, insensitive to case, whitespace and the underscores used in filenames"""
+    return " ".join((brand_name or "").lower().replace("_", " ").split())
+
+
+def brand_from_filename(filename: str) -> Optional[str]:
+    """Brand part of a result filename (as written, e.g. "product_hunt"), or None"""
+    match = _FILENAME_RE.match(filename)
+    return match.group("brand") if match else None
+
+
+def build_summary(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Small listing summary for a result document
+
+    Uses the summary block save_result writes; other documents (dashboard
+    search, sentiment and full analysis results) get the same fields derived
+    from their own layout.
+    """
+    if isinstance(document.get("summary"), dict):
+        return document["summary"]
+
+    search = document.get("search_results", document.get("search_data", document.get("data")))
+    if isinstance(search, dict):
+        search = search.get("search_results", [])
+    sentiment = document.get("sentiment_analysis") or document.get("sentiment_data") or {}
+    if isinstance(sentiment, dict) and isinstance(sentiment.get("sentiment_analysis"), dict):
+        sentiment = sentiment["sentiment_analysis"]
+    return {
+        "total_search_results": len(search) if isinstance(search, list) else 0,
+        "total_scraped_items": len(document.get("scraped_data") or []),
+        "has_sentiment_analysis": bool(sentiment),
+        "has_report": bool(document.get("report_data") or document.get("report")),
+    }
+
+
+def encode_cursor(modified: str, filename: str) -> str:
+    """Opaque pagination cursor pointing just after the given listing position"""
+    raw = json.dumps([modified, filename], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of encode_cursor(); raises ValueError for malformed cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        modified, filename = json.loads(raw)
+        return str(modified), str(filename)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+class SQLiteResultStore:
+    """
+    Result documents in a single SQLite database
+
+    Listing columns (brand, type, timestamps, size, summary) are stored next to
+    the payload and indexed, so listings read only the rows of the requested
+    page and never parse payloads. Each thread gets its own connection; WAL
+    mode lets the dashboards read while an agent is writing.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def put(self, filename: str, document: Any, modified: Optional[str] = None,
+            brand_name: Optional[str] = None):
+        """
+        Insert or replace one result
+
+        Args:
+            filename: Result ID (kept as a filename so existing links keep working)
+            document: A JSON-serializable dictionary, or raw text
+            modified: ISO timestamp used for ordering (default: now)
+            brand_name: Brand for text results, which carry no brand_name field
+
+        Returns:
+            int: Stored payload size in bytes (the listing's file_size)
+        """
+        if isinstance(document, str):
+            content_type, payload, summary = "text", document, None
+            timestamp = modified or datetime.now().isoformat()
+        else:
+            content_type = "json"
+            payload = fast_json.dumps(document)
+            summary = fast_json.dumps(build_summary(document))
+            brand_name = document.get("brand_name", brand_name)
+            timestamp = document.get("timestamp") or modified or datetime.now().isoformat()
+
+        brand_name = brand_name or ""
+        modified = modified or datetime.now().isoformat()
+        size = len(payload.encode("utf-8"))
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results "
+                "(filename, brand_name, brand_key, result_type, content_type, timestamp, modified, size, summary, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (filename, brand_name, brand_key(brand_name), result_type_for(filename), content_type,
+                 timestamp, modified, size, summary, payload)
+            )
+        return size
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Return the listing fields plus the decoded "document", or None if missing"""
+        row = self._connection().execute(
+            f"SELECT {_LISTING_COLUMNS}, payload FROM results WHERE filename = ?", (filename,)
+        ).fetchone()
+        if row is None:
+            return None
+        record = self._listing_record(row)
+        record["document"] = fast_json.loads(row["payload"]) if row["content_type"] == "json" else row["payload"]
+        return record
+
+    def delete(self, filename: str) -> bool:
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute("DELETE FROM results WHERE filename = ?", (filename,))
+        return cursor.rowcount > 0
+
+    def list(self, brand_name: Optional[str] = None, result_type: Optional[str] = None,
+             content_type: Optional[str] = "json", limit: Optional[int] = None, offset: int = 0,
+             include_payload: bool = False, since: Optional[str] = None, until: Optional[str] = None,
+             after: Optional[Tuple[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        List results newest first using the indexes
+
+        Args:
+            brand_name: Only results for this brand (case-insensitive)
+            result_type: Only results of this type (see RESULT_TYPES)
+            content_type: "json", "text" or None for both
+            limit: Maximum rows to return (None for all)
+            offset: Rows to skip
+            include_payload: Also decode each row's document
+            since: Only results saved at or after this ISO timestamp
+            until: Only results saved before this ISO timestamp
+            after: (modified, filename) position to continue after (keyset pagination)
+
+        Returns:
+            List of listing records (with "document" when include_payload is set)
+        """
+        clauses, params = [], []
+        if brand_name:
+            clauses.append("brand_key = ?")
+            params.append(brand_key(brand_name))
+        if result_type:
+            clauses.append("result_type = ?")
+            params.append(result_type)
+        if content_type:
+            clauses.append("content_type = ?")
+            params.append(content_type)
+        if since:
+            clauses.append("modified >= ?")
+            params.append(since)
+        if until:
+            clauses.append("modified < ?")
+            params.append(until)
+        if after:
+            clauses.append("(modified, filename) < (?, ?)")
+            params.extend(after)
+
+        columns = _LISTING_COLUMNS + (", payload" if include_payload else "")
+        query = f"SELECT {columns} FROM results"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY modified DESC, filename DESC"
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([int(limit), int(offset)])
+
+        records = []
+        for row in self._connection().execute(query, params):
+            record = self._listing_record(row)
+            if include_payload:
+                record["document"] = fast_json.loads(row["payload"]) if row["content_type"] == "json" else row["payload"]
+            records.append(record)
+        return records
+
+    def count(self, brand_name: Optional[str] = None, result_type: Optional[str] = None) -> int:
+        clauses, params = [], []
+        if brand_name:
+            clauses.append("brand_key = ?")
+            params.append(brand_key(brand_name))
+        if result_type:
+            clauses.append("result_type = ?")
+            params.append(result_type)
+        query = "SELECT COUNT(*) FROM results"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        return self._connection().execute(query, params).fetchone()[0]
+
+    def import_directory(self, results_dir: str, overwrite: bool = False) -> Dict[str, int]:
+        """
+        Migrate an existing results directory of .json/.txt files (optionally compressed) into the store
+
+        Files already in the store are skipped unless ``overwrite`` is set, so
+        the import can be re-run safely.
+
+        Returns:
+            Counts of imported, skipped and failed files
+        """
+        counts = {"imported": 0, "skipped": 0, "failed": 0}
+        existing = set() if overwrite else {
+            row[0] for row in self._connection().execute("SELECT filename FROM results")
+        }
+
+        for entry in sorted(os.scandir(results_dir), key=lambda e: e.name):
+            name = logical_name(entry.name)
+            if not entry.is_file() or name.startswith(".") or not name.endswith((".json", ".txt")):
+                continue
+            if name in existing:
+                counts["skipped"] += 1
+                continue
+            try:
+                modified = datetime.fromtimestamp(entry.stat().st_mtime).isoformat()
+                raw = read_bytes(entry.path)
+                if name.endswith(".json"):
+                    document = fast_json.loads(raw)
+                    if not isinstance(document, dict):
+                        document = {"data": document}
+                else:
+                    document = raw.decode("utf-8")
+                self.put(name, document, modified=modified, brand_name=_brand_from_text(document))
+                existing.add(name)
+                counts["imported"] += 1
+            except Exception as e:
+                print(f"⚠️  Could not import {entry.name}: {e}")
+                counts["failed"] += 1
+
+        return counts
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _listing_record(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "filename": row["filename"],
+            "brand_name": row["brand_name"],
+            "result_type": row["result_type"],
+            "content_type": row["content_type"],
+            "timestamp": row["timestamp"],
+            "modified": row["modified"],
+            "file_size": row["size"],
+            "summary": fast_json.loads(row["summary"]) if row["summary"] else None,
+        }
+
+
+def _brand_from_text(document: Any) -> Optional[str]:
+    """Brand name from the header line save_raw_output writes"""
+    if isinstance(document, str) and document.startswith("Brand Monitoring Result for: "):
+        return document.split("\n", 1)[0][len("Brand Monitoring Result for: "):].strip()
+    return None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import a results directory into a SQLite result store")
+    parser.add_argument("results_dir", nargs="?", default="results")
+    parser.add_argument("--db", help="Database path (default: <results_dir>/results.db)")
+    parser.add_argument("--overwrite", action="store_true", help="Re-import files already in the store")
+    args = parser.parse_args()
+
+    store = SQLiteResultStore(args.db or os.path.join(args.results_dir, "results.db"))
+    counts = store.import_directory(args.results_dir, overwrite=args.overwrite)
+    print(f"✅ Imported {counts['imported']} results "
+          f"({counts['skipped']} already present, {counts['failed']} failed) into {store.db_path}")
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Append-Only Segment Log for Brand Monitoring Results
+JSONL segments with size-based rollover, an offset index and background compaction
+"""
+
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import fast_json
+from result_store import build_summary, brand_key, result_type_for
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process locking is skipped
+    fcntl = None
+
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+
+_SEGMENT_RE = re.compile(r"^segment_(\d{6})\.jsonl$")
+
+LOCK_FILENAME = ".lock"
+
+
+def _segment_name(number: int) -> str:
+    return f"segment_{number:06d}.jsonl"
+
+
+class SegmentLogStore:
+    """
+    Results stored as records appended to JSONL segment files
+
+    Each save is one buffered append of a single line; deletes append a
+    tombstone. An in-memory offset index maps every live result ID to its
+    segment, offset and listing metadata, so reads are one seek and listings
+    touch no files. Full segments are sealed with an ``.idx`` sidecar so
+    reopening the store only rescans the active segment. Compaction rewrites
+    sealed segments without overwritten or deleted records.
+
+    Several processes may share a directory: every operation holds an
+    advisory file lock and first catches up with what other processes
+    appended (tail scan of the active segment) or rolled over and compacted
+    (full reload), so offsets never go stale.
+
+    Exposes the same put/get/delete/list/count interface as SQLiteResultStore.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+                 compact_interval: Optional[float] = None, garbage_ratio: float = 0.5):
+        """
+        Args:
+            directory: Directory holding the segment files
+            max_segment_bytes: Roll over to a new segment once the active one reaches this size
+            compact_interval: Seconds between background compaction checks (None to disable)
+            garbage_ratio: Compact when at least this share of sealed bytes is dead
+        """
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.garbage_ratio = garbage_ratio
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_file = None
+        # id -> (segment number, offset, length, metadata)
+        self._index: Dict[str, Tuple[int, int, int, Dict[str, Any]]] = {}
+        self._segment_bytes: Dict[int, int] = {}
+        self._active_number = 0
+        self._active_file = None
+        self._active_ops: List[list] = []
+        self.compactions = 0
+        self.reclaimed_bytes = 0
+
+        with self._locked():
+            self._load()
+
+        self._stop_event = threading.Event()
+        self._compactor = None
+        if compact_interval:
+            self._compactor = threading.Thread(target=self._compact_loop, args=(compact_interval,),
+                                               name="segment-compactor", daemon=True)
+            self._compactor.start()
+
+    # ------------------------------------------------------------------ writes
+
+    def put(self, filename: str, document: Any, modified: Optional[str] = None,
+            brand_name: Optional[str] = None):
+        """Append a result (a later put for the same ID replaces it) and return its stored size in bytes"""
+        modified = modified or datetime.now().isoformat()
+        if isinstance(document, str):
+            meta = {"brand_name": brand_name or "", "content_type": "text", "timestamp": modified,
+                    "summary": None}
+        else:
+            meta = {"brand_name": document.get("brand_name", brand_name) or "", "content_type": "json",
+                    "timestamp": document.get("timestamp") or modified, "summary": build_summary(document)}
+        meta.update(result_type=result_type_for(filename), modified=modified)
+        line = fast_json.dumps_bytes({"op": "put", "id": filename, "meta": meta, "document": document}) + b"\n"
+        meta["size"] = len(line)
+
+        with self._locked():
+            self._refresh()
+            offset = self._append(line)
+            self._index[filename] = (self._active_number, offset, len(line), meta)
+            self._active_ops.append(["put", filename, offset, len(line), meta])
+            self._maybe_roll()
+        return meta["size"]
+
+    def delete(self, filename: str) -> bool:
+        with self._locked():
+            self._refresh()
+            if filename not in self._index:
+                return False
+            line = fast_json.dumps_bytes({"op": "delete", "id": filename}) + b"\n"
+            self._append(line)
+            del self._index[filename]
+            self._active_ops.append(["delete", filename])
+            self._maybe_roll()
+            return True
+
+    def _append(self, line: bytes) -> int:
+        # O_APPEND write under the file lock: the record ends where the file now ends
+        self._active_file.write(line)
+        self._active_file.flush()
+        end = self._active_file.tell()
+        self._segment_bytes[self._active_number] = end
+        return end - len(line)
+
+    def _maybe_roll(self):
+        if self._segment_bytes[self._active_number] >= self.max_segment_bytes:
+            self._seal_active()
+            self._open_segment(self._active_number + 1)
+
+    # ------------------------------------------------------------------- reads
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Return the listing fields plus the decoded "document", or None if missing"""
+        with self._locked():
+            self._refresh()
+            location = self._index.get(filename)
+            if location is None:
+                return None
+            record = self._listing_record(filename, location[3])
+            record["document"] = self._read(location)["document"]
+            return record
+
+    def list(self, brand_name: Optional[str] = None, result_type: Optional[str] = None,
+             content_type: Optional[str] = "json", limit: Optional[int] = None, offset: int = 0,
+             include_payload: bool = False, since: Optional[str] = None, until: Optional[str] = None,
+             after: Optional[Tuple[str, str]] = None) -> List[Dict[str, Any]]:
+        """List results newest first from the in-memory index (see SQLiteResultStore.list)"""
+        wanted_brand = brand_key(brand_name) if brand_name else None
+        with self._locked():
+            self._refresh()
+            matches = []
+            for filename, location in self._index.items():
+                meta = location[3]
+                if wanted_brand and brand_key(meta["brand_name"]) != wanted_brand:
+                    continue
+                if result_type and meta["result_type"] != result_type:
+                    continue
+                if content_type and meta["content_type"] != content_type:
+                    continue
+                if (since and meta["modified"] < since) or (until and meta["modified"] >= until):
+                    continue
+                if after and (meta["modified"], filename) >= tuple(after):
+                    continue
+                matches.append((meta["modified"], filename, location))
+            matches.sort(key=lambda match: (match[0], match[1]), reverse=True)
+            matches = matches[offset:offset + limit] if limit is not None else matches[offset:]
+
+            records = []
+            for _, filename, location in matches:
+                record = self._listing_record(filename, location[3])
+                if include_payload:
+                    record["document"] = self._read(location)["document"]
+                records.append(record)
+            return records
+
+    def count(self, brand_name: Optional[str] = None, result_type: Optional[str] = None) -> int:
+        return len(self.list(brand_name=brand_name, result_type=result_type, content_type=None))
+
+    def _read(self, location: Tuple[int, int, int, Dict[str, Any]]) -> Dict[str, Any]:
+        number, offset, length, _ = location
+        with open(os.path.join(self.directory, _segment_name(number)), "rb") as f:
+            f.seek(offset)
+            return fast_json.loads(f.read(length))
+
+    @staticmethod
+    def _listing_record(filename: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "filename": filename,
+            "brand_name": meta["brand_name"],
+            "result_type": meta["result_type"],
+            "content_type": meta["content_type"],
+            "timestamp": meta["timestamp"],
+            "modified": meta["modified"],
+            "file_size": meta["size"],
+            "summary": meta["summary"],
+        }
+
+    # --------------------------------------------------------------- segments
+
+    def _load(self):
+        numbers = sorted(int(match.group(1)) for match in map(_SEGMENT_RE.match, os.listdir(self.directory))
+                         if match)
+        for position, number in enumerate(numbers):
+            if position == len(numbers) - 1:
+                # The active segment has no sidecar yet and may end in a torn write
+                ops = self._scan(number, repair=True)
+                self._replay(number, ops)
+                self._open_segment(number)
+                self._active_ops = ops
+                return
+            ops = self._load_sidecar(number)
+            if ops is None:
+                ops = self._scan(number, repair=False)
+                self._write_sidecar(number, ops)
+            self._replay(number, ops)
+
+        self._open_segment(1)
+
+    def _refresh(self):
+        """Catch up with appends, rollovers and compactions made by other processes"""
+        sizes = {}
+        for name in os.listdir(self.directory):
+            match = _SEGMENT_RE.match(name)
+            if match:
+                sizes[int(match.group(1))] = os.path.getsize(os.path.join(self.directory, name))
+        if sizes == self._segment_bytes:
+            return
+        active = self._active_number
+        known = self._segment_bytes
+        if (sizes.keys() == known.keys() and sizes[active] > known[active]
+                and all(sizes[number] == size for number, size in known.items() if number != active)):
+            # Only the active segment grew: index the records appended since
+            ops = self._scan(active, repair=True, start=known[active])
+            self._replay(active, ops)
+            self._active_ops.extend(ops)
+            return
+        # Another process rolled over or compacted: offsets may have moved
+        self._active_file.close()
+        self._index = {}
+        self._segment_bytes = {}
+        self._active_ops = []
+        self._load()
+
+    @contextmanager
+    def _locked(self):
+        """Thread lock plus an advisory file lock shared with other processes (reentrant)"""
+        with self._lock:
+            self._lock_depth += 1
+            try:
+                if self._lock_depth == 1 and fcntl is not None:
+                    self._lock_file = open(os.path.join(self.directory, LOCK_FILENAME), "a")
+                    fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+                yield
+            finally:
+                if self._lock_depth == 1 and self._lock_file is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+                self._lock_depth -= 1
+
+    def _replay(self, number: int, ops: List[list]):
+        for op in ops:
+            if op[0] == "put":
+                _, filename, offset, length, meta = op
+                self._index[filename] = (number, offset, length, meta)
+            else:
+                self._index.pop(op[1], None)
+
+    def _scan(self, number: int, repair: bool, start: int = 0) -> List[list]:
+        """Read a segment's records from ``start``; a torn final line (crash mid-append) is cut off when repairing"""
+        path = os.path.join(self.directory, _segment_name(number))
+        ops = []
+        offset = start
+        with open(path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    record = fast_json.loads(line)
+                except ValueError:
+                    if repair:
+                        print(f"⚠️  Truncating torn record at {_segment_name(number)}:{offset}")
+                        with open(path, "r+b") as tail:
+                            tail.truncate(offset)
+                    break
+                if record.get("op") == "put":
+                    meta = record["meta"]
+                    meta["size"] = len(line)
+                    ops.append(["put", record["id"], offset, len(line), meta])
+                elif record.get("op") == "delete":
+                    ops.append(["delete", record["id"]])
+                offset += len(line)
+        self._segment_bytes[number] = offset
+        return ops
+
+    def _sidecar_path(self, number: int) -> str:
+        return os.path.join(self.directory, _segment_name(number) + ".idx")
+
+    def _load_sidecar(self, number: int) -> Optional[List[list]]:
+        try:
+            with open(self._sidecar_path(number), "rb") as f:
+                sidecar = fast_json.loads(f.read())
+            size = os.path.getsize(os.path.join(self.directory, _segment_name(number)))
+            if sidecar["size"] != size:
+                return None  # Segment was rewritten after the sidecar (interrupted compaction)
+            self._segment_bytes[number] = size
+            return sidecar["ops"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_sidecar(self, number: int, ops: List[list]):
+        path = self._sidecar_path(number)
+        with open(path + ".tmp", "wb") as f:
+            f.write(fast_json.dumps_bytes({"size": self._segment_bytes[number], "ops": ops}))
+        os.replace(path + ".tmp", path)
+
+    def _open_segment(self, number: int):
+        self._active_number = number
+        self._segment_bytes.setdefault(number, 0)
+        self._active_file = open(os.path.join(self.directory, _segment_name(number)), "ab")
+        if self._segment_bytes[number] == 0:
+            self._active_ops = []
+
+    def _seal_active(self):
+        self._active_file.close()
+        self._write_sidecar(self._active_number, self._active_ops)
+        self._active_ops = []
+
+    # ------------------------------------------------------------- compaction
+
+    def garbage_stats(self) -> Dict[str, Any]:
+        """Live versus total bytes in sealed segments"""
+        with self._locked():
+            self._refresh()
+            sealed = {n: size for n, size in self._segment_bytes.items() if n != self._active_number}
+            live = sum(length for number, _, length, _ in self._index.values() if number in sealed)
+            total = sum(sealed.values())
+            return {
+                "sealed_segments": len(sealed),
+                "sealed_bytes": total,
+                "live_bytes": live,
+                "garbage_ratio": round(1 - live / total, 3) if total else 0.0,
+                "compactions": self.compactions,
+                "reclaimed_bytes": self.reclaimed_bytes,
+            }
+
+    def compact(self, force: bool = False) -> int:
+        """
+        Rewrite sealed segments keeping only live records
+
+        The live records are written to a temporary file that then replaces the
+        oldest sealed segment; the other sealed segments are removed afterwards.
+        Replaying a half-finished compaction still yields the same live set,
+        because removed segments only held versions the rewrite already carries.
+
+        Returns:
+            Bytes reclaimed
+        """
+        with self._locked():
+            stats = self.garbage_stats()
+            if stats["sealed_segments"] == 0 or (not force and stats["garbage_ratio"] < self.garbage_ratio):
+                return 0
+
+            sealed = sorted(n for n in self._segment_bytes if n != self._active_number)
+            target = sealed[0]
+            live = sorted(((number, offset, length, filename, meta)
+                           for filename, (number, offset, length, meta) in self._index.items()
+                           if number in sealed), key=lambda item: (item[0], item[1]))
+
+            tmp_path = os.path.join(self.directory, _segment_name(target) + ".compact")
+            ops, moved, position = [], {}, 0
+            with open(tmp_path, "wb") as out:
+                for number, offset, length, filename, meta in live:
+                    with open(os.path.join(self.directory, _segment_name(number)), "rb") as f:
+                        f.seek(offset)
+                        line = f.read(length)
+                    out.write(line)
+                    ops.append(["put", filename, position, length, meta])
+                    moved[filename] = (target, position, length, meta)
+                    position += length
+                out.flush()
+                os.fsync(out.fileno())
+
+            os.replace(tmp_path, os.path.join(self.directory, _segment_name(target)))
+            before = stats["sealed_bytes"]
+            for number in sealed:
+                self._segment_bytes.pop(number, None)
+            self._segment_bytes[target] = position
+            self._write_sidecar(target, ops)
+            for number in sealed[1:]:
+                os.remove(os.path.join(self.directory, _segment_name(number)))
+                if os.path.exists(self._sidecar_path(number)):
+                    os.remove(self._sidecar_path(number))
+
+            self._index.update(moved)
+            reclaimed = before - position
+            self.compactions += 1
+            self.reclaimed_bytes += reclaimed
+            print(f"🧹 Compacted {len(sealed)} segments, reclaimed {reclaimed} bytes")
+            return reclaimed
+
+    def _compact_loop(self, interval: float):
+        while not self._stop_event.wait(interval):
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"⚠️  Segment compaction failed: {e}")
+
+    def close(self):
+        self._stop_event.set()
+        if self._compactor is not None:
+            self._compactor.join(timeout=5)
+        with self._lock:
+            if self._active_file is not None:
+                self._active_file.close()
+                self._active_file = None
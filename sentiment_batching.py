@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Batched Per-Mention Sentiment Scoring
+Packs many mentions into each Bedrock request and returns one score per mention
+"""
+
+import hashlib
+import json
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from bedrock_runtime import get_bedrock_client, invoke_model_cached
+from prompt_builder import estimate_tokens
+from standalone_tools import CONTENT_FIELDS
+
+DEFAULT_MODEL_ID = "anthropic.claude-3-5-sonnet-20241022-v2:0"
+
+# Rough size of the fixed instructions around each batch
+PROMPT_OVERHEAD_TOKENS = 200
+
+# Output tokens reserved per mention in the JSON array response
+OUTPUT_TOKENS_PER_MENTION = 40
+
+
+def mention_id(source: str) -> str:
+    """Stable ID for a mention, derived from its URL or text"""
+    return "m_" + hashlib.sha1(source.encode("utf-8")).hexdigest()[:10]
+
+
+def extract_mentions(content_data: Any) -> List[Dict[str, Any]]:
+    """
+    Turn scraped content or search results into a flat list of mentions
+
+    Returns:
+        List of {"id", "text", "url"} dictionaries with duplicate IDs removed
+    """
+    items = []
+    if isinstance(content_data, dict) and 'scraped_data' in content_data:
+        for item in content_data['scraped_data']:
+            if isinstance(item, dict):
+                text = next((item[field] for field in CONTENT_FIELDS if item.get(field)), "")
+                items.append((item.get('url', ''), text))
+    elif isinstance(content_data, dict) and 'search_results' in content_data:
+        for result in content_data['search_results']:
+            text = f"{result.get('title', '')}: {result.get('snippet', '')}".strip(": ")
+            items.append((result.get('link', ''), text))
+
+    mentions = []
+    seen = set()
+    for url, text in items:
+        if not text:
+            continue
+        identifier = mention_id(url or text)
+        if identifier in seen:
+            continue
+        seen.add(identifier)
+        mentions.append({"id": identifier, "text": text, "url": url})
+    return mentions
+
+
+def pack_batches(mentions: List[Dict[str, Any]], token_budget: int = 3000,
+                 max_batch_size: int = 25, max_mention_tokens: int = 300) -> List[List[Dict[str, Any]]]:
+    """
+    Greedily pack mentions into batches that fit the input token budget
+
+    Mentions longer than ``max_mention_tokens`` are truncated so one long
+    transcript cannot take a whole batch.
+    """
+    available = max(token_budget - PROMPT_OVERHEAD_TOKENS, max_mention_tokens)
+    batches: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    current_tokens = 0
+
+    for mention in mentions:
+        text = mention["text"][:max_mention_tokens * 4]
+        tokens = estimate_tokens(text) + estimate_tokens(mention["id"]) + 4
+        if current and (current_tokens + tokens > available or len(current) >= max_batch_size):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append({"id": mention["id"], "text": text})
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(brand_name: str, batch: List[Dict[str, Any]]) -> str:
+    mentions_json = json.dumps(batch, ensure_ascii=False)
+    return f"""
+        Score the sentiment towards the brand "{brand_name}" in each of the following mentions.
+        Each mention has an "id" and "text".
+
+        Mentions:
+        {mentions_json}
+
+        Respond with only a JSON array containing one object per mention, in the same order:
+        [
+            {{"id": "<mention id>", "sentiment_score": <number between -1 and 1>, "sentiment_label": "<positive/negative/neutral>", "confidence": <number between 0 and 1>}}
+        ]
+        """
+
+
+def _parse_scores(text: str) -> List[Dict[str, Any]]:
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if not match:
+        raise ValueError("No JSON array in model response")
+    scores = json.loads(match.group(0))
+    if not isinstance(scores, list):
+        raise ValueError("Model response is not a JSON array")
+    return [valid for valid in map(_valid_score, scores) if valid is not None]
+
+
+def _has_scores(response_body: Dict[str, Any]) -> bool:
+    try:
+        _parse_scores(response_body['content'][0]['text'])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return False
+    return True
+
+
+def _number(value: Any, low: float, high: float) -> Optional[float]:
+    """value if it is a finite number in [low, high], else None"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return float(value) if low <= value <= high else None
+
+
+def _valid_score(score: Any) -> Optional[Dict[str, Any]]:
+    """A normalized score entry, or None if the model returned a malformed one"""
+    if not isinstance(score, dict) or "id" not in score:
+        return None
+    value = _number(score.get("sentiment_score"), -1.0, 1.0)
+    confidence = _number(score.get("confidence", 0.5), 0.0, 1.0)
+    label = score.get("sentiment_label", "neutral")
+    if value is None or confidence is None or not isinstance(label, str):
+        return None
+    return {"id": score["id"], "sentiment_score": value, "sentiment_label": label, "confidence": confidence}
+
+
+def score_batch(bedrock: Any, brand_name: str, batch: List[Dict[str, Any]],
+                model_id: str = DEFAULT_MODEL_ID, use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Score one batch with a single Bedrock request
+
+    Returns:
+        Mapping of mention ID to its score; mentions the model skipped or scored
+        with malformed values are absent
+    """
+    body = json.dumps({
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": 100 + OUTPUT_TOKENS_PER_MENTION * len(batch),
+        "temperature": 0.0,
+        "messages": [
+            {
+                "role": "user",
+                "content": build_batch_prompt(brand_name, batch)
+            }
+        ]
+    })
+    # Only replies that parse are cached, so a malformed one is retried instead of replayed
+    response_body = invoke_model_cached(bedrock, modelId=model_id, body=body, use_cache=use_cache,
+                                        cache_if=_has_scores)
+    scores = _parse_scores(response_body['content'][0]['text'])
+    return {score["id"]: score for score in scores}
+
+
+def score_mentions(mentions: List[Dict[str, Any]], brand_name: str, token_budget: int = 3000,
+                   max_batch_size: int = 25, max_workers: int = 4, model_id: str = DEFAULT_MODEL_ID,
+                   use_cache: bool = True, bedrock: Any = None) -> Dict[str, Any]:
+    """
+    Score every mention, packing several per request and running batches in parallel
+
+    Returns:
+        Dictionary with a per-mention "scores" list (input order), an aggregate
+        "summary" and the number of Bedrock requests used
+    """
+    bedrock = bedrock or get_bedrock_client()
+    batches = pack_batches(mentions, token_budget=token_budget, max_batch_size=max_batch_size)
+
+    def run(batch):
+        try:
+            return score_batch(bedrock, brand_name, batch, model_id=model_id, use_cache=use_cache), None
+        except Exception as e:
+            return {}, str(e)
+
+    scored: Dict[str, Dict[str, Any]] = {}
+    errors = []
+    if batches:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            for batch_scores, error in executor.map(run, batches):
+                scored.update(batch_scores)
+                if error:
+                    errors.append(error)
+
+    scores = []
+    for mention in mentions:
+        score = scored.get(mention["id"])
+        if score is None:
+            scores.append({"id": mention["id"], "url": mention.get("url", ""), "sentiment_score": None,
+                           "sentiment_label": "unscored", "confidence": 0.0})
+            continue
+        scores.append({
+            "id": mention["id"],
+            "url": mention.get("url", ""),
+            "sentiment_score": score["sentiment_score"],
+            "sentiment_label": score["sentiment_label"],
+            "confidence": score["confidence"],
+        })
+
+    return {
+        "scores": scores,
+        "summary": summarize_scores(scores),
+        "batches": len(batches),
+        "errors": errors,
+    }
+
+
+def summarize_scores(scores: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-mention scores into an overall sentiment"""
+    values = [s["sentiment_score"] for s in scores if s["sentiment_score"] is not None]
+    labels: Dict[str, int] = {}
+    for score in scores:
+        labels[score["sentiment_label"]] = labels.get(score["sentiment_label"], 0) + 1
+
+    mean = sum(values) / len(values) if values else 0.0
+    if mean > 0.3:
+        overall = "positive"
+    elif mean < -0.3:
+        overall = "negative"
+    else:
+        overall = "neutral"
+
+    return {
+        "mentions_scored": len(values),
+        "mentions_total": len(scores),
+        "sentiment_score": round(mean, 3),
+        "sentiment_label": overall,
+        "label_counts": labels,
+    }
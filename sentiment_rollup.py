@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Sentiment Rollup Store
+Per-brand minute, hour and day aggregates of mention counts, sentiment scores and source mix
+"""
+
+import hashlib
+import os
+import re
+import struct
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from result_store import brand_key
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process locking is skipped
+    fcntl = None
+
+# Sources counted in each bucket's source mix (scraping platforms, anything else is "web")
+SOURCES = ("web", "linkedin", "instagram", "youtube", "x")
+
+# Resolution -> (bucket width in seconds, buckets kept in the ring)
+RESOLUTIONS = {
+    "minute": (60, 24 * 60),        # last day
+    "hour": (3600, 90 * 24),        # last 90 days
+    "day": (86400, 2 * 366),        # last two years
+}
+
+# Buckets returned by a trend query without an explicit range
+DEFAULT_TREND_BUCKETS = {"minute": 60, "hour": 48, "day": 30}
+
+# Fixed-size bucket record: start, mentions, scored, score sum, min, max, one count per source
+_SLOT = struct.Struct("<qqqddd" + "q" * len(SOURCES))
+
+
+def source_of(item: Dict[str, Any]) -> str:
+    """Platform a mention or scraped item came from (its "platform" tag, else its URL's domain)"""
+    platform = item.get("platform")
+    if platform in SOURCES:
+        return platform
+    url = item.get("link") or item.get("url") or ""
+    if not url:
+        return "web"
+    from standalone_tools import classify_url
+    return classify_url(url)
+
+
+def find_field(document: Any, key: str, kind: type, depth: int = 3, accept=None):
+    """First value of the given type stored under ``key`` in nested result dicts"""
+    if not isinstance(document, dict) or depth < 0:
+        return None
+    value = document.get(key)
+    if isinstance(value, kind) and (accept is None or accept(value)):
+        return value
+    for child in document.values():
+        found = find_field(child, key, kind, depth - 1, accept)
+        if found is not None:
+            return found
+    return None
+
+
+def _score(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def extract_point(document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Mentions, sentiment scores and source mix of one stored result
+
+    Understands save_result() documents as well as the search, sentiment,
+    full-analysis and demo documents written by the Flask apps.
+
+    Returns:
+        Dict with brand_name, timestamp, mentions, scores and sources, or None
+        when the document carries neither mentions nor a sentiment score
+    """
+    brand_name = document.get("brand_name") or find_field(document, "brand_name", str)
+    if not brand_name:
+        return None
+
+    items = (find_field(document, "search_results", list) or []) + (find_field(document, "scraped_data", list) or [])
+    items = [item for item in items if isinstance(item, dict)]
+    sources = {}
+    for item in items:
+        source = source_of(item)
+        sources[source] = sources.get(source, 0) + 1
+
+    mention_scores = find_field(document, "mention_sentiments", list)
+    if mention_scores:
+        scores = [_score(s.get("sentiment_score")) for s in mention_scores if isinstance(s, dict)]
+    else:
+        sentiment = find_field(document, "sentiment_analysis", dict, accept=lambda s: "sentiment_score" in s) or {}
+        scores = [_score(sentiment.get("sentiment_score"))]
+    scores = [score for score in scores if score is not None]
+
+    if not items and not scores:
+        return None
+    try:
+        timestamp = datetime.fromisoformat(document["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        timestamp = datetime.now()
+    return {"brand_name": brand_name, "timestamp": timestamp, "mentions": len(items),
+            "scores": scores, "sources": sources}
+
+
+class RollupSeries:
+    """
+    Ring of fixed-size bucket records for one brand at one resolution
+
+    A bucket's slot is (bucket start / width) % slots, so recording a point
+    and reading a bucket are each one seek plus one fixed-size read or write.
+    Slots whose stored start differs from the requested bucket are stale and
+    read as empty; points older than a slot's stored bucket are dropped.
+    The file is created by the first add(); until then every bucket is empty.
+    """
+
+    def __init__(self, path: str, width: int, slots: int):
+        self.path = path
+        self.width = width
+        self.slots = slots
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _slot_offset(self, start: int) -> int:
+        return (start // self.width) % self.slots * _SLOT.size
+
+    def _read(self, f, start: int) -> Optional[Tuple]:
+        f.seek(self._slot_offset(start))
+        record = _SLOT.unpack(f.read(_SLOT.size))
+        return record if record[0] == start and record[1] + record[2] > 0 else None
+
+    def add(self, epoch: int, mentions: int, scores: List[float], sources: Dict[str, int]):
+        start = epoch - epoch % self.width
+        if not self.exists():
+            with open(self.path, "ab") as f:
+                f.truncate(_SLOT.size * self.slots)
+        with open(self.path, "r+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)  # Released when the file is closed
+            f.seek(self._slot_offset(start))
+            stored_start = _SLOT.unpack(f.read(_SLOT.size))[0]
+            if stored_start > start:
+                return  # Older than the bucket the slot now holds: already outside the ring
+            record = self._read(f, start)
+            if record is None:
+                record = (start, 0, 0, 0.0, float("inf"), float("-inf")) + (0,) * len(SOURCES)
+            _, count, scored, total, low, high, *mix = record
+            for i, source in enumerate(SOURCES):
+                mix[i] += sources.get(source, 0)
+            if scores:
+                scored += len(scores)
+                total += sum(scores)
+                low = min(low, min(scores))
+                high = max(high, max(scores))
+            f.seek(self._slot_offset(start))
+            f.write(_SLOT.pack(start, count + mentions, scored, total, low, high, *mix))
+
+    def buckets(self, since: int, until: int) -> List[Dict[str, Any]]:
+        """Every bucket from ``since`` to ``until`` (epoch seconds), oldest first, empty ones included"""
+        first = since - since % self.width
+        # Older buckets than the ring holds have been overwritten
+        first = max(first, until - until % self.width - (self.slots - 1) * self.width)
+        results = []
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            f = None  # Nothing recorded for this brand yet
+        try:
+            for start in range(first, until + 1, self.width):
+                record = self._read(f, start) if f is not None else None
+                bucket = {"start": datetime.fromtimestamp(start).isoformat(), "mentions": 0, "scored": 0,
+                          "mean": None, "min": None, "max": None, "sources": {}}
+                if record is not None:
+                    _, count, scored, total, low, high, *mix = record
+                    bucket.update(mentions=count, scored=scored,
+                                  sources={source: n for source, n in zip(SOURCES, mix) if n})
+                    if scored:
+                        bucket.update(mean=round(total / scored, 4), min=low, max=high)
+                results.append(bucket)
+        finally:
+            if f is not None:
+                f.close()
+        return results
+
+
+class SentimentRollupStore:
+    """
+    Minute, hour and day sentiment aggregates for every brand
+
+    Each brand has one ring file per resolution under ``directory``; old
+    buckets are overwritten as the ring wraps, so disk use per brand is fixed
+    (about 380 KB).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], RollupSeries] = {}
+
+    def _series_for(self, brand_name: str, resolution: str, create: bool = True) -> RollupSeries:
+        """
+        Ring for one brand and resolution
+
+        Args:
+            create: Cache the ring for later writes; reads pass False so that
+                querying an unknown brand leaves no trace in memory or on disk
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution} (expected one of {', '.join(RESOLUTIONS)})")
+        key = brand_key(brand_name)
+        series = self._series.get((key, resolution))
+        if series is None:
+            slug = re.sub(r"[^a-z0-9]+", "_", key).strip("_")[:40]
+            digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]
+            width, slots = RESOLUTIONS[resolution]
+            path = os.path.join(self.directory, f"{slug}_{digest}.{resolution}.bin")
+            series = RollupSeries(path, width, slots)
+            if create or series.exists():
+                self._series[(key, resolution)] = series
+        return series
+
+    def clear(self):
+        """Drop every rollup (before rebuilding them from stored results)"""
+        with self._lock:
+            self._series.clear()
+            for name in os.listdir(self.directory):
+                if name.endswith(".bin"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def record(self, brand_name: str, timestamp: datetime, mentions: int = 0,
+               scores: Optional[List[float]] = None, sources: Optional[Dict[str, int]] = None):
+        """Add one observation to the brand's minute, hour and day buckets"""
+        epoch = int(timestamp.timestamp())
+        with self._lock:
+            for resolution in RESOLUTIONS:
+                self._series_for(brand_name, resolution).add(epoch, mentions, scores or [], sources or {})
+
+    def record_document(self, document: Dict[str, Any]) -> bool:
+        """Roll up a stored result document; returns False if it had nothing to record"""
+        point = extract_point(document)
+        if point is None:
+            return False
+        self.record(point["brand_name"], point["timestamp"], point["mentions"], point["scores"], point["sources"])
+        return True
+
+    def trend(self, brand_name: str, resolution: str = "day", since: Optional[datetime] = None,
+              until: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Bucketed sentiment history for a brand
+
+        Args:
+            brand_name: Brand to query (case-insensitive)
+            resolution: "minute", "hour" or "day"
+            since: First bucket to include (default: a resolution-specific window)
+            until: Last bucket to include (default: now)
+
+        Returns:
+            List of buckets, oldest first, each with start, mentions, scored,
+            mean/min/max sentiment score and per-source mention counts
+        """
+        with self._lock:
+            series = self._series_for(brand_name, resolution, create=False)
+            until_epoch = int((until or datetime.now()).timestamp())
+            if since is None:
+                since_epoch = until_epoch - (DEFAULT_TREND_BUCKETS[resolution] - 1) * series.width
+            else:
+                since_epoch = int(since.timestamp())
+            return series.buckets(since_epoch, until_epoch)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Shared BrightData Snapshot Tracker
+Polls every outstanding snapshot from one background loop with adaptive backoff
+"""
+
+import bisect
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Any, Optional
+
+# Upper bounds (seconds) of the time-to-ready histogram buckets
+READY_TIME_BUCKETS = [1, 2, 5, 10, 20, 30, 60, 120, 300]
+
+
+class SnapshotFailedError(Exception):
+    """Raised through a snapshot's future when BrightData reports it failed"""
+
+
+class SnapshotTimeoutError(Exception):
+    """Raised through a snapshot's future when it is not ready in time"""
+
+
+class _TrackedSnapshot:
+    def __init__(self, snapshot_id: str, headers: Dict[str, str], interval: float, timeout: float):
+        self.snapshot_id = snapshot_id
+        self.headers = headers
+        self.interval = interval
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + timeout
+        self.next_poll = self.started_at
+        self.polls = 0
+        self.last_error: Optional[str] = None
+        self.future: Future = Future()
+
+
+class SnapshotTracker:
+    """
+    Waits on many BrightData snapshots with a single polling thread
+
+    Callers get a ``concurrent.futures.Future`` from ``track()`` that resolves
+    with the seconds the snapshot took to become ready. Each snapshot is polled
+    soon after triggering and then progressively less often, so short jobs are
+    picked up quickly and long jobs do not flood the progress endpoint.
+    """
+
+    def __init__(self, status_func: Callable[[str, Dict[str, str]], str],
+                 initial_interval: float = 1.0, max_interval: float = 15.0,
+                 backoff_factor: float = 1.5, timeout: float = 300.0):
+        """
+        Args:
+            status_func: Callable(snapshot_id, headers) returning the progress status string
+            initial_interval: Delay before the second poll of a new snapshot
+            max_interval: Upper bound on the delay between polls of one snapshot
+            backoff_factor: Multiplier applied to the delay after each non-final poll
+            timeout: Seconds before a snapshot is given up on
+        """
+        self.status_func = status_func
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+
+        self._pending: Dict[str, _TrackedSnapshot] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        self._bucket_counts = [0] * (len(READY_TIME_BUCKETS) + 1)
+        self._ready_count = 0
+        self._ready_total_seconds = 0.0
+        self._failed_count = 0
+        self._timeout_count = 0
+        self._total_polls = 0
+
+    def track(self, snapshot_id: str, headers: Dict[str, str], timeout: float = None) -> Future:
+        """
+        Start tracking a snapshot
+
+        Tracking the same ID twice returns the existing future.
+        """
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("SnapshotTracker has been stopped")
+
+            tracked = self._pending.get(snapshot_id)
+            if tracked is None:
+                tracked = _TrackedSnapshot(
+                    snapshot_id, headers, self.initial_interval,
+                    timeout if timeout is not None else self.timeout
+                )
+                self._pending[snapshot_id] = tracked
+                self._ensure_thread()
+                self._condition.notify()
+            return tracked.future
+
+    def pending_count(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def stats(self) -> Dict[str, Any]:
+        """Time-to-ready histogram and outcome counters"""
+        with self._condition:
+            histogram = {}
+            for bound, count in zip(READY_TIME_BUCKETS, self._bucket_counts):
+                histogram[f"le_{bound}s"] = count
+            histogram[f"gt_{READY_TIME_BUCKETS[-1]}s"] = self._bucket_counts[-1]
+
+            return {
+                "pending": len(self._pending),
+                "ready": self._ready_count,
+                "failed": self._failed_count,
+                "timed_out": self._timeout_count,
+                "total_polls": self._total_polls,
+                "mean_ready_seconds": round(self._ready_total_seconds / self._ready_count, 3)
+                if self._ready_count else 0.0,
+                "ready_time_histogram": histogram,
+            }
+
+    def stop(self):
+        """Stop the polling thread and fail any snapshots still pending"""
+        with self._condition:
+            self._stopped = True
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._condition.notify()
+        for tracked in pending:
+            tracked.future.set_exception(RuntimeError("SnapshotTracker stopped"))
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._poll_loop, name="snapshot-tracker", daemon=True)
+            self._thread.start()
+
+    def _poll_loop(self):
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    if self._pending:
+                        next_due = min(t.next_poll for t in self._pending.values())
+                        wait = next_due - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._condition.wait(wait)
+                    else:
+                        self._condition.wait()
+                if self._stopped:
+                    return
+
+                now = time.monotonic()
+                due = [t for t in self._pending.values() if t.next_poll <= now]
+
+            for tracked in due:
+                self._poll_one(tracked)
+
+    def _poll_one(self, tracked: _TrackedSnapshot):
+        # Errors from the progress endpoint are treated as transient until the deadline
+        try:
+            status = self.status_func(tracked.snapshot_id, tracked.headers)
+        except Exception as e:
+            status = None
+            tracked.last_error = str(e)
+
+        now = time.monotonic()
+        with self._condition:
+            if self._pending.get(tracked.snapshot_id) is not tracked:
+                return  # Resolved by stop() while the poll was in flight
+            self._total_polls += 1
+            tracked.polls += 1
+
+            if status == "ready":
+                elapsed = now - tracked.started_at
+                self._record_ready(elapsed)
+                self._pending.pop(tracked.snapshot_id, None)
+                outcome = ("result", elapsed)
+            elif status == "failed":
+                self._failed_count += 1
+                self._pending.pop(tracked.snapshot_id, None)
+                outcome = ("error", SnapshotFailedError(f"Snapshot {tracked.snapshot_id} failed"))
+            elif now >= tracked.deadline:
+                self._timeout_count += 1
+                self._pending.pop(tracked.snapshot_id, None)
+                message = f"Snapshot {tracked.snapshot_id} not ready after {now - tracked.started_at:.0f}s"
+                if tracked.last_error:
+                    message += f" (last error: {tracked.last_error})"
+                outcome = ("error", SnapshotTimeoutError(message))
+            else:
+                tracked.next_poll = min(now + tracked.interval, tracked.deadline)
+                tracked.interval = min(tracked.interval * self.backoff_factor, self.max_interval)
+                outcome = None
+
+        # Resolve futures outside the lock so callbacks cannot deadlock the tracker
+        if outcome is not None:
+            kind, value = outcome
+            if kind == "result":
+                tracked.future.set_result(value)
+            else:
+                tracked.future.set_exception(value)
+
+    def _record_ready(self, elapsed: float):
+        self._ready_count += 1
+        self._ready_total_seconds += elapsed
+        self._bucket_counts[bisect.bisect_left(READY_TIME_BUCKETS, elapsed)] += 1
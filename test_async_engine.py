@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the async brand monitoring engine
+Uses a fake search tool so no BrightData or network access is needed
+"""
+
+import asyncio
+import threading
+import time
+
+from async_engine import AsyncBrandMonitoringEngine
+
+
+class _FakeSearchTool:
+    """Blocking search like BrightDataWebSearchTool._run"""
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _run(self, title, total_results=50):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if title == "broken":
+                raise RuntimeError("search backend down")
+            return [{"title": f"{title} news", "link": f"https://example.com/{title}", "snippet": ""}]
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_sweep_time_tracks_slowest_brand():
+    tool = _FakeSearchTool(delay=0.2)
+    engine = AsyncBrandMonitoringEngine(max_concurrency=200, search_tool=tool)
+    brands = [f"brand-{i}" for i in range(200)]
+
+    start = time.perf_counter()
+    results = asyncio.run(engine.monitor_brands(brands, total_results=5))
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 200
+    assert all(r["total_results"] == 1 for r in results.values())
+    assert elapsed < 2.0
+
+
+def test_concurrency_is_bounded():
+    tool = _FakeSearchTool(delay=0.05)
+    engine = AsyncBrandMonitoringEngine(max_concurrency=5, search_tool=tool)
+
+    asyncio.run(engine.monitor_brands([f"brand-{i}" for i in range(30)]))
+
+    assert tool.max_in_flight == 5
+
+
+def test_failed_brand_does_not_abort_sweep():
+    engine = AsyncBrandMonitoringEngine(max_concurrency=4, search_tool=_FakeSearchTool(delay=0))
+
+    results = asyncio.run(engine.monitor_brands(["OpenAI", "broken"]))
+
+    assert results["OpenAI"]["total_results"] == 1
+    assert "search backend down" in results["broken"]["error"]
+
+
+def test_direct_calls_and_concurrent_sweeps_share_the_limit():
+    tool = _FakeSearchTool(delay=0.05)
+    engine = AsyncBrandMonitoringEngine(max_concurrency=3, search_tool=tool)
+
+    async def main():
+        default_executor = asyncio.get_running_loop()._default_executor
+        single = await engine.monitor_brand("OpenAI")
+        sweeps = await asyncio.gather(engine.monitor_brands([f"a-{i}" for i in range(10)]),
+                                      engine.monitor_brands([f"b-{i}" for i in range(10)]))
+        return single, sweeps, asyncio.get_running_loop()._default_executor is default_executor
+
+    try:
+        single, sweeps, default_untouched = asyncio.run(main())
+    finally:
+        engine.close()
+
+    assert single["total_results"] == 1 and sum(len(sweep) for sweep in sweeps) == 20
+    assert tool.max_in_flight == 3 and default_untouched
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for batched multi-platform scraping
+Uses the local BrightData stand-in from conftest.py
+"""
+
+import asyncio
+import time
+
+import standalone_tools
+from standalone_tools import classify_url, scrape_urls_batch, PLATFORM_DATASET_IDS
+
+MIXED_URLS = [
+    "https://www.linkedin.com/posts/openai-update",
+    "https://www.instagram.com/p/abc123/",
+    "https://youtu.be/xyz",
+    "https://twitter.com/openai/status/1",
+    "https://x.com/openai/status/2",
+    "https://techcrunch.com/openai-news",
+]
+
+
+def test_classify_url_by_domain():
+    assert classify_url("https://uk.linkedin.com/company/openai") == "linkedin"
+    assert classify_url("https://www.youtube.com/watch?v=1") == "youtube"
+    assert classify_url("https://twitter.com/openai") == "x"
+    assert classify_url("https://notlinkedin.com/page") == "web"
+    assert classify_url("not a url") == "web"
+
+
+def test_batch_triggers_platforms_in_parallel(fake_brightdata):
+    for dataset_id in PLATFORM_DATASET_IDS.values():
+        fake_brightdata.ready_delays[dataset_id] = 0.4
+
+    start = time.perf_counter()
+    results = scrape_urls_batch(MIXED_URLS + MIXED_URLS[:2])
+    elapsed = time.perf_counter() - start
+
+    assert sorted(item["url"] for item in results) == sorted(MIXED_URLS)
+    assert {item["platform"] for item in results} == {"linkedin", "instagram", "youtube", "x", "web"}
+    assert all(item["content"] == f"Content from {item['url']}" for item in results)
+    assert len(fake_brightdata.trigger_times) == 5
+    # Five 0.4s platforms finish together instead of taking ~2s back to back
+    assert elapsed < 1.5
+
+
+def test_batch_async_matches_sync(fake_brightdata):
+    results = asyncio.run(standalone_tools.scrape_urls_batch_async(MIXED_URLS))
+
+    by_url = {item["url"]: item for item in results}
+    assert by_url["https://x.com/openai/status/2"]["platform"] == "x"
+    assert by_url["https://x.com/openai/status/2"]["dataset_id"] == PLATFORM_DATASET_IDS["x"]
+    assert len(results) == len(MIXED_URLS)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for cached Bedrock invocation
+Uses a fake bedrock-runtime client, no AWS access needed
+"""
+
+import io
+import json
+import threading
+
+import pytest
+
+import bedrock_runtime
+import cache
+from bedrock_runtime import invoke_model_cached
+
+
+class _FakeBedrock:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke_model(self, modelId, body, **kwargs):
+        self.calls += 1
+        payload = {"content": [{"text": f"reply {self.calls}"}], "stop_reason": "end_turn"}
+        return {"body": io.BytesIO(json.dumps(payload).encode())}
+
+
+@pytest.fixture(autouse=True)
+def llm_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(cache, "_llm_cache", None)
+    yield
+    monkeypatch.setattr(cache, "_llm_cache", None)
+
+
+def test_identical_requests_hit_cache():
+    bedrock = _FakeBedrock()
+    body = {"messages": [{"role": "user", "content": "How is OpenAI doing?"}]}
+
+    first = invoke_model_cached(bedrock, modelId="model-a", body=body)
+    second = invoke_model_cached(bedrock, modelId="model-a", body=json.dumps(body))
+
+    assert first == second == {"content": [{"text": "reply 1"}], "stop_reason": "end_turn"}
+    assert bedrock.calls == 1
+    assert cache.get_llm_cache().stats()["hit_rate"] == 0.5
+
+
+def test_model_and_body_are_part_of_key():
+    bedrock = _FakeBedrock()
+
+    invoke_model_cached(bedrock, modelId="model-a", body="{}")
+    invoke_model_cached(bedrock, modelId="model-b", body="{}")
+    invoke_model_cached(bedrock, modelId="model-a", body='{"x": 1}')
+
+    assert bedrock.calls == 3
+
+
+def test_opt_out_calls_bedrock_and_refreshes_entry():
+    bedrock = _FakeBedrock()
+
+    invoke_model_cached(bedrock, modelId="model-a", body="{}")
+    fresh = invoke_model_cached(bedrock, modelId="model-a", body="{}", use_cache=False)
+
+    assert fresh["content"][0]["text"] == "reply 2"
+    assert invoke_model_cached(bedrock, modelId="model-a", body="{}") == fresh
+    assert bedrock.calls == 2
+
+
+def test_truncated_and_rejected_replies_are_not_cached():
+    class _TruncatedBedrock(_FakeBedrock):
+        def invoke_model(self, modelId, body, **kwargs):
+            self.calls += 1
+            payload = {"content": [{"text": '{"sentiment'}], "stop_reason": "max_tokens"}
+            return {"body": io.BytesIO(json.dumps(payload).encode())}
+
+    truncated = _TruncatedBedrock()
+    invoke_model_cached(truncated, modelId="model-a", body="{}")
+    invoke_model_cached(truncated, modelId="model-a", body="{}")
+    assert truncated.calls == 2
+
+    bedrock = _FakeBedrock()
+    rejected = invoke_model_cached(bedrock, modelId="model-b", body="{}", cache_if=lambda reply: False)
+    accepted = invoke_model_cached(bedrock, modelId="model-b", body="{}")
+    assert (rejected["content"][0]["text"], accepted["content"][0]["text"]) == ("reply 1", "reply 2")
+    assert invoke_model_cached(bedrock, modelId="model-b", body="{}") == accepted and bedrock.calls == 2
+
+
+def test_cache_persists_across_processes():
+    invoke_model_cached(_FakeBedrock(), modelId="model-a", body="{}")
+    cache._llm_cache = None
+
+    bedrock = _FakeBedrock()
+    assert invoke_model_cached(bedrock, modelId="model-a", body="{}")["content"][0]["text"] == "reply 1"
+    assert bedrock.calls == 0
+
+
+def test_client_registry_reuses_one_client_across_threads(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    monkeypatch.setattr(bedrock_runtime, "_clients", {})
+    monkeypatch.setattr(bedrock_runtime, "_client_creations", {})
+    monkeypatch.setattr(bedrock_runtime, "_client_requests", 0)
+
+    clients = []
+    threads = [
+        threading.Thread(target=lambda: clients.append(bedrock_runtime.get_bedrock_client("us-west-2")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    other_region = bedrock_runtime.get_bedrock_client("us-east-1", retry_mode="adaptive")
+
+    assert len({id(client) for client in clients}) == 1
+    assert clients[0].meta.config.max_pool_connections == 25
+    assert other_region.meta.config.retries["mode"] == "adaptive"
+    assert bedrock_runtime.bedrock_client_stats() == {
+        "clients_created": 2,
+        "clients_created_by_region": {"us-west-2": 1, "us-east-1": 1},
+        "client_requests": 9,
+        "reused": 7,
+    }
+
+
+def test_usage_counts_billed_tokens_not_cache_hits():
+    class _MeteredBedrock(_FakeBedrock):
+        def invoke_model(self, modelId, body, **kwargs):
+            self.calls += 1
+            payload = {"content": [{"text": "reply"}], "stop_reason": "end_turn",
+                       "usage": {"input_tokens": 120, "output_tokens": 30}}
+            return {"body": io.BytesIO(json.dumps(payload).encode())}
+
+    bedrock_runtime.reset_bedrock_usage()
+    bedrock = _MeteredBedrock()
+    invoke_model_cached(bedrock, modelId="model-a", body="{}")
+    invoke_model_cached(bedrock, modelId="model-a", body="{}")
+
+    assert bedrock_runtime.bedrock_usage_stats() == {"calls": 1, "cache_hits": 1, "input_tokens": 120,
+                                                     "output_tokens": 30, "total_tokens": 150}
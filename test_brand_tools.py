@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the CrewAI-free tool functions and the startup path that uses them
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import brand_tools
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.mark.parametrize("statement", [
+    "import brand_tools",
+    "import standalone_tools",
+    "import monitoring_pipeline",
+    "import async_engine",
+    "import brand_monitoring_agent",
+    "import brand_monitoring_agent_with_storage",
+    "import monitoring_pipeline; monitoring_pipeline.storage_agent_toolset()",
+])
+def test_importing_tool_modules_does_not_load_crewai(statement):
+    code = f"import sys; sys.path.insert(0, {ROOT!r}); {statement}; print('crewai' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT)
+
+    assert output.stdout.strip().splitlines()[-1] == "False"
+
+
+def test_system_status_reports_frameworks_without_importing_them(enhanced_app, monkeypatch):
+    monkeypatch.delitem(sys.modules, "crewai", raising=False)
+
+    payload = enhanced_app.app.test_client().get("/api/system-status").get_json()
+
+    assert payload["success"] is True
+    assert set(payload["dependencies"]) == set(brand_tools.HEAVY_MODULES)
+    assert payload["dependencies"]["crewai"]["loaded"] is False and "crewai" not in sys.modules
+    assert payload["status"]["crewai"] == payload["dependencies"]["crewai"]["available"]
+
+
+def test_report_markdown_and_prewarm():
+    report = brand_tools.brand_report_markdown(
+        "OpenAI",
+        {"total_results": 1, "search_results": [{"title": "Launch", "link": "https://a.com", "snippet": "news"}]},
+        '{"sentiment_analysis": {"sentiment_score": 0.6, "sentiment_label": "positive"}}',
+    )
+    assert "Positive (Score: 0.60)" in report and "**Launch**" in report
+
+    timings = brand_tools.prewarm()
+    assert set(timings) == {"standalone_tools", "ddgs", "sentiment_batching", "bedrock_client"}
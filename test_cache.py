@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for the tiered result cache
+"""
+
+import threading
+import time
+
+import pytest
+
+from cache import TieredCache, MemoryTier, DiskTier, SingleFlight, search_cache_key
+
+
+def test_memory_hit_and_miss_metrics():
+    cache = TieredCache([MemoryTier(max_entries=10)], ttl_seconds=60)
+    key = search_cache_key("OpenAI", 10, "Web Search Tool")
+
+    assert cache.get(key) is None
+    cache.set(key, [{"title": "OpenAI news"}])
+
+    assert cache.get(search_cache_key("  openai ", 10, "Web Search Tool")) == [{"title": "OpenAI news"}]
+    assert cache.get(search_cache_key("OpenAI", 5, "Web Search Tool")) is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_only_brightdata_search_results_are_cached(monkeypatch):
+    import brand_tools
+    import cache
+    import standalone_tools
+    monkeypatch.delenv("SEARCH_CACHE_DISABLED", raising=False)
+    monkeypatch.setattr(cache, "_search_cache", TieredCache([MemoryTier()], ttl_seconds=60))
+    calls = []
+
+    def brightdata_down(title, total):
+        calls.append("brightdata")
+        raise ConnectionError("proxy unreachable")
+    monkeypatch.setattr(standalone_tools, "search_with_brightdata", brightdata_down)
+    monkeypatch.setattr(standalone_tools, "search_with_duckduckgo", lambda title, total: [{"title": "ddg"}])
+
+    assert brand_tools.cached_search("OpenAI", 5) == ([{"title": "ddg"}], False)
+    monkeypatch.setattr(standalone_tools, "search_with_brightdata", lambda title, total: [{"title": "bd"}])
+    assert brand_tools.cached_search("OpenAI", 5) == ([{"title": "bd"}], False)
+    assert brand_tools.cached_search("OpenAI", 5) == ([{"title": "bd"}], True)
+    assert calls == ["brightdata"]
+
+
+def test_ttl_expiry():
+    cache = TieredCache([MemoryTier()], ttl_seconds=0.05)
+    cache.set("brand", ["result"])
+    time.sleep(0.1)
+
+    assert cache.get("brand") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = TieredCache([MemoryTier(max_entries=2)])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["tiers"]["memory"]["evictions"] == 1
+
+
+def test_disk_tier_survives_restart_and_promotes(tmp_path):
+    first = TieredCache([MemoryTier(), DiskTier(str(tmp_path))])
+    first.set(search_cache_key("OpenAI", 10, "bd"), ["result"])
+
+    second = TieredCache([MemoryTier(), DiskTier(str(tmp_path))])
+    assert second.get(search_cache_key("OpenAI", 10, "bd")) == ["result"]
+    assert second.get(search_cache_key("OpenAI", 10, "bd")) == ["result"]
+    assert second.stats()["hits_by_tier"] == {"memory": 1, "disk": 1}
+
+
+def test_disk_tier_size_limit(tmp_path):
+    disk = DiskTier(str(tmp_path), max_entries=3)
+    cache = TieredCache([disk])
+    for i in range(5):
+        cache.set(f"key-{i}", i)
+
+    assert len(disk) == 3
+    assert disk.evictions == 2
+
+
+def _concurrently(count, func):
+    results, barrier = [None] * count, threading.Barrier(count)
+
+    def call(index):
+        barrier.wait()
+        results[index] = func()
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_single_flight_shares_one_execution():
+    flights = SingleFlight()
+    executions = []
+
+    def work():
+        executions.append(1)
+        time.sleep(0.2)
+        return {"brand": "OpenAI"}
+
+    results = _concurrently(8, lambda: flights.do(("full-analysis", "OpenAI", 10), work))
+
+    assert len(executions) == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * 7
+    assert all(result is results[0][0] for result, _ in results)
+    assert flights.stats() == {"name": "flights", "calls": 8, "executions": 1, "coalesced": 7, "in_flight": 0}
+    assert flights.do(("full-analysis", "OpenAI", 10), lambda: "again") == ("again", False)
+
+
+def test_single_flight_shares_failures_and_keeps_keys_apart():
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("throttled")
+
+    leader = threading.Thread(target=lambda: pytest.raises(RuntimeError, flights.do, "a", fail))
+    leader.start()
+    started.wait()
+    with pytest.raises(RuntimeError, match="throttled"):
+        flights.do("a", lambda: "unused")
+    assert flights.do("b", lambda: "other") == ("other", False)
+    leader.join()
+
+
+def test_identical_requests_are_coalesced(enhanced_app, monkeypatch):
+    import brand_tools
+    searches = []
+
+    def slow_search(brand, total):
+        searches.append(brand)
+        time.sleep(0.3)
+        return {"search_results": [{"title": brand}]}
+    monkeypatch.setattr(brand_tools, "search_brand_mentions_data", slow_search)
+
+    responses = _concurrently(5, lambda: enhanced_app.app.test_client().post(
+        "/api/search-brand", json={"brand_name": "OpenAI", "max_results": 5}).get_json())
+
+    assert searches == ["OpenAI"]
+    assert len({response["filename"] for response in responses}) == 1
+    assert sum(response["coalesced"] for response in responses) == 4
+    stats = enhanced_app.app.test_client().get("/api/cache-stats").get_json()["coalescing"]
+    assert stats["executions"] >= 1 and stats["coalesced"] >= 4
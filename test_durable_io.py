@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for crash-safe result writes
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+import durable_io
+from data_storage import BrandMonitoringDataStorage
+from durable_io import GroupCommitter, write_atomic, write_temp
+
+
+def test_failed_write_keeps_the_old_file(tmp_path, monkeypatch):
+    target = str(tmp_path / "result.json")
+    write_atomic(target, b'{"old": true}')
+
+    def crash(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(durable_io.os, "replace", crash)
+    with pytest.raises(OSError):
+        write_atomic(target, b'{"new": tr')
+
+    assert open(target, "rb").read() == b'{"old": true}'
+    assert os.listdir(tmp_path) == ["result.json"]
+
+
+def test_concurrent_group_commits_share_flushes(tmp_path):
+    committer = GroupCommitter(window=0.02)
+    paths = [str(tmp_path / f"result_{i}.json") for i in range(16)]
+    threads = [threading.Thread(target=lambda p=p: committer.commit(write_temp(p, p.encode()), p))
+               for p in paths]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert committer.stats["commits"] == 16
+    assert committer.stats["batches"] < 16
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in paths)
+    assert all(open(p).read() == p for p in paths)
+
+
+@pytest.mark.parametrize("fsync", ["off", "always", "group"])
+def test_every_fsync_mode_round_trips(tmp_path, fsync):
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files", rollups=False, fsync=fsync)
+
+    storage.save_document("search_OpenAI_1.json", {"brand_name": "OpenAI", "n": 1})
+
+    assert storage.get_result_by_filename("search_OpenAI_1.json")["n"] == 1
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    with pytest.raises(ValueError):
+        BrandMonitoringDataStorage(str(tmp_path), backend="files", fsync="sometimes")
+
+
+def test_startup_scrub_quarantines_torn_files(tmp_path):
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files", rollups=False)
+    storage.save_document("search_OpenAI_1.json", {"brand_name": "OpenAI", "timestamp": "2025-01-01T00:00:00"})
+    (tmp_path / "search_OpenAI_2.json").write_text('{"brand_name": "Open')
+    stale = tmp_path / ".search_OpenAI_3.json.1.1.tmp"
+    stale.write_text("{")
+    old = time.time() - durable_io.STALE_TEMP_SECONDS - 1
+    os.utime(stale, (old, old))
+
+    reopened = BrandMonitoringDataStorage(str(tmp_path), backend="files", rollups=False)
+
+    assert reopened.scrub_report["quarantined"] == ["search_OpenAI_2.json"]
+    assert reopened.scrub_report["temp_files_removed"] == 1
+    assert os.path.exists(tmp_path / "quarantine" / "search_OpenAI_2.json")
+    assert [r["filename"] for r in reopened.list_results()["results"]] == ["search_OpenAI_1.json"]
+
+
+def test_corrupt_file_found_at_read_time_is_quarantined(tmp_path):
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files", rollups=False)
+    storage.save_document("search_OpenAI_1.json", {"brand_name": "OpenAI"})
+    (tmp_path / "search_OpenAI_1.json").write_text('{"brand_name": "Open')
+
+    assert storage.get_result_by_filename("search_OpenAI_1.json") is None
+    assert storage.get_all_results() == []
+    assert os.path.exists(tmp_path / "quarantine" / "search_OpenAI_1.json")
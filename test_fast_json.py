@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the fast JSON serialization layer
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from flask import Flask, jsonify, request
+
+import fast_json
+
+DOCUMENT = {"brand_name": "Café", "scores": [0.5, -1, None, True], "nested": {"a": {"b": []}}}
+
+
+@pytest.fixture(params=["accelerated", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(fast_json, "orjson", None)
+    elif fast_json.orjson is None:
+        pytest.skip("orjson is not installed")
+    return fast_json
+
+
+def test_round_trip_matches_the_standard_library(codec):
+    assert codec.loads(codec.dumps(DOCUMENT)) == DOCUMENT
+    assert codec.loads(codec.dumps_bytes(DOCUMENT)) == DOCUMENT
+    assert json.loads(codec.dumps(DOCUMENT)) == DOCUMENT
+    assert "Café" in codec.dumps(DOCUMENT)
+
+
+def test_indented_output_is_the_stored_file_layout(codec):
+    assert codec.dumps_bytes(DOCUMENT, indent=True).decode("utf-8") == json.dumps(DOCUMENT, indent=2, ensure_ascii=False)
+
+
+def test_decode_errors_are_json_decode_errors(codec):
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads("not json")
+
+
+def test_values_the_accelerated_codec_rejects_fall_back(codec):
+    assert codec.loads(codec.dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+
+
+def test_flask_provider_serves_and_parses_json():
+    app = fast_json.configure_flask(Flask(__name__))
+
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        return jsonify({"received": request.get_json(), "at": datetime(2025, 1, 1)})
+
+    response = app.test_client().post("/echo", json=DOCUMENT)
+
+    assert response.get_json()["received"] == DOCUMENT
+    assert response.get_json()["at"] == "Wed, 01 Jan 2025 00:00:00 GMT"
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared HTTP connection pool
+Runs against a local keep-alive HTTP server, no network access needed
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from http_pool import HTTPConnectionPoolManager
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_repeated_requests_reuse_connection():
+    server, base_url = _start_server()
+    pool = HTTPConnectionPoolManager(pool_maxsize=2)
+    try:
+        for i in range(5):
+            response = pool.get(f"{base_url}/search/{i}", timeout=5)
+            assert response.json() == {"path": f"/search/{i}"}
+
+        stats = pool.stats()
+        assert stats["requests"] == 5
+        assert stats["new_connections"] == 1
+        assert stats["reused_connections"] == 4
+    finally:
+        pool.close()
+        server.shutdown()
+
+
+def test_keep_alive_disabled_opens_connection_per_request():
+    server, base_url = _start_server()
+    pool = HTTPConnectionPoolManager(keep_alive=False)
+    try:
+        for _ in range(3):
+            pool.get(f"{base_url}/", timeout=5)
+
+        assert pool.stats()["new_connections"] == 3
+    finally:
+        pool.close()
+        server.shutdown()
+
+
+def test_threads_share_pool_but_not_sessions():
+    server, base_url = _start_server()
+    pool = HTTPConnectionPoolManager(pool_maxsize=4)
+    sessions = []
+
+    def worker():
+        sessions.append(pool.session())
+        for _ in range(3):
+            pool.get(f"{base_url}/", timeout=5)
+
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = pool.stats()
+        assert len({id(s) for s in sessions}) == 4
+        assert stats["requests"] == 12
+        assert stats["new_connections"] <= 4
+    finally:
+        pool.close()
+        server.shutdown()
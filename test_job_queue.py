@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the background job queue and the demo endpoints built on it
+"""
+
+import threading
+import time
+
+import pytest
+
+from job_queue import JobQueue, QueueFull
+
+
+def _wait_for(queue, job_id, status, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        record = queue.status(job_id)
+        if record is not None and record["status"] == status:
+            return record
+        time.sleep(0.01)
+    raise AssertionError(f"{job_id} never reached {status}: {queue.status(job_id)}")
+
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(workers=1, max_queue=2, status_ttl=60)
+    yield queue
+    queue.close()
+
+
+def test_pool_is_bounded_and_rejects_when_full(queue):
+    release = threading.Event()
+    first = queue.submit(lambda job: release.wait(5) and {"answer": 42}, brand_name="OpenAI")
+    _wait_for(queue, first, "running")
+    waiting = [queue.submit(lambda job: None) for _ in range(2)]
+
+    with pytest.raises(QueueFull):
+        queue.submit(lambda job: None)
+
+    assert queue.status(waiting[1])["queue_position"] == 2
+    metrics = queue.metrics()
+    assert (metrics["running"], metrics["queue_depth"], metrics["rejected"]) == (1, 2, 1)
+
+    release.set()
+    record = _wait_for(queue, first, "completed")
+    assert (record["answer"], record["brand_name"]) == (42, "OpenAI")
+    for job_id in waiting:
+        _wait_for(queue, job_id, "completed")
+    assert queue.metrics()["completed"] == 3 and queue.metrics()["run_seconds"]["p95"] is not None
+
+
+def test_cancel_queued_and_running_jobs(queue):
+    running = queue.submit(lambda job: job.wait(30))
+    _wait_for(queue, running, "running")
+    queued = queue.submit(lambda job: None)
+
+    assert queue.cancel(queued)["status"] == "cancelled"
+    queue.cancel(running)
+
+    _wait_for(queue, running, "cancelled", timeout=2)
+    assert queue.metrics()["cancelled"] == 2 and queue.cancel("missing") is None
+
+
+def test_failures_are_recorded_and_statuses_expire():
+    queue = JobQueue(workers=1, max_queue=2, status_ttl=0.05)
+    try:
+        def boom(job):
+            raise RuntimeError("no credentials")
+        job_id = queue.submit(boom)
+        assert _wait_for(queue, job_id, "failed")["error"] == "no credentials"
+
+        time.sleep(0.1)
+        assert queue.status(job_id) is None and queue.metrics()["tracked_jobs"] == 0
+    finally:
+        queue.close()
+
+
+def test_run_demo_endpoint_queues_and_pushes_back(enhanced_app, monkeypatch):
+    release = threading.Event()
+    demo_jobs = JobQueue(workers=1, max_queue=1, name="demo")
+    monkeypatch.setattr(enhanced_app, "demo_jobs", demo_jobs)
+    blocker = demo_jobs.submit(lambda job: job.wait(5))
+    _wait_for(demo_jobs, blocker, "running")
+    client = enhanced_app.app.test_client()
+    try:
+        accepted = client.post("/api/run-demo", json={"brand_name": "OpenAI"})
+        rejected = client.post("/api/run-demo", json={"brand_name": "OpenAI"})
+
+        process_id = accepted.get_json()["process_id"]
+        assert accepted.get_json()["status"]["status"] == "queued"
+        assert rejected.status_code == 429 and rejected.headers["Retry-After"]
+        assert client.get("/api/process-status").get_json()["metrics"]["queue_depth"] == 1
+
+        cancelled = client.post(f"/api/process-status/{process_id}/cancel").get_json()
+        assert cancelled["status"]["status"] == "cancelled"
+        assert client.get(f"/api/process-status/{process_id}").get_json()["status"]["status"] == "cancelled"
+        assert client.get("/api/process-status/demo_missing").status_code == 404
+    finally:
+        demo_jobs.close()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the Parquet mention export
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+pyarrow = pytest.importorskip("pyarrow")
+import pyarrow.dataset as ds
+
+from data_storage import BrandMonitoringDataStorage
+from mention_export import MentionExporter, mention_rows, open_mentions
+
+
+def _save(storage, filename, brand, when, links, mention_scores=None):
+    document = {
+        "brand_name": brand,
+        "timestamp": when.isoformat(),
+        "search_results": [{"title": f"{brand} {i}", "link": link, "snippet": f"about {brand}"}
+                           for i, link in enumerate(links)],
+        "sentiment_analysis": {"sentiment_score": 0.5, "sentiment_label": "positive"},
+    }
+    if mention_scores:
+        document["mention_sentiments"] = mention_scores
+    storage.save_document(filename, document)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return BrandMonitoringDataStorage(str(tmp_path / "results"), backend="files", rollups=False)
+
+
+def test_mention_rows_prefer_per_mention_scores():
+    document = {"brand_name": "Open AI", "timestamp": "2025-03-10T12:00:00",
+                "search_results": {"search_results": [{"title": "a", "link": "https://www.linkedin.com/p/1"},
+                                                      {"title": "b", "link": "https://news.example.com/2"}]},
+                "sentiment_analysis": {"sentiment_score": 0.1, "sentiment_label": "neutral"},
+                "mention_sentiments": [{"url": "https://news.example.com/2", "sentiment_score": -0.8,
+                                        "sentiment_label": "negative"}]}
+
+    rows = mention_rows(document, "full_analysis_x.json", "full_analysis")
+
+    assert [(r["brand"], r["date"], r["domain"], r["source"], r["sentiment_score"]) for r in rows] == [
+        ("open_ai", "2025-03-10", "www.linkedin.com", "linkedin", 0.1),
+        ("open_ai", "2025-03-10", "news.example.com", "web", -0.8),
+    ]
+    assert mention_rows({"brand_name": "OpenAI"}, "no_timestamp.json") == []
+
+
+def test_export_is_partitioned_and_incremental(storage, tmp_path):
+    day = datetime(2025, 3, 10, 9, 0)
+    _save(storage, "search_OpenAI_1.json", "OpenAI", day, ["https://a.com/1", "https://a.com/2"])
+    _save(storage, "search_Anthropic_1.json", "Anthropic", day + timedelta(days=1), ["https://b.com/1"])
+    output = str(tmp_path / "mentions")
+    exporter = MentionExporter(storage, output, batch_rows=1)
+
+    first = exporter.export()
+    assert (first["results"], first["rows"]) == (2, 3)
+    assert os.path.isdir(os.path.join(output, "brand=openai", "date=2025-03-10"))
+    assert os.path.isdir(os.path.join(output, "brand=anthropic", "date=2025-03-11"))
+
+    assert exporter.export()["rows"] == 0
+
+    _save(storage, "search_OpenAI_2.json", "OpenAI", day + timedelta(days=2), ["https://a.com/3"])
+    assert exporter.export()["results"] == 1
+
+    table = open_mentions(output).to_table(filter=ds.field("brand") == "openai")
+    assert sorted(table.column("link").to_pylist()) == ["https://a.com/1", "https://a.com/2", "https://a.com/3"]
+    assert exporter.load_state()["rows"] == 4
+
+    assert MentionExporter(storage, output).export(full=True)["rows"] == 4
+    assert open_mentions(output).count_rows() == 4
+
+
+def test_failed_export_leaves_no_duplicate_rows(storage, tmp_path, monkeypatch):
+    day = datetime(2025, 3, 10, 9, 0)
+    for i in range(3):
+        _save(storage, f"search_OpenAI_{i}.json", "OpenAI", day + timedelta(hours=i), [f"https://a.com/{i}"])
+    output = str(tmp_path / "mentions")
+    exporter = MentionExporter(storage, output, batch_rows=1)
+
+    # Crash after the first part is on disk, before the watermark moves
+    get_result = storage.get_result_by_filename
+    def crash_on_last(filename):
+        if filename == "search_OpenAI_2.json":
+            raise KeyboardInterrupt
+        return get_result(filename)
+    monkeypatch.setattr(storage, "get_result_by_filename", crash_on_last)
+    monkeypatch.setattr(exporter, "_remove_parts", lambda export_id: 0)  # as if the process died
+    with pytest.raises(KeyboardInterrupt):
+        exporter.export()
+    assert exporter.load_state()["pending_export"] and open_mentions(output).count_rows() >= 1
+    monkeypatch.undo()
+
+    assert MentionExporter(storage, output).export()["rows"] == 3
+    assert open_mentions(output).count_rows() == 3
+    assert exporter.load_state()["pending_export"] is None
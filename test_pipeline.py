@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the stage graph runner
+"""
+
+import time
+
+import pytest
+
+from cache import MemoryTier, TieredCache
+from monitoring_pipeline import run_monitoring_pipeline
+from pipeline import PipelineError, Stage, run_stages
+
+
+def _sleep_then(seconds, value):
+    def stage(**inputs):
+        time.sleep(seconds)
+        return value if not inputs else (value, inputs)
+    return stage
+
+
+def test_independent_stages_overlap_and_dependants_get_results():
+    run = run_stages([
+        Stage("search", _sleep_then(0.2, "mentions")),
+        Stage("sentiment", _sleep_then(0.2, "positive")),
+        Stage("report", _sleep_then(0, "report"), after=("search", "sentiment")),
+    ])
+
+    assert run["results"]["report"] == ("report", {"search": "mentions", "sentiment": "positive"})
+    assert run["elapsed"] < 0.35
+    timings = run["timings"]
+    assert timings["search"]["seconds"] >= 0.2 and timings["sentiment"]["seconds"] >= 0.2
+    assert timings["report"]["start"] >= max(timings["search"]["end"], timings["sentiment"]["end"])
+
+
+def test_failure_stops_dependants_and_keeps_timings():
+    calls = []
+
+    def broken():
+        raise RuntimeError("throttled")
+
+    with pytest.raises(PipelineError) as failure:
+        run_stages([
+            Stage("search", broken),
+            Stage("sentiment", _sleep_then(0.05, "positive")),
+            Stage("report", lambda search, sentiment: calls.append("report"), after=("search", "sentiment")),
+        ])
+
+    assert failure.value.stage == "search" and "throttled" in str(failure.value)
+    assert "search" in failure.value.timings and calls == []
+
+
+@pytest.mark.parametrize("stages, message", [
+    ([Stage("a", lambda: 1), Stage("a", lambda: 2)], "Duplicate"),
+    ([Stage("a", lambda b: 1, after=("b",))], "unknown"),
+    ([Stage("a", lambda b: 1, after=("b",)), Stage("b", lambda a: 1, after=("a",))], "cycle"),
+])
+def test_invalid_graphs_are_rejected(stages, message):
+    with pytest.raises(ValueError, match=message):
+        run_stages(stages)
+
+
+def test_full_analysis_runs_search_and_sentiment_concurrently(enhanced_app, monkeypatch):
+    import brand_tools
+    monkeypatch.setattr(brand_tools, "search_brand_mentions_data",
+                        lambda brand, total: time.sleep(0.3) or {"search_results": []})
+    monkeypatch.setattr(brand_tools, "analyze_brand_sentiment_data",
+                        lambda content, brand: time.sleep(0.3) or {"sentiment_analysis": {"sentiment_score": 0.5}})
+    monkeypatch.setattr(brand_tools, "brand_report_markdown", lambda brand, search, sentiment: "report")
+
+    payload = enhanced_app.app.test_client().post("/api/full-analysis", json={"brand_name": "OpenAI"}).get_json()
+
+    latency = payload["data"]["stage_latency"]
+    assert payload["success"] is True and payload["data"]["report"] == "report"
+    assert set(latency["stages"]) == {"search", "sentiment", "report"}
+    assert latency["elapsed"] < 0.55
+
+
+def test_retries_timeouts_and_cached_stages():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("reset")
+        return "ok"
+
+    run = run_stages([Stage("search", flaky, retries=2, retry_delay=0.01)])
+    assert run["results"]["search"] == "ok" and run["timings"]["search"]["attempts"] == 3
+
+    started = time.perf_counter()
+    with pytest.raises(PipelineError, match="timed out") as failure:
+        run_stages([Stage("scrape", lambda: time.sleep(1), timeout=0.1)])
+    assert time.perf_counter() - started < 0.5 and failure.value.timings["scrape"]["timed_out"]
+
+    cache, calls = TieredCache([MemoryTier()], ttl_seconds=60), []
+    stages = lambda: [Stage("urls", lambda: ["https://a.com"]),
+                      Stage("scrape", lambda urls: calls.append(urls) or {"pages": len(urls)}, after=("urls",),
+                            cache_key=lambda urls: urls)]
+    run_stages(stages(), cache=cache)
+    second = run_stages(stages(), cache=cache)
+    assert len(calls) == 1 and second["results"]["scrape"] == {"pages": 1} and second["timings"]["scrape"]["cached"]
+
+
+def _fake_tools(calls, scraped=True):
+    return {
+        "search": lambda brand, total: calls.append("search") or {
+            "search_results": [{"title": "t", "link": f"https://news.example.com/{i}"} for i in range(total)]},
+        "scrape": lambda urls: calls.append(("scrape", len(urls))) or {
+            "scraped_data": [{"markdown": "great launch"}] if scraped else []},
+        "sentiment": lambda content, brand: calls.append(("sentiment", sorted(content))) or {
+            "sentiment_analysis": {"sentiment_score": 0.7}},
+        "report": lambda brand, search, scrape, sentiment: calls.append("report") or {"report_content": "# Report"},
+    }
+
+
+def test_monitoring_pipeline_calls_tools_in_dependency_order():
+    calls = []
+
+    result = run_monitoring_pipeline("OpenAI", _fake_tools(calls), total_results=8, max_scrape_urls=3,
+                                     use_cache=False)
+
+    assert calls == ["search", ("scrape", 3), ("sentiment", ["scraped_data"]), "report"]
+    assert result["report"] == {"report_content": "# Report"}
+    assert list(result["stage_latency"]["stages"]) == ["search", "scrape", "sentiment", "report"]
+
+    calls.clear()
+    run_monitoring_pipeline("OpenAI", _fake_tools(calls, scraped=False), total_results=2, use_cache=False)
+    assert ("sentiment", ["search_results"]) in calls
+
+
+def test_empty_scrapes_are_not_cached_and_toolsets_do_not_share_entries(monkeypatch):
+    import monitoring_pipeline
+    shared = TieredCache([MemoryTier()], ttl_seconds=60)
+    monkeypatch.setattr(monitoring_pipeline, "get_pipeline_cache", lambda: shared)
+    calls = []
+
+    empty = _fake_tools(calls, scraped=False)
+    for _ in range(2):
+        run_monitoring_pipeline("OpenAI", empty, total_results=2)
+    assert calls.count(("scrape", 2)) == 2
+
+    full = _fake_tools(calls)
+    other = dict(full, scrape=lambda urls: calls.append(("other", len(urls))) or {"scraped_data": [{"markdown": "x"}]})
+    for tools in (full, full, other):
+        run_monitoring_pipeline("OpenAI", tools, total_results=2)
+    assert calls.count(("scrape", 2)) == 3 and calls.count(("other", 2)) == 1
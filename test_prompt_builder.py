@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the token-budgeted prompt builder
+"""
+
+import json
+
+from prompt_builder import PromptBuilder, build_report_context, estimate_tokens
+
+
+def test_near_duplicates_are_removed():
+    builder = PromptBuilder("OpenAI", token_budget=1000)
+    builder.add("OpenAI releases a new model with better reasoning and lower prices for developers")
+    builder.add("OpenAI releases a new model with better reasoning and lower prices for developers!")
+    builder.add("Stock markets close higher on Friday")
+
+    text, stats = builder.build()
+
+    assert stats["duplicates_removed"] == 1
+    assert stats["snippets_used"] == 2
+    assert text.count("OpenAI releases") == 1
+
+
+def test_brand_relevant_snippets_rank_first():
+    builder = PromptBuilder("Hugging Face", token_budget=1000)
+    builder.add("Weather update for the weekend in Paris")
+    builder.add("Hugging Face launches a new open model hub feature for Hugging Face users")
+
+    text, _ = builder.build()
+
+    assert text.splitlines()[0].startswith("- Hugging Face launches")
+
+
+def test_budget_is_respected_and_savings_reported():
+    builder = PromptBuilder("OpenAI", token_budget=300)
+    for i in range(50):
+        builder.add(f"OpenAI mention number {i} " + "with some unique filler words about topic %d " % i * 8)
+
+    text, stats = builder.build()
+
+    assert estimate_tokens(text) <= 300
+    assert stats["tokens_after"] <= 300
+    assert stats["tokens_saved"] == stats["tokens_before"] - stats["tokens_after"]
+    assert stats["snippets_dropped"] > 0
+
+
+def test_long_snippet_is_capped():
+    builder = PromptBuilder("OpenAI", token_budget=5000, max_snippet_tokens=50)
+    builder.add("OpenAI " + "transcript words " * 500, "Transcript")
+
+    text, stats = builder.build()
+
+    assert estimate_tokens(text) <= 55
+    assert text.endswith("...")
+
+
+def test_report_context_is_smaller_than_indented_json():
+    data = {
+        "brand_name": "OpenAI",
+        "sentiment": {"sentiment_score": 0.6},
+        "search_results": [
+            {"title": f"OpenAI story {i % 5}", "link": f"https://example.com/{i}",
+             "snippet": f"OpenAI story {i % 5} covered by several outlets this week"}
+            for i in range(200)
+        ],
+    }
+
+    context, stats = build_report_context("OpenAI", data, token_budget=800)
+
+    assert '"sentiment_score":0.6' in context
+    assert stats["tokens_before"] == estimate_tokens(json.dumps(data, indent=2))
+    assert stats["tokens_after"] <= 800
+    assert stats["duplicates_removed"] >= 195
+
+
+def test_report_context_finds_nested_mentions_and_stays_in_budget():
+    data = {
+        "brand_name": "OpenAI",
+        "search": {"search_results": [
+            {"title": f"OpenAI story {i}", "snippet": f"OpenAI headline number {i} " * 10} for i in range(300)
+        ]},
+        "analysis": {"scraped_data": [{"post_text": "OpenAI post"}], "notes": ["x" * 200] * 300},
+    }
+
+    context, stats = build_report_context("OpenAI", data, token_budget=3000)
+
+    assert stats["tokens_after"] <= 3000 and estimate_tokens(context) <= 3000
+    assert stats["analysis_data_truncated"] is True
+    assert '"search":{}' in context and "OpenAI headline number" in context
+    assert stats["snippets_in"] == 301
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming report generation
+Uses a fake Bedrock response stream, no AWS access needed
+"""
+
+import json
+
+import pytest
+
+import cache
+from bedrock_runtime import invoke_model_cached, stream_model_text
+
+
+def _event(payload):
+    return {"chunk": {"bytes": json.dumps(payload).encode()}}
+
+
+class _FakeStreamingBedrock:
+    """Replays an Anthropic messages event stream, one event per text piece"""
+
+    def __init__(self, pieces, error_after=None):
+        self.pieces = pieces
+        self.error_after = error_after
+        self.calls = 0
+
+    def invoke_model_with_response_stream(self, modelId, body, **kwargs):
+        self.calls += 1
+        return {"body": self._events()}
+
+    def _events(self):
+        yield _event({"type": "message_start", "message": {"role": "assistant"}})
+        yield _event({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+        for index, piece in enumerate(self.pieces):
+            if self.error_after is not None and index == self.error_after:
+                yield {"throttlingException": {"message": "Too many requests"}}
+            yield _event({"type": "content_block_delta", "index": 0,
+                          "delta": {"type": "text_delta", "text": piece}})
+        yield _event({"type": "content_block_stop", "index": 0})
+        yield _event({"type": "message_delta", "delta": {"stop_reason": "end_turn"}})
+        yield _event({"type": "message_stop"})
+
+
+@pytest.fixture(autouse=True)
+def llm_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_DIR", str(tmp_path / "llm-cache"))
+    monkeypatch.setattr(cache, "_llm_cache", None)
+    yield
+    monkeypatch.setattr(cache, "_llm_cache", None)
+
+
+def test_text_is_yielded_as_it_arrives():
+    bedrock = _FakeStreamingBedrock(["# Report", "\n\nAll ", "good."])
+
+    stream = stream_model_text(bedrock, modelId="model-a", body="{}")
+
+    assert next(stream) == "# Report"
+    assert list(stream) == ["\n\nAll ", "good."]
+
+
+def test_completed_stream_is_shared_with_invoke_model_cached():
+    bedrock = _FakeStreamingBedrock(["Hello ", "world"])
+
+    assert "".join(stream_model_text(bedrock, modelId="model-a", body="{}")) == "Hello world"
+    assert list(stream_model_text(bedrock, modelId="model-a", body="{}")) == ["Hello world"]
+    cached = invoke_model_cached(bedrock, modelId="model-a", body="{}")
+
+    assert cached["content"][0]["text"] == "Hello world"
+    assert cached["stop_reason"] == "end_turn"
+    assert bedrock.calls == 1
+
+
+def test_partial_and_failed_streams_are_not_cached():
+    failing = _FakeStreamingBedrock(["one ", "two"], error_after=1)
+    with pytest.raises(RuntimeError, match="throttlingException"):
+        list(stream_model_text(failing, modelId="model-a", body="{}"))
+
+    partial = stream_model_text(_FakeStreamingBedrock(["one ", "two"]), modelId="model-a", body="{}")
+    next(partial)
+    partial.close()
+
+    bedrock = _FakeStreamingBedrock(["fresh"])
+    assert list(stream_model_text(bedrock, modelId="model-a", body="{}")) == ["fresh"]
+    assert bedrock.calls == 1
+
+
+def _parse_sse(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_report_endpoint_emits_server_sent_events(enhanced_app, monkeypatch):
+    import bedrock_runtime
+    import brand_tools
+
+    search_payload = {"brand_name": "OpenAI", "total_results": 2, "search_results": [
+        {"title": "OpenAI ships a model", "link": "https://example.com/1", "snippet": "OpenAI news"},
+        {"title": "OpenAI event", "link": "https://example.com/2", "snippet": "More OpenAI news"},
+    ]}
+    monkeypatch.setattr(brand_tools, "search_brand_mentions_data", lambda brand, total: search_payload)
+    bedrock = _FakeStreamingBedrock(["# OpenAI", " report"])
+    monkeypatch.setattr(bedrock_runtime, "get_bedrock_client", lambda region=None: bedrock)
+
+    response = enhanced_app.app.test_client().get("/api/stream-report?brand_name=OpenAI&max_results=2")
+
+    assert response.mimetype == "text/event-stream"
+    events = _parse_sse(response.get_data(as_text=True))
+    assert [name for name, _ in events] == ["search", "chunk", "chunk", "done"]
+    assert events[0][1]["total_results"] == 2
+    assert "".join(data["text"] for name, data in events if name == "chunk") == "# OpenAI report"
+    assert events[-1][1]["report_length"] == len("# OpenAI report")
+
+
+def test_stream_report_endpoint_reports_errors_as_events(enhanced_app, monkeypatch):
+    import brand_tools
+
+    def broken_search(brand, total):
+        raise RuntimeError("search backend down")
+
+    monkeypatch.setattr(brand_tools, "search_brand_mentions_data", broken_search)
+
+    response = enhanced_app.app.test_client().post("/api/stream-report", json={"brand_name": "OpenAI"})
+
+    assert _parse_sse(response.get_data(as_text=True)) == [("error", {"error": "search backend down"})]
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for compressed result files
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+import result_compression
+from data_storage import BrandMonitoringDataStorage
+from result_index import INDEX_FILENAME, JOURNAL_SUFFIX
+
+FILENAME = "search_OpenAI_20250101_000000.json"
+
+
+def _document():
+    return {"brand_name": "OpenAI", "search_results": [{"title": "OpenAI news " * 20}] * 10}
+
+
+def test_gzip_results_are_read_transparently(tmp_path):
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files", compression="gzip", rollups=False)
+
+    storage.save_document(FILENAME, _document())
+
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [FILENAME + ".gz", INDEX_FILENAME, INDEX_FILENAME + JOURNAL_SUFFIX, INDEX_FILENAME + ".lock"])
+    assert json.loads(gzip.decompress((tmp_path / (FILENAME + ".gz")).read_bytes())) == _document()
+    assert storage.get_result_by_filename(FILENAME) == _document()
+    assert storage.get_all_results()[0]["filename"] == FILENAME
+    assert storage.list_results(view="full")["results"][0]["search_results"] == _document()["search_results"]
+    assert storage.list_results()["results"][0]["file_size"] == os.path.getsize(tmp_path / (FILENAME + ".gz"))
+
+    assert storage.delete_result(FILENAME) is True
+    assert not (tmp_path / (FILENAME + ".gz")).exists()
+
+
+def test_changing_compression_replaces_the_old_copy(tmp_path):
+    BrandMonitoringDataStorage(str(tmp_path), backend="files").save_document(FILENAME, {"brand_name": "old"})
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files", compression="gzip")
+
+    assert storage.get_result_by_filename(FILENAME) == {"brand_name": "old"}
+    storage.save_document(FILENAME, _document())
+
+    assert not (tmp_path / FILENAME).exists()
+    assert storage.get_result_by_filename(FILENAME) == _document()
+
+
+def test_index_rebuild_reads_compressed_files(tmp_path):
+    BrandMonitoringDataStorage(str(tmp_path), backend="files", compression="gzip").save_document(FILENAME, _document())
+    os.remove(tmp_path / INDEX_FILENAME)
+
+    page = BrandMonitoringDataStorage(str(tmp_path), backend="files").list_results()
+
+    assert [item["filename"] for item in page["results"]] == [FILENAME]
+    assert page["results"][0]["summary"]["total_search_results"] == 10
+
+
+def test_duplicated_raw_output_can_be_dropped(tmp_path):
+    agent_output = json.dumps({"search_results": [{"title": "a"}]})
+
+    kept = BrandMonitoringDataStorage(str(tmp_path / "kept"), backend="files")
+    dropped = BrandMonitoringDataStorage(str(tmp_path / "dropped"), backend="files", keep_raw_output=False)
+
+    assert kept.get_result_by_filename(kept.save_from_agent_output(agent_output, "OpenAI"))["metadata"] == {
+        "source": "agent_output", "raw_output": agent_output}
+    assert dropped.get_result_by_filename(dropped.save_from_agent_output(agent_output, "OpenAI"))["metadata"] == {
+        "source": "agent_output"}
+
+
+def test_invalid_or_unavailable_compression_is_rejected(tmp_path, monkeypatch):
+    with pytest.raises(ValueError):
+        BrandMonitoringDataStorage(str(tmp_path), compression="lz4")
+
+    monkeypatch.setattr(result_compression, "zstandard", None)
+    with pytest.raises(ValueError, match="zstandard"):
+        BrandMonitoringDataStorage(str(tmp_path), compression="zstd")
+
+
+def test_zstd_files_are_kept_when_zstandard_is_missing(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_compression, "zstandard", None)
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files", rollups=False)
+    (tmp_path / (FILENAME + ".zst")).write_bytes(b"(\xb5/\xfd compressed elsewhere")
+
+    report = storage.scrub()
+
+    assert report["quarantined"] == [] and report["unreadable"] == [FILENAME]
+    assert storage.get_result_by_filename(FILENAME) is None
+    assert os.path.exists(tmp_path / (FILENAME + ".zst"))
+    assert not os.path.exists(tmp_path / "quarantine")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the file backend's metadata sidecar index
+"""
+
+import json
+import os
+
+from data_storage import BrandMonitoringDataStorage
+from result_index import INDEX_FILENAME, JOURNAL_SUFFIX, ResultIndex, index_entry
+
+
+def _index_file(storage):
+    """The index as a fresh process would load it from the snapshot and journal"""
+    return ResultIndex(storage.results_dir).entries()
+
+
+def test_saves_and_deletes_update_the_index(tmp_path):
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files")
+
+    filename = storage.save_result("OpenAI", [{"title": "a"}], sentiment_analysis={"score": 1})
+    raw = storage.save_raw_output("plain text", "Product Hunt")
+
+    entries = _index_file(storage)
+    assert entries[filename]["summary"]["total_search_results"] == 1
+    assert entries[filename]["size"] == os.path.getsize(tmp_path / filename)
+    assert entries[raw]["content_type"] == "text"
+    assert entries[raw]["brand_name"] == "Product Hunt"
+
+    storage.delete_result(filename)
+    assert filename not in _index_file(storage)
+
+
+def test_summary_listing_never_opens_payloads(tmp_path):
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files")
+    filename = storage.save_document("search_OpenAI_20250101_000000.json",
+                                     {"brand_name": "OpenAI", "search_results": [{"title": "a"}] * 4})
+
+    # Clobber the payload: only a listing served from the index can still describe it
+    (tmp_path / filename).write_text("{not json")
+
+    page = storage.list_results()
+    assert page["results"][0]["summary"]["total_search_results"] == 4
+    assert page["results"][0]["brand_name"] == "OpenAI"
+
+
+def test_missing_index_is_rebuilt_and_ignored_by_listings(tmp_path):
+    (tmp_path / "search_OpenAI_20250101_000000.json").write_text(json.dumps({"brand_name": "OpenAI"}))
+    (tmp_path / "search_Rakuten_20250101_000001.json").write_text(json.dumps({"brand_name": "Rakuten"}))
+
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files")
+
+    assert {r["brand_name"] for r in storage.get_all_results()} == {"OpenAI", "Rakuten"}
+    assert storage.index.rebuilds == 1
+    assert len(storage.list_results()["results"]) == 2
+
+    os.remove(tmp_path / INDEX_FILENAME)
+    assert len(storage.list_results()["results"]) == 2
+    assert storage.index.rebuilds == 2
+
+
+def test_writers_in_other_processes_are_picked_up(tmp_path):
+    reader = BrandMonitoringDataStorage(str(tmp_path), backend="files")
+    writer = BrandMonitoringDataStorage(str(tmp_path), backend="files")
+
+    assert reader.list_results()["results"] == []
+    writer.save_document("search_OpenAI_20250101_000000.json", {"brand_name": "OpenAI"})
+    writer.save_document("search_Rakuten_20250101_000001.json", {"brand_name": "Rakuten"})
+    reader.save_document("search_Acme_20250101_000002.json", {"brand_name": "Acme"})
+
+    assert {r["brand_name"] for r in reader.list_results()["results"]} == {"OpenAI", "Rakuten", "Acme"}
+    assert {r["brand_name"] for r in writer.list_results()["results"]} == {"OpenAI", "Rakuten", "Acme"}
+
+
+def test_entries_snapshot_is_not_changed_by_later_writes(tmp_path):
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files")
+    first = storage.save_result("OpenAI", [{"title": "a"}])
+    snapshot = storage.index.entries()
+
+    for filename in snapshot:
+        storage.save_result("Anthropic", [{"title": "b"}])
+        storage.delete_result(first)
+
+    assert list(snapshot) == [first]
+
+
+def test_saves_append_to_the_journal_and_compact(tmp_path):
+    index = ResultIndex(str(tmp_path), compact_bytes=4096)
+    other = ResultIndex(str(tmp_path), compact_bytes=4096)
+    entry = index_entry("a.json", {"brand_name": "OpenAI"}, 10, 0)
+
+    index.upsert("search_0.json", entry)
+    snapshot_size = os.path.getsize(tmp_path / INDEX_FILENAME)
+    journal_size = os.path.getsize(tmp_path / (INDEX_FILENAME + JOURNAL_SUFFIX))
+    index.upsert("search_1.json", entry)
+
+    # One save appends one journal line and leaves the snapshot alone
+    assert os.path.getsize(tmp_path / INDEX_FILENAME) == snapshot_size
+    assert os.path.getsize(tmp_path / (INDEX_FILENAME + JOURNAL_SUFFIX)) == 2 * journal_size
+    assert set(other.entries()) == {"search_0.json", "search_1.json"}
+
+    for i in range(2, 40):
+        index.upsert(f"search_{i}.json", entry)
+    index.remove("search_0.json")
+    other.upsert("search_40.json", entry)
+
+    assert index.compactions >= 1
+    expected = {f"search_{i}.json" for i in range(1, 41)}
+    assert set(index.entries()) == set(other.entries()) == expected
+    assert set(ResultIndex(str(tmp_path)).entries()) == expected
+
+
+def test_torn_journal_line_is_dropped(tmp_path):
+    index = ResultIndex(str(tmp_path))
+    index.upsert("search_0.json", index_entry("search_0.json", {"brand_name": "OpenAI"}, 10, 0))
+    with open(tmp_path / (INDEX_FILENAME + JOURNAL_SUFFIX), "ab") as f:
+        f.write(b'{"op": "put", "filena')
+
+    reopened = ResultIndex(str(tmp_path))
+    assert list(reopened.entries()) == ["search_0.json"]
+    reopened.upsert("search_1.json", index_entry("search_1.json", {"brand_name": "OpenAI"}, 10, 0))
+
+    assert set(ResultIndex(str(tmp_path)).entries()) == {"search_0.json", "search_1.json"}
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the result retention engine
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from data_storage import BrandMonitoringDataStorage
+from result_retention import RetentionEngine, RetentionPolicy, plan_retention
+
+NOW = datetime(2025, 6, 1, 12, 0)
+
+
+def _record(filename, brand, days_old, size=100, content_type="json"):
+    return {"filename": filename, "brand_name": brand, "content_type": content_type, "file_size": size,
+            "modified": (NOW - timedelta(days=days_old)).isoformat(), "summary": {}}
+
+
+def _document(brand, days_old):
+    return {"brand_name": brand, "timestamp": (NOW - timedelta(days=days_old)).isoformat(),
+            "search_results": [{"title": f"{brand} news " * 30}] * 20,
+            "sentiment_analysis": {"sentiment_score": 0.4, "sentiment_label": "positive", "explanation": "x" * 500},
+            "report_data": {"report_content": "report " * 500}}
+
+
+@pytest.fixture(params=["files", "sqlite", "segments"])
+def storage(request, tmp_path, monkeypatch):
+    monkeypatch.setenv("RESULTS_COMPACT_INTERVAL", "0")
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend=request.param, rollups=False)
+    ages = {"OpenAI": [1, 5, 20, 40], "Anthropic": [2, 45]}
+    for brand, days in ages.items():
+        for days_old in days:
+            filename = f"full_analysis_{brand}_{days_old:03d}.json"
+            modified = (datetime.now() - timedelta(days=days_old)).isoformat()
+            storage._write_document(filename, _document(brand, days_old), modified=modified)
+    return storage
+
+
+def test_plan_applies_age_then_count_then_bytes():
+    records = [_record("a1", "OpenAI", 1), _record("a2", "OpenAI", 2), _record("a3", "OpenAI", 3),
+               _record("b1", "Anthropic", 1), _record("b9", "Anthropic", 90)]
+
+    assert [r["filename"] for r in plan_retention(records, RetentionPolicy(max_age_days=30), NOW)["delete"]] == ["b9"]
+    assert [r["filename"] for r in plan_retention(records, RetentionPolicy(max_per_brand=2), NOW)["delete"]] == ["a3"]
+    by_bytes = plan_retention(records, RetentionPolicy(max_total_bytes=250), NOW)["delete"]
+    assert [r["filename"] for r in by_bytes] == ["b9", "a3", "a2"]
+
+
+def test_plan_downsamples_old_json_once():
+    records = [_record("new", "OpenAI", 1), _record("old", "OpenAI", 10),
+               _record("old.txt", "OpenAI", 10, content_type="text"),
+               dict(_record("done", "OpenAI", 20), summary={"downsampled": True})]
+
+    plan = plan_retention(records, RetentionPolicy(downsample_after_days=7), NOW)
+
+    assert plan["delete"] == [] and [r["filename"] for r in plan["downsample"]] == ["old"]
+
+
+def test_retention_deletes_downsamples_and_reports_reclaimed_bytes(storage):
+    before = {r["filename"]: r["file_size"] for r in storage.result_records()}
+    policy = RetentionPolicy(max_age_days=30, max_per_brand=2, downsample_after_days=3)
+
+    dry = storage.apply_retention(policy, dry_run=True)
+    assert {r["filename"] for r in storage.result_records()} == set(before)
+
+    report = storage.apply_retention(policy)
+
+    assert (report["deleted"], report["downsampled"]) == (dry["deleted"], dry["downsampled"]) == (3, 1)
+    records = {r["filename"]: r for r in storage.result_records()}
+    assert set(records) == {"full_analysis_OpenAI_001.json", "full_analysis_OpenAI_005.json",
+                            "full_analysis_Anthropic_002.json"}
+    downsampled = storage.get_result_by_filename("full_analysis_OpenAI_005.json")
+    assert downsampled["sentiment_analysis"] == {"sentiment_score": 0.4, "sentiment_label": "positive"}
+    assert "search_results" not in downsampled and records["full_analysis_OpenAI_005.json"]["summary"]["downsampled"]
+    assert records["full_analysis_OpenAI_005.json"]["modified"] < records["full_analysis_OpenAI_001.json"]["modified"]
+    assert report["reclaimed_bytes"] == sum(before.values()) - sum(r["file_size"] for r in records.values())
+    assert storage.apply_retention(policy)["deleted"] == 0
+
+
+def test_passes_are_capped_and_resume(storage):
+    policy = RetentionPolicy(max_per_brand=1)
+
+    first = storage.apply_retention(policy, max_actions=2)
+    second = storage.apply_retention(policy, max_actions=2)
+
+    assert (first["deleted"], first["remaining"]) == (2, 2)
+    assert (second["deleted"], second["remaining"]) == (2, 0)
+    assert len(storage.result_records()) == 2
+
+
+def test_background_engine_runs_on_its_interval(tmp_path):
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files", rollups=False)
+    for days_old in (1, 2, 3):
+        storage._write_document(f"search_OpenAI_{days_old}.json", _document("OpenAI", days_old),
+                                modified=(datetime.now() - timedelta(days=days_old)).isoformat())
+    engine = RetentionEngine(storage, RetentionPolicy(max_per_brand=1), interval=0.05)
+    try:
+        deadline = time.time() + 5
+        while engine.totals["deleted"] < 2 and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        engine.close()
+
+    assert engine.status()["totals"]["deleted"] == 2
+    assert os.listdir(tmp_path).count("search_OpenAI_1.json") == 1
+
+
+def test_storage_reads_the_policy_from_the_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESULTS_RETENTION_PER_BRAND", "5")
+    monkeypatch.setenv("RESULTS_RETENTION_INTERVAL", "0")
+
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files")
+
+    assert storage.retention.policy.max_per_brand == 5 and storage.retention._thread is None
+    assert BrandMonitoringDataStorage(str(tmp_path / "other"), retention=RetentionPolicy()).retention is None
+
+
+def test_retention_endpoint(enhanced_app):
+    enhanced_app.storage.save_document("search_OpenAI_1.json", _document("OpenAI", 1))
+    client = enhanced_app.app.test_client()
+
+    assert client.post("/api/retention", json={}).status_code == 400
+    response = client.post("/api/retention", json={"max_per_brand": 0, "dry_run": True})
+
+    assert response.get_json()["data"]["deleted"] == 1
+    assert enhanced_app.storage.get_result_by_filename("search_OpenAI_1.json") is not None
+    assert client.post("/api/retention", json={"max_per_brand": 0}).status_code == 400
+    assert client.post("/api/retention", json={"max_age_days": "30", "dry_run": True}).status_code == 400
+    assert enhanced_app.storage.get_result_by_filename("search_OpenAI_1.json") is not None
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite result store and the storage backends
+"""
+
+import json
+import os
+
+import pytest
+
+from data_storage import BrandMonitoringDataStorage
+from result_store import SQLiteResultStore, result_type_for
+
+
+def _doc(brand, timestamp, results=1):
+    return {
+        "brand_name": brand,
+        "timestamp": timestamp,
+        "search_results": [{"title": f"{brand} {i}"} for i in range(results)],
+        "summary": {"total_search_results": results},
+    }
+
+
+def test_listing_is_indexed_filtered_and_paged(tmp_path):
+    store = SQLiteResultStore(str(tmp_path / "results.db"))
+    store.put("search_OpenAI_1.json", _doc("OpenAI", "2025-01-01T00:00:00"), modified="2025-01-01T00:00:00")
+    store.put("full_analysis_OpenAI_2.json", _doc("OpenAI", "2025-01-02T00:00:00"), modified="2025-01-02T00:00:00")
+    store.put("search_Rakuten_3.json", _doc("Rakuten", "2025-01-03T00:00:00"), modified="2025-01-03T00:00:00")
+
+    newest = store.list(limit=2)
+    assert [r["filename"] for r in newest] == ["search_Rakuten_3.json", "full_analysis_OpenAI_2.json"]
+    assert "document" not in newest[0]
+    assert newest[0]["summary"] == {"total_search_results": 1}
+
+    assert [r["filename"] for r in store.list(brand_name="  openai ")] == [
+        "full_analysis_OpenAI_2.json", "search_OpenAI_1.json"]
+    assert [r["filename"] for r in store.list(result_type="search", limit=1, offset=1)] == ["search_OpenAI_1.json"]
+    assert store.count(brand_name="OpenAI") == 2
+
+    plan = " ".join(row[3] for row in store._connection().execute(
+        "EXPLAIN QUERY PLAN SELECT filename FROM results WHERE brand_key = ? ORDER BY modified DESC LIMIT 10",
+        ("openai",)))
+    assert "idx_results_brand" in plan
+
+
+def test_import_directory_migrates_existing_files(tmp_path):
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    (results_dir / "search_OpenAI_20250915_181447.json").write_text(json.dumps(_doc("OpenAI", "2025-09-15T18:14:47")))
+    (results_dir / "brand_monitoring_openai_20250915_181500.txt").write_text(
+        "Brand Monitoring Result for: OpenAI\nGenerated at: 2025-09-15\n" + "=" * 50 + "\n\nraw")
+    (results_dir / "broken.json").write_text("{not json")
+
+    store = SQLiteResultStore(str(tmp_path / "results.db"))
+    assert store.import_directory(str(results_dir)) == {"imported": 2, "skipped": 0, "failed": 1}
+    assert store.import_directory(str(results_dir)) == {"imported": 0, "skipped": 2, "failed": 1}
+
+    record = store.get("search_OpenAI_20250915_181447.json")
+    assert record["document"]["search_results"][0]["title"] == "OpenAI 0"
+    assert record["result_type"] == "search"
+    assert store.list(content_type="text")[0]["brand_name"] == "OpenAI"
+
+
+@pytest.mark.parametrize("backend", ["files", "sqlite", "segments"])
+def test_storage_api_is_the_same_for_every_backend(tmp_path, backend):
+    storage = BrandMonitoringDataStorage(str(tmp_path / "results"), backend=backend)
+
+    filename = storage.save_result("OpenAI", [{"title": "a"}, {"title": "b"}], sentiment_analysis={"score": 1})
+    storage.save_document("search_Rakuten_20250101_000000.json", _doc("Rakuten", "2025-01-01T00:00:00"))
+
+    loaded = storage.get_result_by_filename(filename)
+    assert loaded["summary"]["total_search_results"] == 2
+    assert loaded["summary"]["has_sentiment_analysis"] is True
+
+    listed = storage.get_all_results()
+    assert {r["filename"] for r in listed} == {filename, "search_Rakuten_20250101_000000.json"}
+    assert all(r["file_size"] > 0 and r["modified"] for r in listed)
+    assert [r["brand_name"] for r in storage.get_all_results(brand_name="rakuten")] == ["Rakuten"]
+    assert [r["filename"] for r in storage.get_all_results(result_type="brand_monitoring")] == [filename]
+
+    size = storage._write_document("search_Acme_20250101_000000.json", _doc("Acme", "2025-01-01T00:00:00"))
+    assert storage.get_all_results(brand_name="Acme")[0]["file_size"] == size
+
+    assert storage.delete_result(filename) is True
+    assert storage.delete_result(filename) is False
+    assert storage.get_result_by_filename(filename) is None
+    assert os.path.exists(os.path.join(str(tmp_path / "results"), filename)) is False
+
+
+def test_result_type_from_filename():
+    assert result_type_for("full_analysis_OpenAI_20250915_181225.json") == "full_analysis"
+    assert result_type_for("brand_monitoring_openai_20250915_181225.json") == "brand_monitoring"
+    assert result_type_for("notes.json") == "other"
+
+
+def test_results_endpoint_reads_from_sqlite_store(enhanced_app, monkeypatch):
+    storage = BrandMonitoringDataStorage(enhanced_app.RESULTS_DIR, backend="sqlite")
+    monkeypatch.setattr(enhanced_app, "storage", storage)
+    storage.save_document("search_OpenAI_20250101_000000.json", _doc("OpenAI", "2025-01-01T00:00:00"))
+
+    payload = enhanced_app.app.test_client().get("/api/results").get_json()
+
+    assert payload["success"] is True
+    assert payload["total_files"] == 1
+    assert payload["results"][0]["filename"] == "search_OpenAI_20250101_000000.json"
+    assert not any(name.endswith(".json") for name in os.listdir(enhanced_app.RESULTS_DIR))
+
+
+def test_same_second_dashboard_saves_are_all_kept(enhanced_app, monkeypatch):
+    import brand_tools
+    monkeypatch.setattr(brand_tools, "search_brand_mentions_data",
+                        lambda brand_name, total_results: {"brand_name": brand_name, "search_results": []})
+    client = enhanced_app.app.test_client()
+
+    filenames = [client.post("/api/run-search", json={"brand_name": "Open AI"}).get_json()["filename"]
+                 for _ in range(3)]
+
+    assert len(set(filenames)) == 3
+    assert all(result_type_for(name) == "search" and "Open_AI" in name for name in filenames)
+    assert {r["filename"] for r in enhanced_app.storage.get_all_results()} == set(filenames)
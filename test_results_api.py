@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for paginated, filterable result listings
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from data_storage import BrandMonitoringDataStorage
+
+
+def _populate(storage, count=7):
+    """Save alternating OpenAI search / Rakuten full_analysis results, oldest first"""
+    base = time.mktime((2025, 1, 1, 0, 0, 0, 0, 0, -1))
+    names = []
+    for i in range(count):
+        brand = "OpenAI" if i % 2 == 0 else "Rakuten"
+        kind = "search" if i % 2 == 0 else "full_analysis"
+        filename = f"{kind}_{brand}_20250101_00000{i}.json"
+        document = {
+            "brand_name": brand,
+            "timestamp": f"2025-01-01T00:00:0{i}",
+            "search_results": [{"title": "x", "snippet": "y" * 2000}] * 3,
+            "report": "long report " * 500,
+        }
+        if storage.store is not None:
+            storage.store.put(filename, document, modified=f"2025-01-01T00:00:0{i}")
+        else:
+            storage.save_document(filename, document)
+            os.utime(os.path.join(storage.results_dir, filename), (base + i, base + i))
+        names.append(filename)
+    if storage.index is not None:
+        storage.index.rebuild()  # pick up the backdated mtimes
+    return names[::-1]
+
+
+@pytest.fixture(params=["files", "sqlite", "segments"])
+def storage(request, tmp_path):
+    return BrandMonitoringDataStorage(str(tmp_path / "results"), backend=request.param)
+
+
+def test_cursor_pages_cover_every_result_once(storage):
+    newest_first = _populate(storage)
+
+    seen, cursor = [], None
+    while True:
+        page = storage.list_results(limit=3, cursor=cursor)
+        seen.extend(item["filename"] for item in page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == newest_first
+
+
+def test_summary_view_is_small_and_full_view_has_documents(storage):
+    _populate(storage)
+
+    summary = storage.list_results(limit=1)["results"][0]
+    full = storage.list_results(limit=1, view="full")["results"][0]
+
+    assert set(summary) == {"filename", "brand_name", "result_type", "timestamp", "modified", "file_size", "summary"}
+    assert summary["summary"]["total_search_results"] == 3
+    assert summary["summary"]["has_report"] is True
+    assert len(json.dumps(summary)) * 20 < len(json.dumps(full))
+    assert full["report"].startswith("long report")
+
+
+def test_filters_by_brand_type_and_time(storage):
+    _populate(storage)
+
+    openai = storage.list_results(brand_name="openai", limit=10)["results"]
+    assert [item["brand_name"] for item in openai] == ["OpenAI"] * 4
+
+    analyses = storage.list_results(result_type="full_analysis", limit=10)["results"]
+    assert {item["result_type"] for item in analyses} == {"full_analysis"}
+    assert len(analyses) == 3
+
+    window = storage.list_results(since="2025-01-01T00:00:02", until="2025-01-01T00:00:05", limit=10)["results"]
+    assert [item["filename"][-6] for item in window] == ["4", "3", "2"]
+
+
+def test_invalid_cursor_is_rejected(storage):
+    with pytest.raises(ValueError):
+        storage.list_results(cursor="not-a-cursor")
+
+
+def test_results_endpoint_paginates(enhanced_app, monkeypatch):
+    storage = BrandMonitoringDataStorage(enhanced_app.RESULTS_DIR, backend="sqlite")
+    monkeypatch.setattr(enhanced_app, "storage", storage)
+    newest_first = _populate(storage)
+    client = enhanced_app.app.test_client()
+
+    first = client.get("/api/results?view=summary&limit=4&brand=OpenAI").get_json()
+    assert [item["filename"] for item in first["results"]] == [n for n in newest_first if "OpenAI" in n]
+    assert first["next_cursor"] is None
+
+    page = client.get("/api/results?limit=5").get_json()
+    rest = client.get(f"/api/results?limit=5&cursor={page['next_cursor']}").get_json()
+    assert [item["filename"] for item in page["results"] + rest["results"]] == newest_first
+
+    detail = client.get(f"/api/results/{newest_first[0]}").get_json()
+    assert detail["data"]["report"].startswith("long report")
+
+    assert client.get("/api/results?cursor=bogus").status_code == 400
+    assert client.get("/api/results").get_json()["total_files"] == 7
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only segment log store
+"""
+
+import os
+import threading
+
+from data_storage import BrandMonitoringDataStorage
+from segment_log import SegmentLogStore
+
+
+def _doc(brand, i):
+    return {"brand_name": brand, "timestamp": f"2025-01-01T00:00:{i:02d}", "search_results": [{"title": "x" * 50}]}
+
+
+def _segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".jsonl"))
+
+
+def test_segments_roll_over_and_reopen_from_sidecars(tmp_path):
+    store = SegmentLogStore(str(tmp_path), max_segment_bytes=1000)
+    for i in range(20):
+        store.put(f"search_OpenAI_{i}.json", _doc("OpenAI", i), modified=f"2025-01-01T00:00:{i:02d}")
+    store.delete("search_OpenAI_3.json")
+    store.close()
+
+    assert len(_segments(tmp_path)) > 3
+    assert all(os.path.exists(tmp_path / f"{name}.idx") for name in _segments(tmp_path)[:-1])
+
+    reopened = SegmentLogStore(str(tmp_path), max_segment_bytes=1000)
+    assert reopened.count() == 19
+    assert reopened.get("search_OpenAI_3.json") is None
+    assert reopened.get("search_OpenAI_7.json")["document"] == _doc("OpenAI", 7)
+    assert [r["filename"] for r in reopened.list(limit=2)] == ["search_OpenAI_19.json", "search_OpenAI_18.json"]
+
+
+def test_torn_final_record_is_truncated_on_open(tmp_path):
+    store = SegmentLogStore(str(tmp_path))
+    store.put("search_OpenAI_1.json", _doc("OpenAI", 1))
+    store.close()
+    with open(tmp_path / _segments(tmp_path)[-1], "ab") as f:
+        f.write(b'{"op":"put","id":"search_OpenAI_2.json","meta":')
+
+    reopened = SegmentLogStore(str(tmp_path))
+    reopened.put("search_OpenAI_3.json", _doc("OpenAI", 3))
+    reopened.close()
+
+    again = SegmentLogStore(str(tmp_path))
+    assert {r["filename"] for r in again.list()} == {"search_OpenAI_1.json", "search_OpenAI_3.json"}
+
+
+def test_compaction_drops_dead_records_and_keeps_live_ones(tmp_path):
+    store = SegmentLogStore(str(tmp_path), max_segment_bytes=1000)
+    for round_number in range(3):
+        for i in range(10):
+            store.put(f"search_OpenAI_{i}.json", _doc("OpenAI", round_number), modified=f"2025-01-0{round_number + 1}")
+    for i in range(5):
+        store.delete(f"search_OpenAI_{i}.json")
+    before = len(_segments(tmp_path))
+
+    reclaimed = store.compact()
+
+    assert reclaimed > 0
+    assert store.garbage_stats()["garbage_ratio"] == 0.0
+    assert len(_segments(tmp_path)) < before
+    store.close()
+
+    reopened = SegmentLogStore(str(tmp_path), max_segment_bytes=1000)
+    assert sorted(r["filename"] for r in reopened.list()) == [f"search_OpenAI_{i}.json" for i in range(5, 10)]
+    assert all(reopened.get(f"search_OpenAI_{i}.json")["document"] == _doc("OpenAI", 2) for i in range(5, 10))
+
+
+def test_concurrent_saves_in_the_same_second_are_all_kept(tmp_path):
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="segments")
+    filenames = []
+
+    def save():
+        filenames.append(storage.save_result("OpenAI", [{"title": "a"}]))
+
+    threads = [threading.Thread(target=save) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(filenames)) == 20
+    assert len(storage.get_all_results(brand_name="OpenAI")) == 20
+    assert _segments(tmp_path / "segments") == ["segment_000001.jsonl"]
+
+
+def test_stores_sharing_a_directory_see_each_others_writes(tmp_path):
+    first = SegmentLogStore(str(tmp_path), max_segment_bytes=1000)
+    second = SegmentLogStore(str(tmp_path), max_segment_bytes=1000)
+
+    first.put("search_OpenAI_x.json", _doc("OpenAI", 1))
+    second.put("search_OpenAI_y.json", _doc("OpenAI", 2))
+    assert second.get("search_OpenAI_y.json")["document"] == _doc("OpenAI", 2)
+    assert second.get("search_OpenAI_x.json")["document"] == _doc("OpenAI", 1)
+    assert first.get("search_OpenAI_y.json")["document"] == _doc("OpenAI", 2)
+
+    # Rollovers and compaction by one store move offsets under the other
+    for i in range(20):
+        (first if i % 2 else second).put(f"search_OpenAI_{i % 5}.json", _doc("OpenAI", i))
+    first.compact(force=True)
+    second.put("search_OpenAI_z.json", _doc("OpenAI", 3))
+
+    for store in (first, second):
+        assert store.count() == 8
+        assert store.get("search_OpenAI_4.json")["document"] == _doc("OpenAI", 19)
+        assert store.get("search_OpenAI_z.json")["document"] == _doc("OpenAI", 3)
+    first.close()
+    second.close()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for batched per-mention sentiment scoring
+Uses a fake bedrock-runtime client that scores mentions by keyword
+"""
+
+import io
+import json
+import re
+import threading
+
+import pytest
+
+from sentiment_batching import extract_mentions, pack_batches, score_mentions, estimate_tokens
+
+
+class _KeywordBedrock:
+    """Scores each mention in the prompt: "great" is positive, "outage" negative"""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke_model(self, modelId, body, **kwargs):
+        with self._lock:
+            self.calls += 1
+        prompt = json.loads(body)["messages"][0]["content"]
+        mentions = json.loads(re.search(r"Mentions:\s*(\[.*?\])\n", prompt, re.DOTALL).group(1))
+        scores = []
+        for mention in mentions:
+            score = 0.9 if "great" in mention["text"] else -0.8 if "outage" in mention["text"] else 0.0
+            label = "positive" if score > 0 else "negative" if score < 0 else "neutral"
+            scores.append({"id": mention["id"], "sentiment_score": score, "sentiment_label": label, "confidence": 0.9})
+        payload = {"content": [{"text": json.dumps(scores)}]}
+        return {"body": io.BytesIO(json.dumps(payload).encode())}
+
+
+@pytest.fixture(autouse=True)
+def no_llm_cache(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_DISABLED", "1")
+
+
+def _search_results(count):
+    return {"search_results": [
+        {"title": f"Post {i}", "link": f"https://example.com/{i}",
+         "snippet": "great launch" if i % 3 == 0 else "major outage" if i % 3 == 1 else "new office"}
+        for i in range(count)
+    ]}
+
+
+def test_mention_ids_are_stable_and_deduplicated():
+    content = _search_results(3)
+    content["search_results"].append(dict(content["search_results"][0]))
+
+    first = extract_mentions(content)
+    second = extract_mentions(_search_results(3))
+
+    assert len(first) == 3
+    assert [m["id"] for m in first] == [m["id"] for m in second]
+
+
+def test_batches_respect_token_budget_and_size():
+    mentions = [{"id": f"m{i}", "text": "x" * 400} for i in range(30)]
+
+    batches = pack_batches(mentions, token_budget=1200, max_batch_size=8)
+
+    assert sum(len(batch) for batch in batches) == 30
+    assert all(len(batch) <= 8 for batch in batches)
+    assert all(sum(estimate_tokens(m["text"]) for m in batch) <= 1000 for batch in batches)
+
+
+def test_scores_every_mention_with_few_requests():
+    bedrock = _KeywordBedrock()
+    mentions = extract_mentions(_search_results(40))
+
+    result = score_mentions(mentions, "OpenAI", max_batch_size=10, bedrock=bedrock)
+
+    assert bedrock.calls == 4
+    assert [s["id"] for s in result["scores"]] == [m["id"] for m in mentions]
+    assert result["scores"][0]["sentiment_label"] == "positive"
+    assert result["scores"][1]["sentiment_label"] == "negative"
+    assert result["summary"]["mentions_scored"] == 40
+    assert result["errors"] == []
+
+
+def test_failed_batch_marks_mentions_unscored():
+    class _BrokenBedrock:
+        def invoke_model(self, **kwargs):
+            raise RuntimeError("throttled")
+
+    result = score_mentions(extract_mentions(_search_results(2)), "OpenAI", bedrock=_BrokenBedrock())
+
+    assert [s["sentiment_label"] for s in result["scores"]] == ["unscored", "unscored"]
+    assert result["errors"] == ["throttled"]
+
+
+def test_malformed_score_entries_are_unscored():
+    class _SloppyBedrock:
+        def invoke_model(self, modelId, body, **kwargs):
+            prompt = json.loads(body)["messages"][0]["content"]
+            ids = [m["id"] for m in json.loads(re.search(r"Mentions:\s*(\[.*?\])\n", prompt, re.DOTALL).group(1))]
+            scores = [{"id": ids[0], "sentiment_score": 0.7, "sentiment_label": "positive", "confidence": 0.8},
+                      {"id": ids[1], "sentiment_score": None, "sentiment_label": "neutral"},
+                      {"id": ids[2], "sentiment_score": "0.7", "confidence": 0.9},
+                      {"id": ids[3], "sentiment_score": 0.2, "confidence": "high"}]
+            return {"body": io.BytesIO(json.dumps({"content": [{"text": json.dumps(scores)}]}).encode())}
+
+    result = score_mentions(extract_mentions(_search_results(4)), "OpenAI", bedrock=_SloppyBedrock())
+
+    assert [s["sentiment_label"] for s in result["scores"]] == ["positive", "unscored", "unscored", "unscored"]
+    assert result["summary"]["mentions_scored"] == 1 and result["errors"] == []
+
+
+def test_unparseable_batch_reply_is_retried_not_replayed_from_cache(tmp_path, monkeypatch):
+    import cache
+    monkeypatch.delenv("LLM_CACHE_DISABLED")
+    monkeypatch.setenv("LLM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(cache, "_llm_cache", None)
+
+    class _FlakyBedrock(_KeywordBedrock):
+        def invoke_model(self, modelId, body, **kwargs):
+            response = super().invoke_model(modelId, body, **kwargs)
+            payload = json.loads(response["body"].read())
+            payload["stop_reason"] = "end_turn"
+            if self.calls == 1:
+                payload["content"][0]["text"] = "Sorry, I cannot score these."
+            return {"body": io.BytesIO(json.dumps(payload).encode())}
+
+    bedrock = _FlakyBedrock()
+    mentions = extract_mentions(_search_results(1))
+
+    first = score_mentions(mentions, "OpenAI", bedrock=bedrock)
+    second = score_mentions(mentions, "OpenAI", bedrock=bedrock)
+
+    assert first["scores"][0]["sentiment_label"] == "unscored" and first["errors"]
+    assert second["scores"][0]["sentiment_label"] == "positive" and bedrock.calls == 2
+    assert score_mentions(mentions, "OpenAI", bedrock=bedrock)["errors"] == [] and bedrock.calls == 2
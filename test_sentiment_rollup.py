@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the sentiment rollup store
+"""
+
+from datetime import datetime, timedelta
+
+from data_storage import BrandMonitoringDataStorage
+from sentiment_rollup import RESOLUTIONS, SentimentRollupStore, extract_point
+
+NOW = datetime(2025, 3, 10, 12, 30, 15)
+
+
+def test_points_aggregate_into_every_resolution(tmp_path):
+    rollups = SentimentRollupStore(str(tmp_path))
+    rollups.record("OpenAI", NOW, mentions=3, scores=[0.5, -0.5], sources={"web": 2, "x": 1})
+    rollups.record("openai", NOW + timedelta(seconds=20), mentions=1, scores=[1.0], sources={"linkedin": 1})
+    rollups.record("OpenAI", NOW + timedelta(hours=2), mentions=2, scores=[], sources={"web": 2})
+
+    minute = rollups.trend("OpenAI", "minute", since=NOW, until=NOW)
+    assert minute == [{"start": datetime(2025, 3, 10, 12, 30).isoformat(), "mentions": 4, "scored": 3,
+                       "mean": 0.3333, "min": -0.5, "max": 1.0, "sources": {"web": 2, "linkedin": 1, "x": 1}}]
+
+    hours = rollups.trend("OpenAI", "hour", since=NOW, until=NOW + timedelta(hours=2))
+    assert [bucket["mentions"] for bucket in hours] == [4, 0, 2]
+    assert hours[1]["mean"] is None and hours[2]["mean"] is None
+
+    days = rollups.trend("OpenAI", "day", until=NOW + timedelta(hours=2))
+    assert len(days) == 30
+    assert sum(bucket["mentions"] for bucket in days) == 6
+
+
+def test_wrapped_ring_slots_read_as_empty(tmp_path):
+    rollups = SentimentRollupStore(str(tmp_path))
+    width, slots = RESOLUTIONS["minute"]
+    rollups.record("OpenAI", NOW, mentions=5)
+    later = NOW + timedelta(seconds=width * slots)
+
+    assert rollups.trend("OpenAI", "minute", since=later, until=later)[0]["mentions"] == 0
+    assert rollups.trend("Anthropic", "minute", since=NOW, until=NOW)[0]["mentions"] == 0
+
+
+def test_reading_an_unknown_brand_creates_nothing(tmp_path):
+    rollups = SentimentRollupStore(str(tmp_path))
+
+    days = rollups.trend("Never Recorded", "day", until=NOW)
+
+    assert len(days) == 30 and all(bucket["mentions"] == 0 for bucket in days)
+    assert list(tmp_path.iterdir()) == [] and rollups._series == {}
+
+    rollups.record("Never Recorded", NOW, mentions=1)
+    assert rollups.trend("never recorded", "day", until=NOW)[-1]["mentions"] == 1
+    assert len(list(tmp_path.iterdir())) == len(RESOLUTIONS)
+
+
+def test_points_older_than_the_ring_do_not_erase_recent_buckets(tmp_path):
+    rollups = SentimentRollupStore(str(tmp_path))
+    rollups.record("OpenAI", NOW, mentions=5, scores=[0.5])
+    rollups.record("OpenAI", NOW - timedelta(days=1), mentions=2, scores=[-1.0])
+
+    minute = rollups.trend("OpenAI", "minute", since=NOW, until=NOW)[0]
+    assert (minute["mentions"], minute["mean"]) == (5, 0.5)
+    assert sum(bucket["mentions"] for bucket in rollups.trend("OpenAI", "day", until=NOW)) == 7
+
+
+def test_extract_point_understands_app_documents():
+    full_analysis = {
+        "brand_name": "OpenAI",
+        "timestamp": NOW.isoformat(),
+        "search_results": {"total_results": 2, "search_results": [
+            {"title": "a", "link": "https://www.linkedin.com/posts/1"},
+            {"title": "b", "link": "https://news.example.com/2"},
+        ]},
+        "sentiment_analysis": {"brand_name": "OpenAI", "sentiment_analysis": {"sentiment_score": 0.7}},
+    }
+    per_mention = {"brand_name": "OpenAI", "data": {"mention_sentiments": [
+        {"sentiment_score": 0.2}, {"sentiment_score": None}, {"sentiment_score": -0.4}]}}
+
+    assert extract_point(full_analysis) == {"brand_name": "OpenAI", "timestamp": NOW, "mentions": 2,
+                                            "scores": [0.7], "sources": {"linkedin": 1, "web": 1}}
+    assert extract_point(per_mention)["scores"] == [0.2, -0.4]
+    assert extract_point({"brand_name": "OpenAI", "report": "text only"}) is None
+
+
+def test_saved_results_feed_the_trend_and_can_be_rebuilt(tmp_path):
+    storage = BrandMonitoringDataStorage(str(tmp_path), backend="files")
+    for score in (0.2, 0.6):
+        storage.save_result("OpenAI", [{"title": "t", "platform": "web"}],
+                            sentiment_analysis={"sentiment_score": score})
+
+    def today():
+        return storage.get_sentiment_trend("OpenAI", "day")[-1]
+
+    assert (today()["mentions"], today()["scored"], today()["mean"]) == (2, 2, 0.4)
+    assert storage.rebuild_rollups() == 2
+    assert (today()["mentions"], today()["mean"]) == (2, 0.4)
+
+
+def test_sentiment_trend_endpoint(enhanced_app):
+    enhanced_app.storage.save_result("OpenAI", [{"title": "t", "platform": "x"}],
+                                     sentiment_analysis={"sentiment_score": -0.5})
+    client = enhanced_app.app.test_client()
+
+    response = client.get("/api/sentiment-trend?brand=OpenAI&resolution=hour")
+    assert response.status_code == 200
+    buckets = response.get_json()["buckets"]
+    assert len(buckets) == 48
+    assert buckets[-1]["sources"] == {"x": 1} and buckets[-1]["mean"] == -0.5
+
+    assert client.get("/api/sentiment-trend?resolution=week").status_code == 400
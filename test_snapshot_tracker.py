@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared snapshot tracker
+Uses the local BrightData stand-in from conftest.py
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import standalone_tools
+from snapshot_tracker import SnapshotTracker, SnapshotFailedError, SnapshotTimeoutError
+
+
+def test_scrape_urls_returns_as_soon_as_snapshot_is_ready(fake_brightdata):
+    fake_brightdata.default_delay = 0.3
+    urls = ["https://example.com/a", "https://example.com/b"]
+
+    start = time.perf_counter()
+    results = standalone_tools.scrape_urls(urls, {"dataset_id": "gd_web"}, "web")
+    elapsed = time.perf_counter() - start
+
+    assert [item["markdown"] for item in results] == [f"Content from {url}" for url in urls]
+    assert elapsed < 2.0
+    stats = standalone_tools.get_snapshot_tracker().stats()
+    assert stats["ready"] == 1
+    assert stats["ready_time_histogram"]["le_1s"] == 1
+
+
+def test_many_async_scrapes_share_one_tracker(fake_brightdata):
+    fake_brightdata.default_delay = 0.2
+
+    async def scrape_all():
+        return await asyncio.gather(*[
+            standalone_tools.scrape_urls_async([f"https://example.com/{i}"], {"dataset_id": "gd_web"}, "web")
+            for i in range(20)
+        ])
+
+    results = asyncio.run(scrape_all())
+
+    assert [batch[0]["markdown"] for batch in results] == [f"Content from https://example.com/{i}" for i in range(20)]
+    assert standalone_tools.get_snapshot_tracker().stats()["ready"] == 20
+
+
+def test_backoff_limits_poll_count():
+    polls = []
+
+    def status_func(snapshot_id, headers):
+        polls.append(time.monotonic())
+        return "ready" if len(polls) >= 5 else "running"
+
+    tracker = SnapshotTracker(status_func, initial_interval=0.02, backoff_factor=2.0, max_interval=1.0)
+    try:
+        tracker.track("s1", {}).result(timeout=5)
+    finally:
+        tracker.stop()
+
+    gaps = [later - earlier for earlier, later in zip(polls, polls[1:])]
+    assert len(polls) == 5
+    assert gaps == sorted(gaps)
+
+
+def test_failed_and_timed_out_snapshots_raise():
+    tracker = SnapshotTracker(lambda snapshot_id, headers: "failed" if snapshot_id == "bad" else "running",
+                              initial_interval=0.01, max_interval=0.05, timeout=0.2)
+    try:
+        with pytest.raises(SnapshotFailedError):
+            tracker.track("bad", {}).result(timeout=5)
+        with pytest.raises(SnapshotTimeoutError):
+            tracker.track("slow", {}).result(timeout=5)
+        assert tracker.stats()["failed"] == 1
+        assert tracker.stats()["timed_out"] == 1
+    finally:
+        tracker.stop()